@@ -0,0 +1,178 @@
+"""VibeCoder 요청 수용 제어 — 경로 종류별 동시 처리 상한, 포화 시 즉시 503
+gunicorn 1 worker × 8 threads 기준. 느린 쓰기(bcrypt, 스팸 검사)나 댓글 폭주가
+스레드를 모두 차지해 라운지/쇼케이스 조회까지 줄 서지 않도록 종류별 상한을 둔다.
+  read  : GET 페이지 (상한 = 스레드 수, 가장 우선)
+  write : POST — 글/댓글/좋아요/삭제
+  api   : /api/*
+  admin : /admin*
+  static: /static/* (제한 없음)
+read 외 종류의 상한 합은 THREADS - READ_RESERVE 이하 → 쓰기가 몰려도 조회 스레드가 남는다 (설정값이 넘으면 줄임).
+상한이 차면 짧은 대기열(max_queue, max_wait)에서 기다리고, 대기열도 차면 503 + Retry-After.
+대기 중에도 스레드를 잡고 있으므로 쓰기/API 대기는 0.1초로 짧게 둔다.
+설정: ADMISSION_LIMITS="read=8,write=3,api=2,admin=1" (종류=동시 처리 상한)
+"""
+
+import os
+import json
+import time
+import threading
+
+THREADS = 8
+READ_RESERVE = 2   # 쓰기/API/관리자가 모두 차도 조회용으로 남는 스레드
+
+# 종류 → (동시 처리 상한, 대기열 길이, 최대 대기 초, Retry-After 초)
+CLASSES = {
+    "read":  (THREADS, 16, 0.5, 1),
+    "write": (3, 2, 0.1, 5),
+    "api":   (2, 2, 0.1, 2),
+    "admin": (1, 2, 1.0, 5),
+}
+
+
+def _configured_limits():
+    """ADMISSION_LIMITS 파싱 — read 외 상한 합이 THREADS - READ_RESERVE를 넘으면
+    설정값 대비 가장 덜 줄어든 종류부터 1씩 줄인다 (비율 유지, 최소 1)"""
+    limits = {}
+    for part in os.environ.get("ADMISSION_LIMITS", "").split(","):
+        name, _, value = part.partition("=")
+        if name.strip() in CLASSES and value.strip().isdigit():
+            limits[name.strip()] = max(1, int(value))
+    others = {name: limits.get(name, spec[0]) for name, spec in CLASSES.items() if name != "read"}
+    budget = THREADS - READ_RESERVE
+    if sum(others.values()) > budget:
+        asked = dict(others)
+        while sum(others.values()) > budget:
+            candidates = [name for name in others if others[name] > 1]
+            if not candidates:
+                break
+            name = max(candidates, key=lambda n: (others[n] / asked[n], others[n]))
+            others[name] -= 1
+        print(f"[admission] 조회 예비 스레드 {READ_RESERVE}개를 남기도록 상한 조정: {asked} → {others}")
+        limits.update(others)
+    return limits
+
+
+def classify(method: str, path: str):
+    """요청 → 종류 (None이면 제한 없음)"""
+    if path.startswith("/static/"):
+        return None
+    if path.startswith("/admin"):
+        return "admin"
+    if path.startswith("/api/"):
+        return "api"
+    if method not in ("GET", "HEAD", "OPTIONS"):
+        return "write"
+    return "read"
+
+
+# ──────────────────────────────────────────────────────────
+# 종류별 게이트
+# ──────────────────────────────────────────────────────────
+class _Gate:
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float, retry_after: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.cond = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.wait_total = 0.0
+
+    def acquire(self) -> bool:
+        with self.cond:
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            if self.waiting >= self.max_queue:
+                self.shed += 1
+                return False
+            self.waiting += 1
+            self.queued += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            start = time.monotonic()
+            deadline = start + self.max_wait
+            try:
+                while self.in_flight >= self.limit:
+                    left = deadline - time.monotonic()
+                    if left <= 0 or not self.cond.wait(left):
+                        if self.in_flight < self.limit:
+                            break
+                        self.shed += 1
+                        return False
+                self.in_flight += 1
+                self.admitted += 1
+                return True
+            finally:
+                self.waiting -= 1
+                self.wait_total += time.monotonic() - start
+
+    def release(self):
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify()
+
+    def snapshot(self) -> dict:
+        with self.cond:
+            return {
+                "limit": self.limit, "in_flight": self.in_flight, "queue_depth": self.waiting,
+                "peak_queue_depth": self.peak_waiting, "admitted": self.admitted,
+                "queued": self.queued, "shed": self.shed,
+                "avg_wait_ms": round(self.wait_total / self.queued * 1000, 1) if self.queued else 0.0,
+            }
+
+
+def _make_gates():
+    limits = _configured_limits()
+    return {name: _Gate(name, limits.get(name, spec[0]), *spec[1:]) for name, spec in CLASSES.items()}
+
+
+_gates = _make_gates()
+
+
+def stats() -> dict:
+    """종류별 동시 처리 수 / 대기열 깊이 / 수용·차단 누계"""
+    return {name: gate.snapshot() for name, gate in _gates.items()}
+
+
+# ──────────────────────────────────────────────────────────
+# WSGI 미들웨어
+# ──────────────────────────────────────────────────────────
+def _shed_response(gate: _Gate, environ, start_response):
+    headers = [("Retry-After", str(gate.retry_after)), ("Cache-Control", "no-store")]
+    if gate.name == "api" or "application/json" in environ.get("HTTP_ACCEPT", ""):
+        body = json.dumps({"error": "요청이 많아 잠시 후 다시 시도해주세요", "retry_after": gate.retry_after})
+        headers.append(("Content-Type", "application/json"))
+    else:
+        body = "요청이 많아 잠시 후 다시 시도해주세요."
+        headers.append(("Content-Type", "text/plain; charset=utf-8"))
+    data = body.encode("utf-8")
+    headers.append(("Content-Length", str(len(data))))
+    start_response("503 Service Unavailable", headers)
+    return [data]
+
+
+class AdmissionMiddleware:
+    """app.wsgi_app 감싸기 — 앱이 응답을 만들고 나면 슬롯 반환 (스트리밍 응답은 쓰지 않음)"""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        kind = classify(environ.get("REQUEST_METHOD", "GET"), environ.get("PATH_INFO", ""))
+        if kind is None:
+            return self.wsgi_app(environ, start_response)
+        gate = _gates[kind]
+        if not gate.acquire():
+            return _shed_response(gate, environ, start_response)
+        environ["vc.admission"] = kind
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            gate.release()
@@ -11,73 +11,49 @@ import re
 import json
 import uuid
 import bcrypt
-import time
 import threading
-import urllib.request
 from datetime import datetime, timedelta
-from xml.etree import ElementTree
 from flask import (
     Flask, render_template, request, redirect,
-    url_for, jsonify, abort, make_response
+    url_for, jsonify, abort, make_response, send_file
 )
 from dotenv import load_dotenv
 
-# ── AI 뉴스 캐시 (1시간마다 갱신) ──
-_news_cache = {"data": [], "updated": 0}
-_news_lock = threading.Lock()
-
-RSS_FEEDS = [
-    ("TechCrunch AI",   "https://techcrunch.com/category/artificial-intelligence/feed/"),
-    ("The Verge AI",    "https://www.theverge.com/ai-artificial-intelligence/rss/index.xml"),
-    ("VentureBeat AI",  "https://venturebeat.com/category/ai/feed/"),
-    ("MIT Tech Review", "https://www.technologyreview.com/feed/"),
-    ("AI News",         "https://www.artificialintelligence-news.com/feed/"),
-]
-
-def _parse_date(s):
-    if not s: return "최근"
-    try:
-        from email.utils import parsedate_to_datetime
-        dt = parsedate_to_datetime(s)
-        diff = datetime.now(dt.tzinfo) - dt
-        h = int(diff.total_seconds() / 3600)
-        if h < 1: return "방금 전"
-        if h < 24: return f"{h}시간 전"
-        return f"{diff.days}일 전"
-    except: return "최근"
-
-def _fetch_news():
-    items = []
-    for src, url in RSS_FEEDS:
-        try:
-            req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-            with urllib.request.urlopen(req, timeout=8) as r:
-                root = ElementTree.fromstring(r.read())
-            for item in root.findall(".//item")[:4]:
-                title = re.sub(r"<[^>]+>", "", item.findtext("title", ""))
-                link  = item.findtext("link", "") or item.findtext("guid", "")
-                date  = _parse_date(item.findtext("pubDate", ""))
-                if title and link:
-                    items.append({"source": src, "title": title[:120], "url": link, "time": date})
-        except: pass
-    return items[:18]
-
-def get_ai_news():
-    """캐시된 AI 뉴스 반환 (1시간 캐시)"""
-    with _news_lock:
-        if time.time() - _news_cache["updated"] > 3600:
-            data = _fetch_news()
-            if data:
-                _news_cache["data"] = data
-                _news_cache["updated"] = time.time()
-        return _news_cache["data"]
-
 load_dotenv()
 
-from db import get_conn, init_db, ph, fetchall, fetchone
-
-app = Flask(__name__, static_folder="static", template_folder="static")
+import deadline
+from db import get_conn, init_db, fetchall, fetchone, defer_write, run, run_many
+import db
+import queries as Q
+import tags as tag_index
+import fingerprint
+import jobs
+import retention
+import bundles
+import summary
+import render
+import admission
+import profiler
+import memtrack
+import comment_tree
+import feeds
+import snapshot
+import news
+import enrich
+import spamscore
+import moderation
+import counters
+import warmcache
+import botfilter
+
+app = Flask(__name__, static_folder="static", template_folder="templates")
+app.jinja_env.globals.update(
+    asset_url=bundles.asset_url, stylesheet=bundles.stylesheet, script=bundles.script,
+)
 app.secret_key = os.environ.get("SECRET_KEY", "vibecoder-dev-2025")
+# 경로 종류별 동시 처리 상한 — 포화 시 503 + Retry-After (admission.py)
+app.wsgi_app = admission.AdmissionMiddleware(app.wsgi_app)
+snapshot.bind(app)
 
 # ── 스팸 필터 키워드 ──
 SPAM_KEYWORDS = [
@@ -89,6 +65,8 @@ SPAM_KEYWORDS = [
 MIN_CONTENT_LEN = 10
 # IP당 분당 최대 게시 횟수
 RATE_LIMIT_PER_MIN = 3
+# 앱 프로세스 내 백그라운드 워커 스레드 수 (0이면 `python jobs.py worker`로 별도 실행)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "1"))
 
 
 # ──────────────────────────────────────────────────────────
@@ -104,7 +82,9 @@ def slugify(text: str) -> str:
 
 def hash_password(raw: str) -> str:
     """bcrypt 해시 (cost factor 12)"""
-    return bcrypt.hashpw(raw.encode(), bcrypt.gensalt(rounds=12)).decode()
+    deadline.check("bcrypt")
+    with deadline.stage("bcrypt"):
+        return bcrypt.hashpw(raw.encode(), bcrypt.gensalt(rounds=12)).decode()
 
 
 def check_password(raw: str, hashed: str) -> bool:
@@ -115,8 +95,10 @@ def check_password(raw: str, hashed: str) -> bool:
     if len(hashed) == 64 and all(c in "0123456789abcdef" for c in hashed):
         import hashlib
         return hashlib.sha256(raw.encode()).hexdigest() == hashed
+    deadline.check("bcrypt")
     try:
-        return bcrypt.checkpw(raw.encode(), hashed.encode())
+        with deadline.stage("bcrypt"):
+            return bcrypt.checkpw(raw.encode(), hashed.encode())
     except Exception:
         return False
 
@@ -164,12 +146,8 @@ def check_rate_limit(ip: str, action: str = "post") -> bool:
     """IP당 1분 내 RATE_LIMIT_PER_MIN 초과 시 True (차단)"""
     conn = get_conn()
     c = conn.cursor()
-    p = ph()
     cutoff = (datetime.now() - timedelta(minutes=1)).isoformat()
-    c.execute(
-        f"SELECT COUNT(*) as cnt FROM rate_limits WHERE ip_address={p} AND action={p} AND created_at>{p}",
-        (ip, action, cutoff)
-    )
+    run(c, Q.RATE_LIMIT_COUNT, (ip, action, cutoff))
     row = fetchone(c)
     count = row["cnt"] if row else 0
     conn.close()
@@ -180,14 +158,8 @@ def record_action(ip: str, action: str = "post"):
     """속도 제한 카운터 기록"""
     conn = get_conn()
     c = conn.cursor()
-    p = ph()
-    c.execute(
-        f"INSERT INTO rate_limits (ip_address, action, created_at) VALUES ({p},{p},{p})",
-        (ip, action, datetime.now().isoformat())
-    )
-    # 오래된 레코드 정리 (1시간 이상)
-    cutoff = (datetime.now() - timedelta(hours=1)).isoformat()
-    c.execute(f"DELETE FROM rate_limits WHERE created_at < {p}", (cutoff,))
+    run(c, Q.RATE_LIMIT_INSERT, (ip, action, datetime.now().isoformat()))
+    # 오래된 레코드 정리는 cleanup_rate_limits 작업이 담당 (retention.py)
     conn.commit()
     conn.close()
 
@@ -215,28 +187,204 @@ def fmt_date(dt_str):
 app.jinja_env.filters['fmt_date'] = fmt_date
 
 
+# ──────────────────────────────────────────────────────────
+# 요청 데드라인 (deadline.py) — 예산 초과 시 504
+# ──────────────────────────────────────────────────────────
+@app.before_request
+def _start_deadline():
+    kind = admission.classify(request.method, request.path)
+    seconds = deadline.budget_for(request.endpoint or "", kind) if kind else None
+    request.environ["vc.deadline_token"] = deadline.start(request.endpoint or request.path, seconds)
+
+
+@app.teardown_request
+def _finish_deadline(exc):
+    token = request.environ.pop("vc.deadline_token", None)
+    if token is not None:
+        deadline.finish(token, request.environ.pop("vc.deadline_exc", exc))
+
+
+@app.errorhandler(deadline.DeadlineExceeded)
+def deadline_exceeded(e):
+    request.environ["vc.deadline_exc"] = e
+    msg = "요청 처리 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
+    if request.path.startswith("/api/") or request.accept_mimetypes.best == "application/json":
+        return jsonify({"error": msg, "stage": e.stage}), 504
+    return msg, 504, {"Content-Type": "text/plain; charset=utf-8"}
+
+
+# ──────────────────────────────────────────────────────────
+# 요청 단위 프로파일링 — X-VC-Profile: <ADMIN_KEY> 헤더가 붙은 요청만 (profiler.py)
+# ──────────────────────────────────────────────────────────
+@app.before_request
+def _start_request_profile():
+    if request.headers.get("X-VC-Profile") == ADMIN_KEY:
+        sampler = profiler.RequestSampler(f"{request.method} {request.path}",
+                                          request.headers.get("X-VC-Profile-Hz", type=int))
+        if sampler.start():
+            request.environ["vc.profiler"] = sampler
+
+
+@app.after_request
+def _finish_request_profile(resp):
+    sampler = request.environ.pop("vc.profiler", None)
+    if sampler is not None:
+        sampler.finish(resp.status_code)
+    return resp
+
+
+@app.teardown_request
+def _abandon_request_profile(exc):
+    sampler = request.environ.pop("vc.profiler", None)
+    if sampler is not None:
+        sampler.finish(500)
+
+
+# ──────────────────────────────────────────────────────────
+# 메모리 추적 (memtrack.py) — 켜져 있을 때만 일부 요청의 전후 스냅샷 비교
+# ──────────────────────────────────────────────────────────
+@app.before_request
+def _start_memtrack():
+    if memtrack.ENABLED:
+        request.environ["vc.mem_before"] = memtrack.begin()
+
+
+@app.teardown_request
+def _finish_memtrack(exc):
+    before = request.environ.pop("vc.mem_before", None)
+    if before is not None:
+        memtrack.end(request.endpoint or request.path, before)
+
+
+# ──────────────────────────────────────────────────────────
+# 읽기 복제본 라우팅 — 방금 쓴 세션은 잠시 primary에서 읽기
+# ──────────────────────────────────────────────────────────
+# 복제 지연보다 넉넉하게 (lounge_write → redirect → lounge_post 404 방지)
+REPLICA_STICKY_SECONDS = 15
+
+
+@app.before_request
+def _route_reads():
+    if db.REPLICA_URLS:
+        pinned = request.method != "GET" or request.cookies.get("vc_rw") == "1"
+        request.environ["vc.read_token"] = db.read_from_primary(pinned)
+
+
+@app.after_request
+def _mark_recent_write(resp):
+    if (db.REPLICA_URLS or snapshot.SERVING) and request.method == "POST" and resp.status_code < 400:
+        resp.set_cookie("vc_rw", "1", max_age=REPLICA_STICKY_SECONDS, httponly=True, samesite="Lax")
+    return resp
+
+
+@app.after_request
+def _cache_bundles(resp):
+    # 해시 파일명 → 내용이 바뀌면 URL도 바뀌므로 영구 캐시
+    if request.path.startswith(bundles.URL_PREFIX) and resp.status_code == 200:
+        resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return resp
+
+
+@app.teardown_request
+def _reset_read_routing(exc):
+    token = request.environ.pop("vc.read_token", None)
+    if token is not None:
+        db.reset_read_routing(token)
+
+
+# ──────────────────────────────────────────────────────────
+# 봇/크롤러 판별 (botfilter.py) — 봇이면 방문 통계·조회수 쓰기 생략
+# ──────────────────────────────────────────────────────────
+@app.before_request
+def _tag_bot():
+    if request.path.startswith(("/static/", bundles.URL_PREFIX, "/admin")):
+        return
+    ip_hash = _ip_hash()
+    request.environ["vc.ip_hash"] = ip_hash
+    request.environ["vc.bot"] = botfilter.classify(request.headers.get("User-Agent", ""), ip_hash)
+    if request.environ["vc.bot"] and not JOB_WORKERS:
+        botfilter.maybe_flush()
+
+
+def is_bot() -> bool:
+    return request.environ.get("vc.bot") is not None
+
+
+# ──────────────────────────────────────────────────────────
+# 정적 스냅샷 서빙 (snapshot.py) — 파일이 있으면 DB/Jinja 없이 전송
+# 방금 쓴 세션(vc_rw)과 쿼리 문자열이 있는 요청은 동적 렌더링
+# ──────────────────────────────────────────────────────────
+@app.before_request
+def _serve_snapshot():
+    if not snapshot.SERVING or request.method != "GET" or request.query_string or request.cookies.get("vc_rw"):
+        return None
+    hit = snapshot.lookup(request.path)
+    if hit is None:
+        return None
+    kind, slug, fpath = hit
+    # 동적 경로와 같은 부수 효과 (방문 통계 / 조회수)
+    if kind == "project":
+        if not is_bot():
+            defer_write(Q.PROJECT_VIEW, (slug,))
+            counters.defer_add("project_views")
+    elif kind == "post":
+        if not is_bot():
+            defer_write(Q.POST_VIEW, (slug,))
+    elif kind in ("home", "showcase", "trends"):
+        record_pageview(request.path)
+    return send_file(fpath, mimetype=snapshot.mimetype(kind), max_age=snapshot.MAX_AGE)
+
+
+@app.route("/api/live/<kind>/<slug>")
+def api_live(kind, slug):
+    """스냅샷 페이지의 좋아요/조회수 + 본인 글·댓글 여부 (live.js)"""
+    if kind not in ("project", "post"):
+        abort(404)
+    session_token = request.cookies.get("vc_session", "")
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    run(c, Q.PROJECT_LIVE if kind == "project" else Q.POST_LIVE, (slug,))
+    row = fetchone(c)
+    if not row:
+        conn.close(); abort(404)
+    mine = []
+    if session_token:
+        run(c, Q.COMMENTS_MINE_FOR_PROJECT if kind == "project" else Q.COMMENTS_MINE_FOR_POST,
+            (row["id"], session_token))
+        mine = [r["id"] for r in fetchall(c)]
+    conn.close()
+    can_edit = kind == "post" and bool(session_token) and session_token == row["session_token"]
+    resp = jsonify({"likes": row["likes"], "views": row["view_count"], "can_edit": can_edit, "mine": mine})
+    resp.headers["Cache-Control"] = "private, no-store"
+    return resp
+
+
 # ──────────────────────────────────────────────────────────
 # 메인 / 홈
 # ──────────────────────────────────────────────────────────
 @app.route("/")
 def index():
-    conn = get_conn()
+    record_pageview("/")
+    return _render_index()
+
+
+@snapshot.renderer("home")
+def _render_index(_slug=None):
+    conn = get_conn(readonly=True)
     c = conn.cursor()
 
-    c.execute("SELECT * FROM projects WHERE is_featured=1 ORDER BY created_at DESC LIMIT 6")
+    run(c, Q.PROJECTS_FEATURED)
     featured = fetchall(c)
 
-    c.execute("SELECT * FROM posts WHERE is_spam=0 AND is_deleted=0 ORDER BY created_at DESC LIMIT 5")
+    run(c, Q.POSTS_LATEST)
     latest_posts = fetchall(c)
 
-    c.execute("SELECT * FROM posts WHERE category='info' AND is_spam=0 AND is_deleted=0 ORDER BY created_at DESC LIMIT 3")
+    run(c, Q.POSTS_INFO_LATEST)
     trend_news = fetchall(c)
 
-    c.execute("SELECT COUNT(*) as cnt FROM projects")
-    project_count = fetchone(c)["cnt"]
-
-    c.execute("SELECT COUNT(*) as cnt FROM posts WHERE is_spam=0 AND is_deleted=0")
-    post_count = fetchone(c)["cnt"]
+    totals = counters.get(c)
+    project_count = totals["projects"]
+    post_count = totals["posts"]
 
     conn.close()
 
@@ -247,10 +395,9 @@ def index():
             except Exception:
                 proj["tech_stack"] = []
 
-    # AI 뉴스 (캐시, 1시간 갱신)
-    ai_news = get_ai_news()
+    # AI 뉴스 (보관소 첫 페이지, 메모리)
+    ai_news = news.latest()
 
-    record_pageview("/")
     return render_template("index.html",
         featured=featured,
         latest_posts=latest_posts,
@@ -266,22 +413,34 @@ def index():
 # ──────────────────────────────────────────────────────────
 @app.route("/showcase")
 def showcase():
-    conn = get_conn()
-    c = conn.cursor()
-
     page = max(1, request.args.get("page", 1, type=int))
+    tech = request.args.get("tech", "").strip()
+    record_pageview("/showcase")
+    return _render_showcase(page, tech)
+
+
+@snapshot.renderer("showcase")
+def _render_showcase_snapshot(_slug=None):
+    return _render_showcase(1, "")
+
+
+def _render_showcase(page: int, tech: str):
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
     per_page = 12
     offset = (page - 1) * per_page
-    p = ph()
 
-    c.execute(
-        f"SELECT * FROM projects ORDER BY is_featured DESC, created_at DESC LIMIT {p} OFFSET {p}",
-        (per_page, offset),
-    )
-    projects = fetchall(c)
+    if tech:
+        # 태그 인덱스 조인 (tech_stack JSON 전체 스캔 없음)
+        run(c, Q.PROJECTS_PAGE_BY_TECH, (tag_index.KIND_TECH, tag_index.normalize(tech), per_page, offset))
+        projects = fetchall(c)
+        total = tag_index.tag_total(c, tag_index.KIND_TECH, tech)
+    else:
+        run(c, Q.PROJECTS_PAGE, (per_page, offset))
+        projects = fetchall(c)
+        total = counters.get(c)["projects"]
 
-    c.execute("SELECT COUNT(*) as cnt FROM projects")
-    total = fetchone(c)["cnt"]
+    facets = tag_index.facet_counts(c, tag_index.KIND_TECH)
     conn.close()
 
     for proj in projects:
@@ -291,50 +450,65 @@ def showcase():
             except Exception:
                 proj["tech_stack"] = []
 
-    record_pageview("/showcase")
     return render_template("showcase.html",
         projects=projects,
         page=page,
         total_pages=(total + per_page - 1) // per_page,
         total=total,
+        tech=tech,
+        facets=facets,
     )
 
 
 @app.route("/trends")
 def trends():
-    conn = get_conn()
+    record_pageview("/trends")
+    return _render_trends()
+
+
+@snapshot.renderer("trends")
+def _render_trends(_slug=None):
+    conn = get_conn(readonly=True)
     c = conn.cursor()
-    c.execute(
-        "SELECT * FROM posts WHERE category='info' AND is_spam=0 AND is_deleted=0 ORDER BY created_at DESC LIMIT 20"
-    )
+    run(c, Q.POSTS_INFO_TRENDS)
     news_items = fetchall(c)
     conn.close()
 
-    ai_news = get_ai_news()
-    record_pageview("/trends")
-    return render_template("trends.html", news_items=news_items, ai_news=ai_news)
+    # 뉴스 보관소 — ?before=<cursor> 로 이전 기사 (첫 페이지는 메모리)
+    ai_news, next_cursor = news.page(request.args.get("before"), request.args.get("source"))
+    return render_template("trends.html", news_items=news_items, ai_news=ai_news, next_cursor=next_cursor,
+                           news_sources=[src for src, _ in news.RSS_FEEDS], source=request.args.get("source", ""))
 
 
 @app.route("/api/ai-news")
 def api_ai_news():
-    """실시간 AI 뉴스 API (1시간 캐시)"""
-    news = get_ai_news()
-    return jsonify({"ok": True, "news": news, "count": len(news)})
+    """AI 뉴스 API — ?before=<cursor>&source=&limit= 키셋 페이지 (첫 페이지는 메모리)"""
+    items, next_cursor = news.page(request.args.get("before"), request.args.get("source"),
+                                   request.args.get("limit", news.PAGE_SIZE, type=int))
+    return jsonify({"ok": True, "news": items, "count": len(items), "next": next_cursor})
 
 
 @app.route("/showcase/<slug>")
 def project_detail(slug):
-    conn = get_conn()
-    c = conn.cursor()
-    p = ph()
+    conn = get_conn(readonly=True)
+    ctx = _project_context(conn.cursor(), slug)
+    if ctx is None:
+        conn.close(); abort(404)
+    if not is_bot():
+        defer_write(Q.PROJECT_VIEW, (slug,), conn)
+        counters.defer_add("project_views", conn=conn)
+    conn.close()
 
-    c.execute(f"SELECT * FROM projects WHERE slug={p}", (slug,))
+    session_token = request.cookies.get("vc_session", "")
+    return render_template("project.html", session_token=session_token, **ctx)
+
+
+def _project_context(c, slug):
+    """프로젝트 상세 템플릿 값 (세션별 값 제외), 없으면 None"""
+    run(c, Q.PROJECT_BY_SLUG, (slug,))
     proj = fetchone(c)
     if not proj:
-        conn.close(); abort(404)
-
-    c.execute(f"UPDATE projects SET view_count=view_count+1 WHERE slug={p}", (slug,))
-    conn.commit()
+        return None
 
     if proj.get("tech_stack"):
         try:
@@ -342,25 +516,44 @@ def project_detail(slug):
         except Exception:
             proj["tech_stack"] = []
 
-    c.execute(
-        f"SELECT * FROM comments WHERE project_id={p} AND is_approved=1 AND is_deleted=0 ORDER BY created_at ASC",
-        (proj["id"],),
-    )
+    run(c, Q.COMMENTS_FOR_PROJECT, (proj["id"], comment_tree.INITIAL_DEPTH))
     comments = fetchall(c)
+    run(c, Q.COMMENTS_COUNT_FOR_PROJECT, (proj["id"],))
+    comment_total = fetchone(c)["cnt"]
+    for row in comments:
+        row["content_html"] = render.html_for(row)
+    # 저장소/데모 정보는 enrich_projects 작업이 모아 둔 캐시만 (외부 호출 없음)
+    meta = enrich.for_project(c, proj["id"])
+    return dict(proj=proj, comments=comments, comment_total=comment_total, meta=meta,
+                collapse_depth=comment_tree.INITIAL_DEPTH - 1)
+
+
+def _project_slugs():
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    run(c, Q.PROJECT_SLUGS)
+    slugs = [r["slug"] for r in fetchall(c)]
     conn.close()
+    return slugs
 
-    session_token = request.cookies.get("vc_session", "")
-    return render_template("project.html", proj=proj, comments=comments, session_token=session_token)
+
+@snapshot.renderer("project", lister=_project_slugs)
+def _render_project_snapshot(slug):
+    conn = get_conn(readonly=True)
+    ctx = _project_context(conn.cursor(), slug)
+    conn.close()
+    if ctx is None:
+        return None
+    return render_template("project.html", session_token="", snapshot=True, **ctx)
 
 
 @app.route("/showcase/<slug>/like", methods=["POST"])
 def project_like(slug):
     conn = get_conn()
     c = conn.cursor()
-    p = ph()
-    c.execute(f"UPDATE projects SET likes=likes+1 WHERE slug={p}", (slug,))
+    run(c, Q.PROJECT_LIKE, (slug,))
     conn.commit()
-    c.execute(f"SELECT likes FROM projects WHERE slug={p}", (slug,))
+    run(c, Q.PROJECT_LIKES, (slug,))
     row = fetchone(c)
     conn.close()
     return jsonify({"likes": row["likes"] if row else 0})
@@ -393,28 +586,40 @@ def submit():
         if is_spam(title, description):
             return render_template("submit.html", error="스팸으로 감지된 내용입니다.")
 
-        tech_list = [t.strip() for t in tech_raw.split(",") if t.strip()]
+        tech_list = tag_index.parse_tags(tech_raw)
         slug = slugify(title) + "-" + datetime.now().strftime("%m%d%H%M")
 
         conn = get_conn()
         c = conn.cursor()
-        p = ph()
+        sig, dup = fingerprint.find_duplicate(c, description)
+        if dup:
+            conn.close()
+            return render_template("submit.html", error="이미 등록된 내용과 거의 같습니다.")
         try:
-            c.execute(
-                f"""INSERT INTO projects
-                    (created_at, title, slug, description, tech_stack,
-                     demo_url, github_url, thumbnail, author, is_featured, ip_address)
-                    VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p},0,{p})""",
-                (
-                    datetime.now().isoformat(), title, slug, description,
-                    json.dumps(tech_list, ensure_ascii=False),
-                    demo_url, github_url, thumbnail, author, ip,
-                ),
-            )
+            now = datetime.now().isoformat()
+            run(c, Q.PROJECT_INSERT, (
+                now, title, slug, description,
+                json.dumps(tech_list, ensure_ascii=False),
+                demo_url, github_url, thumbnail, author, ip,
+            ))
+            run(c, Q.PROJECT_ID_BY_SLUG, (slug,))
+            project_id = fetchone(c)["id"]
+            tag_index.link_tags(c, tag_index.KIND_TECH, project_id, tech_list)
+            fingerprint.record(c, "project", project_id, sig)
+            feeds.add_project(c, project_id, slug, now)
+            counters.add(c, "projects")
+            enrich.track(c, project_id, github_url, demo_url)
+            changed = snapshot.mark(c, *snapshot.project_paths(slug))
             conn.commit()
             conn.close()
+            if not JOB_WORKERS:
+                feeds.maybe_rebuild()
+                snapshot.render_paths(changed)
             record_action(ip, "project")
             return redirect(url_for("project_detail", slug=slug))
+        except deadline.DeadlineExceeded:
+            conn.close()
+            raise
         except Exception as e:
             conn.close()
             return render_template("submit.html", error=f"저장 실패: {e}")
@@ -427,34 +632,38 @@ def submit():
 # ──────────────────────────────────────────────────────────
 @app.route("/lounge")
 def lounge():
-    conn = get_conn()
+    conn = get_conn(readonly=True)
     c = conn.cursor()
 
     page = max(1, request.args.get("page", 1, type=int))
     category = request.args.get("category", "")
+    tag = request.args.get("tag", "").strip()
     per_page = 20
     offset = (page - 1) * per_page
-    p = ph()
 
-    base_where = "is_spam=0 AND is_deleted=0"
-
-    if category:
-        c.execute(
-            f"SELECT * FROM posts WHERE {base_where} AND category={p} ORDER BY created_at DESC LIMIT {p} OFFSET {p}",
-            (category, per_page, offset),
-        )
-        c2 = conn.cursor()
-        c2.execute(f"SELECT COUNT(*) as cnt FROM posts WHERE {base_where} AND category={p}", (category,))
+    c2 = conn.cursor()
+    if tag:
+        # 태그 인덱스 조인, 카테고리 미지정 시 총 개수는 카운트 테이블에서
+        args = (tag_index.KIND_POST, tag_index.normalize(tag))
+        if category:
+            run(c, Q.POSTS_PAGE_BY_TAG_CATEGORY, args + (category, per_page, offset))
+            run(c2, Q.POSTS_COUNT_BY_TAG_CATEGORY, args + (category,))
+        else:
+            run(c, Q.POSTS_PAGE_BY_TAG, args + (per_page, offset))
+            run(c2, Q.TAG_USE_COUNT, args)
+    elif category:
+        run(c, Q.POSTS_PAGE_BY_CATEGORY, (category, per_page, offset))
+        run(c2, Q.POSTS_COUNT_BY_CATEGORY, (category,))
     else:
-        c.execute(
-            f"SELECT * FROM posts WHERE {base_where} ORDER BY created_at DESC LIMIT {p} OFFSET {p}",
-            (per_page, offset),
-        )
-        c2 = conn.cursor()
-        c2.execute(f"SELECT COUNT(*) as cnt FROM posts WHERE {base_where}")
+        run(c, Q.POSTS_PAGE, (per_page, offset))
 
     posts = fetchall(c)
-    total = fetchone(c2)["cnt"]
+    if tag or category:
+        row = fetchone(c2)
+        total = row["cnt"] if row else 0
+    else:
+        total = counters.get(c2)["posts"]
+    facets = tag_index.facet_counts(c, tag_index.KIND_POST)
     conn.close()
 
     session_token = request.cookies.get("vc_session", "")
@@ -466,6 +675,8 @@ def lounge():
         total_pages=(total + per_page - 1) // per_page,
         total=total,
         category=category,
+        tag=tag,
+        facets=facets,
         session_token=session_token,
     )
 
@@ -488,13 +699,17 @@ def lounge_write():
         author = request.form.get("author", "익명코더").strip() or "익명코더"
         password = request.form.get("password", "").strip()
         tags = request.form.get("tags", "").strip()
+        tag_list = tag_index.parse_tags(tags)
 
         if not title:
             return render_template("lounge_write.html", error="제목을 입력해주세요.")
         if not content or len(content) < MIN_CONTENT_LEN:
             return render_template("lounge_write.html", error=f"내용을 {MIN_CONTENT_LEN}자 이상 입력해주세요.")
 
-        spam = is_spam(title, content)
+        if not JOB_WORKERS:
+            spamscore.sync()
+        rule_spam = is_spam(title, content)
+        auto_spam = not rule_spam and spamscore.predict(title, content)
         slug = slugify(title) + "-" + datetime.now().strftime("%m%d%H%M")
         pw_hash = hash_password(password) if password else None
 
@@ -503,26 +718,39 @@ def lounge_write():
 
         conn = get_conn()
         c = conn.cursor()
-        p = ph()
+        # 근사 중복(재게시)은 스팸과 같이 숨김 처리
+        sig, dup = fingerprint.find_duplicate(c, content)
+        auto_spam = auto_spam or (not rule_spam and bool(dup))
+        spam = rule_spam or auto_spam
         try:
-            c.execute(
-                f"""INSERT INTO posts
-                    (created_at, title, slug, content, category, author_name,
-                     password_hash, session_token, ip_address, tags, is_spam)
-                    VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p})""",
-                (
-                    datetime.now().isoformat(), title, slug, content, category,
-                    author, pw_hash, session_token, ip, tags,
-                    1 if spam else 0,
-                ),
-            )
+            now = datetime.now().isoformat()
+            run(c, Q.POST_INSERT, (
+                now, title, slug, content, category,
+                author, pw_hash, session_token, ip, moderation.ip_prefix(ip), ", ".join(tag_list),
+                1 if spam else 0, 1 if auto_spam else 0,
+            ) + summary.summarize(content) + render.columns(content))
+            run(c, Q.POST_ID_BY_SLUG, (slug,))
+            post_id = fetchone(c)["id"]
+            tag_index.link_tags(c, tag_index.KIND_POST, post_id, tag_list, counted=not spam)
+            fingerprint.record(c, "post", post_id, sig)
+            changed = []
+            if not spam:
+                feeds.add_post(c, post_id, slug, category, now)
+                counters.add(c, "posts")
+                changed = snapshot.mark(c, *snapshot.post_paths(slug, category))
             conn.commit()
             conn.close()
+            if not JOB_WORKERS:
+                feeds.maybe_rebuild()
+                snapshot.render_paths(changed)
             record_action(ip, "post")
 
             resp = make_response(redirect(url_for("lounge_post", slug=slug)))
             resp.set_cookie("vc_session", session_token, max_age=60*60*24*365, httponly=True, samesite="Lax")
             return resp
+        except deadline.DeadlineExceeded:
+            conn.close()
+            raise
         except Exception as e:
             conn.close()
             return render_template("lounge_write.html", error=f"저장 실패: {e}")
@@ -532,43 +760,65 @@ def lounge_write():
 
 @app.route("/lounge/<slug>")
 def lounge_post(slug):
-    conn = get_conn()
-    c = conn.cursor()
-    p = ph()
+    conn = get_conn(readonly=True)
+    ctx = _post_context(conn.cursor(), slug)
+    if ctx is None:
+        conn.close(); abort(404)
+    post = ctx["post"]
+    if not post.get("is_spam") and not is_bot():
+        defer_write(Q.POST_VIEW, (slug,), conn)
+    conn.close()
+
+    session_token = request.cookies.get("vc_session", "")
+    can_edit = session_token and session_token == post.get("session_token")
+
+    return render_template("lounge_post.html", can_edit=can_edit, session_token=session_token, **ctx)
 
-    c.execute(f"SELECT * FROM posts WHERE slug={p} AND is_deleted=0", (slug,))
+
+def _post_context(c, slug):
+    """라운지 글 상세 템플릿 값 (세션별 값 제외), 없으면 None"""
+    run(c, Q.POST_VISIBLE_BY_SLUG, (slug,))
     post = fetchone(c)
     if not post:
-        conn.close(); abort(404)
+        return None
 
-    if not post.get("is_spam"):
-        c.execute(f"UPDATE posts SET view_count=view_count+1 WHERE slug={p}", (slug,))
-        conn.commit()
-
-    c.execute(
-        f"SELECT * FROM comments WHERE post_id={p} AND is_approved=1 AND is_deleted=0 ORDER BY created_at ASC",
-        (post["id"],),
-    )
+    run(c, Q.COMMENTS_FOR_POST, (post["id"], comment_tree.INITIAL_DEPTH))
     comments = fetchall(c)
+    run(c, Q.COMMENTS_COUNT_FOR_POST, (post["id"],))
+    comment_total = fetchone(c)["cnt"]
+    for row in [post] + comments:
+        row["content_html"] = render.html_for(row)
+    return dict(post=post, comments=comments, comment_total=comment_total,
+                collapse_depth=comment_tree.INITIAL_DEPTH - 1)
+
+
+def _trend_post_slugs():
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    run(c, Q.POST_SLUGS_INFO)
+    slugs = [r["slug"] for r in fetchall(c)]
     conn.close()
+    return slugs
 
-    session_token = request.cookies.get("vc_session", "")
-    can_edit = session_token and session_token == post.get("session_token")
 
-    return render_template("lounge_post.html",
-        post=post, comments=comments,
-        can_edit=can_edit, session_token=session_token,
-    )
+@snapshot.renderer("post", lister=_trend_post_slugs)
+def _render_post_snapshot(slug):
+    """트렌드(info) 글만 — 그 외 글은 동적 렌더링"""
+    conn = get_conn(readonly=True)
+    ctx = _post_context(conn.cursor(), slug)
+    conn.close()
+    if ctx is None or ctx["post"]["category"] != "info" or ctx["post"].get("is_spam"):
+        return None
+    return render_template("lounge_post.html", can_edit=False, session_token="", snapshot=True, **ctx)
 
 
 @app.route("/lounge/<slug>/like", methods=["POST"])
 def post_like(slug):
     conn = get_conn()
     c = conn.cursor()
-    p = ph()
-    c.execute(f"UPDATE posts SET likes=likes+1 WHERE slug={p}", (slug,))
+    run(c, Q.POST_LIKE, (slug,))
     conn.commit()
-    c.execute(f"SELECT likes FROM posts WHERE slug={p}", (slug,))
+    run(c, Q.POST_LIKES, (slug,))
     row = fetchone(c)
     conn.close()
     return jsonify({"likes": row["likes"] if row else 0})
@@ -579,9 +829,8 @@ def post_delete(slug):
     """세션 쿠키 or 비밀번호로 본인 글 삭제 (soft delete)"""
     conn = get_conn()
     c = conn.cursor()
-    p = ph()
 
-    c.execute(f"SELECT * FROM posts WHERE slug={p}", (slug,))
+    run(c, Q.POST_BY_SLUG, (slug,))
     post = fetchone(c)
     if not post:
         conn.close(); abort(404)
@@ -595,9 +844,18 @@ def post_delete(slug):
     )
 
     if can_delete:
-        c.execute(f"UPDATE posts SET is_deleted=1 WHERE slug={p}", (slug,))
+        run(c, Q.POST_SOFT_DELETE, (slug,))
+        changed = []
+        if not post.get("is_deleted") and not post.get("is_spam"):
+            tag_index.adjust_counts(c, tag_index.KIND_POST, post["id"], -1)
+            feeds.remove_post(c, slug, post["category"])
+            counters.add(c, "posts", -1)
+            changed = snapshot.mark(c, *snapshot.post_paths(slug, post["category"]))
         conn.commit()
         conn.close()
+        if not JOB_WORKERS:
+            feeds.maybe_rebuild()
+            snapshot.render_paths(changed)
         return redirect(url_for("lounge"))
     else:
         conn.close()
@@ -617,6 +875,7 @@ def add_comment():
 
     post_id = request.form.get("post_id", type=int)
     project_id = request.form.get("project_id", type=int)
+    parent_id = request.form.get("parent_id", type=int)
     author = request.form.get("author", "익명코더").strip() or "익명코더"
     content = request.form.get("content", "").strip()
     password = request.form.get("password", "").strip()
@@ -625,25 +884,35 @@ def add_comment():
     if not content or len(content) < 2:
         return redirect(redirect_url)
 
-    spam = is_spam("", content)
+    if not JOB_WORKERS:
+        spamscore.sync()
+    rule_spam = is_spam("", content)
+    auto_spam = not rule_spam and spamscore.predict("", content)
     pw_hash = hash_password(password) if password else None
     session_token = request.cookies.get("vc_session") or str(uuid.uuid4())
 
     conn = get_conn()
     c = conn.cursor()
-    p = ph()
-    c.execute(
-        f"""INSERT INTO comments
-            (created_at, post_id, project_id, author_name, password_hash,
-             session_token, ip_address, content, is_spam)
-            VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p})""",
-        (
-            datetime.now().isoformat(), post_id, project_id, author,
-            pw_hash, session_token, ip, content, 1 if spam else 0,
-        ),
-    )
+    sig, dup = fingerprint.find_duplicate(c, content)
+    auto_spam = auto_spam or (not rule_spam and bool(dup))
+    spam = rule_spam or auto_spam
+    parent = comment_tree.resolve_parent(c, parent_id, post_id, project_id)
+    run(c, Q.COMMENT_INSERT, (
+        datetime.now().isoformat(), post_id, project_id, author,
+        pw_hash, session_token, ip, moderation.ip_prefix(ip), content, 1 if spam else 0, 1 if auto_spam else 0,
+    ) + render.columns(content))
+    comment_id = fetchone(c)["id"]
+    # 스팸/중복 판정 댓글은 모더레이션 spam과 같은 숨김 상태로 저장 (화면/댓글 수에서 빠짐)
+    comment_tree.attach(c, comment_id, parent, hidden=spam)
+    fingerprint.record(c, "comment", comment_id, sig)
+    changed = []
+    if not spam:
+        counters.add(c, "comments")
+        changed = snapshot.mark_comment(c, post_id, project_id)
     conn.commit()
     conn.close()
+    if not JOB_WORKERS:
+        snapshot.render_paths(changed)
     record_action(ip, "comment")
 
     resp = make_response(redirect(redirect_url))
@@ -655,9 +924,8 @@ def add_comment():
 def delete_comment(comment_id):
     conn = get_conn()
     c = conn.cursor()
-    p = ph()
 
-    c.execute(f"SELECT * FROM comments WHERE id={p}", (comment_id,))
+    run(c, Q.COMMENT_BY_ID, (comment_id,))
     comment = fetchone(c)
     if not comment:
         conn.close(); abort(404)
@@ -672,41 +940,103 @@ def delete_comment(comment_id):
     )
 
     if can_delete:
-        c.execute(f"UPDATE comments SET is_deleted=1 WHERE id={p}", (comment_id,))
+        # 답글이 남아 있으면 자리만 남기고, 사라지는 경우 조상 답글 수 갱신 (comment_tree.py)
+        if not comment["is_deleted"]:
+            counters.add(c, "comments", -1)
+        comment_tree.soft_delete(c, comment)
+        changed = snapshot.mark_comment(c, comment["post_id"], comment["project_id"])
         conn.commit()
+        if not JOB_WORKERS:
+            snapshot.render_paths(changed)
 
     conn.close()
     return redirect(redirect_url)
 
 
+@app.route("/comment/<int:comment_id>/replies")
+def comment_replies(comment_id):
+    """접힌 답글 가지 — 서브트리 전체를 화면 순서대로 JSON으로"""
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    run(c, Q.COMMENT_PARENT, (comment_id,))
+    parent = fetchone(c)
+    if not parent or not parent["path"]:
+        conn.close(); abort(404)
+    rows = comment_tree.replies(c, parent["path"])
+    conn.close()
+
+    session_token = request.cookies.get("vc_session", "")
+    replies = []
+    for row in rows:
+        deleted = bool(row["is_deleted"])
+        replies.append({
+            "id": row["id"], "parent_id": row["parent_id"], "depth": row["depth"],
+            "reply_count": row["reply_count"], "deleted": deleted,
+            "author_name": None if deleted else (row["author_name"] or "익명코더"),
+            "content_html": None if deleted else render.html_for(row),
+            "time": fmt_date(row["created_at"]),
+            "mine": bool(session_token) and not deleted and session_token == row["session_token"],
+        })
+    return jsonify({"ok": True, "replies": replies, "max_depth": comment_tree.MAX_DEPTH})
+
+
 # ──────────────────────────────────────────────────────────
 # 방문자 통계 기록
 # ──────────────────────────────────────────────────────────
+import atexit
 import hashlib as _hl
 
+# 요청 경로에서는 메모리 버퍼에 쌓고, 워커 틱이 일괄 INSERT
+_pv_buffer = []
+_pv_lock = threading.Lock()
+PV_FLUSH_INTERVAL = 5
+PV_BUFFER_MAX = 5000  # DB 장애 시 메모리 상한
+
+
+def _ip_hash() -> str:
+    return _hl.md5(get_client_ip().encode()).hexdigest()[:12]  # 비식별화
+
+
 def record_pageview(path: str):
-    """페이지뷰 기록 (IP는 해시 처리, 개인정보 보호)"""
+    """페이지뷰 기록 (IP는 해시 처리, 개인정보 보호) — 봇은 BOT_PV_SAMPLE 표본만"""
+    if is_bot() and not botfilter.sampled():
+        return
     try:
-        ip = get_client_ip()
-        ip_hash = _hl.md5(ip.encode()).hexdigest()[:12]  # 비식별화
+        ip_hash = request.environ.get("vc.ip_hash") or _ip_hash()
         ua = request.headers.get("User-Agent", "")[:200]
         ref = request.headers.get("Referer", "")[:200]
         # Accept-Language로 국가 힌트
         al = request.headers.get("Accept-Language", "")
         country_hint = al.split(",")[0].split(";")[0].strip()[:10] if al else ""
-        conn = get_conn()
-        c = conn.cursor()
-        p = ph()
-        c.execute(
-            f"INSERT INTO page_views (created_at, path, ip_hash, referrer, user_agent, country_hint) VALUES ({p},{p},{p},{p},{p},{p})",
-            (datetime.now().isoformat(), path, ip_hash, ref, ua, country_hint)
-        )
-        conn.commit()
-        conn.close()
+        with _pv_lock:
+            if len(_pv_buffer) < PV_BUFFER_MAX:
+                _pv_buffer.append((datetime.now().isoformat(), path, ip_hash, ref, ua, country_hint))
+        if not JOB_WORKERS:
+            flush_pageviews()
     except Exception:
         pass  # 통계 실패해도 페이지는 정상 동작
 
 
+@jobs.tick(PV_FLUSH_INTERVAL)
+def flush_pageviews():
+    """버퍼된 페이지뷰 일괄 저장"""
+    with _pv_lock:
+        rows = _pv_buffer[:]
+        del _pv_buffer[:]
+    if not rows:
+        return
+    conn = get_conn()
+    c = conn.cursor()
+    retention.insert_pageviews(c, rows)
+    conn.commit()
+    conn.close()
+
+
+atexit.register(flush_pageviews)
+atexit.register(warmcache.shutdown)
+atexit.register(botfilter.shutdown)
+
+
 # ──────────────────────────────────────────────────────────
 # 관리자 대시보드 /admin
 # ──────────────────────────────────────────────────────────
@@ -717,55 +1047,74 @@ def admin_dashboard():
     if request.args.get("key") != ADMIN_KEY:
         return "401 Unauthorized", 401
 
-    conn = get_conn()
+    conn = get_conn(readonly=True)
     c = conn.cursor()
-    p = ph()
-
-    # 총 방문자 (unique ip_hash 기준)
-    c.execute("SELECT COUNT(*) as cnt FROM page_views")
-    total_pv = fetchone(c)["cnt"]
 
-    c.execute("SELECT COUNT(DISTINCT ip_hash) as cnt FROM page_views")
-    unique_visitors = fetchone(c)["cnt"]
+    # 총 방문자 (unique ip_hash 기준, 압축된 롤업 포함)
+    total_pv = retention.total_pageviews(c)
+    unique_visitors = retention.unique_visitors(c)
 
-    # 오늘 방문자
+    # 오늘 방문자 (created_at 범위 조건 → 파티션 인덱스 사용)
     today = datetime.now().strftime("%Y-%m-%d")
-    c.execute(f"SELECT COUNT(*) as cnt FROM page_views WHERE created_at LIKE {p}", (f"{today}%",))
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    run(c, Q.PAGEVIEWS_IN_RANGE, (today, tomorrow))
     today_pv = fetchone(c)["cnt"]
 
-    c.execute(f"SELECT COUNT(DISTINCT ip_hash) as cnt FROM page_views WHERE created_at LIKE {p}", (f"{today}%",))
+    run(c, Q.VISITORS_IN_RANGE, (today, tomorrow))
     today_uv = fetchone(c)["cnt"]
 
     # 최근 7일 일별 방문
+    week_start = (datetime.now() - timedelta(days=6)).strftime("%Y-%m-%d")
+    run(c, Q.PAGEVIEWS_DAILY, (week_start,))
+    by_day = {r["day"]: r["cnt"] for r in fetchall(c)}
     daily = []
     for i in range(6, -1, -1):
-        from datetime import timedelta
         d = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-        c.execute(f"SELECT COUNT(*) as cnt FROM page_views WHERE created_at LIKE {p}", (f"{d}%",))
-        daily.append({"date": d, "pv": fetchone(c)["cnt"]})
+        daily.append({"date": d, "pv": by_day.get(d, 0)})
 
     # 인기 페이지 TOP 10
-    c.execute("SELECT path, COUNT(*) as cnt FROM page_views GROUP BY path ORDER BY cnt DESC LIMIT 10")
-    top_pages = fetchall(c)
+    top_pages = [{"path": r["value"], "cnt": r["cnt"]} for r in retention.top_values(c, "path", 10)]
 
     # 유입 경로 TOP 5
-    c.execute("SELECT referrer, COUNT(*) as cnt FROM page_views WHERE referrer != '' GROUP BY referrer ORDER BY cnt DESC LIMIT 5")
-    top_refs = fetchall(c)
+    top_refs = [{"referrer": r["value"], "cnt": r["cnt"]} for r in retention.top_values(c, "ref", 5)]
 
     # 국가별 (Accept-Language 기반)
-    c.execute("SELECT country_hint, COUNT(*) as cnt FROM page_views WHERE country_hint != '' GROUP BY country_hint ORDER BY cnt DESC LIMIT 8")
-    top_countries = fetchall(c)
+    top_countries = [{"country_hint": r["value"], "cnt": r["cnt"]} for r in retention.top_values(c, "country", 8)]
 
     # 콘텐츠 통계
-    c.execute("SELECT COUNT(*) as cnt FROM projects")
-    proj_cnt = fetchone(c)["cnt"]
-    c.execute("SELECT COUNT(*) as cnt FROM posts WHERE is_deleted=0 AND is_spam=0")
-    post_cnt = fetchone(c)["cnt"]
-    c.execute("SELECT COUNT(*) as cnt FROM comments WHERE is_deleted=0")
-    comment_cnt = fetchone(c)["cnt"]
+    totals = counters.get(c)
+    proj_cnt, post_cnt, comment_cnt = totals["projects"], totals["posts"], totals["comments"]
+    bot_cnt = totals.get("bot_hits", 0)
 
     conn.close()
 
+    # 읽기 복제본 상태
+    replica_html = ""
+    if db.REPLICA_URLS:
+        rows = "".join(
+            f'<tr><td>{r["url"]}</td><td>{"정상" if r["healthy"] else "제외됨"}</td><td>{r["last_error"][:80]}</td></tr>'
+            for r in db.replica_status()
+        )
+        replica_html = f"""<div class="section">
+  <h2>🗄 읽기 복제본</h2>
+  <table><tr><th>복제본</th><th>상태</th><th>최근 오류</th></tr>{rows}</table>
+</div>"""
+
+    # 요청 수용 제어 (종류별 동시 처리 / 대기열 / 차단)
+    load_rows = "".join(
+        f'<tr><td>{kind}</td><td>{s["in_flight"]}/{s["limit"]}</td><td>{s["queue_depth"]} (최대 {s["peak_queue_depth"]})</td>'
+        f'<td>{s["admitted"]}</td><td>{s["queued"]} · {s["avg_wait_ms"]}ms</td><td>{s["shed"]}</td></tr>'
+        for kind, s in admission.stats().items()
+    )
+
+    # 요청 데드라인 (경로별 단계 평균 / 504 / 초과 시 가장 오래 걸린 단계)
+    deadline_rows = "".join(
+        f'<tr><td>{route}</td><td>{s["requests"]}</td><td>{s["exceeded"]}</td><td>{s["over_budget"]}</td>'
+        f'<td>{" · ".join(f"{k} {v}ms" for k, v in s["avg_ms"].items())}</td>'
+        f'<td>{", ".join(f"{k} {v}" for k, v in s["exceeded_by"].items())}</td></tr>'
+        for route, s in deadline.stats().items()
+    )
+
     html = f"""<!DOCTYPE html>
 <html lang="ko">
 <head>
@@ -801,6 +1150,7 @@ def admin_dashboard():
   <div class="card"><div class="num">{proj_cnt}</div><div class="label">등록 프로젝트</div></div>
   <div class="card"><div class="num">{post_cnt}</div><div class="label">라운지 글</div></div>
   <div class="card"><div class="num">{comment_cnt}</div><div class="label">댓글</div></div>
+  <div class="card"><div class="num">{bot_cnt}</div><div class="label">봇 요청 (통계 제외)</div></div>
 </div>
 
 <div class="section">
@@ -830,11 +1180,355 @@ def admin_dashboard():
   </table>
 </div>
 
+<div class="section">
+  <h2>🚦 요청 수용 제어</h2>
+  <table><tr><th>종류</th><th>처리 중</th><th>대기열</th><th>수용</th><th>대기 후 수용</th><th>503 차단</th></tr>{load_rows}</table>
+</div>
+
+<div class="section">
+  <h2>⏱ 요청 데드라인</h2>
+  <table><tr><th>경로</th><th>요청</th><th>504</th><th>예산 초과</th><th>단계별 평균</th><th>초과 원인 단계</th></tr>{deadline_rows}</table>
+</div>
+
+{replica_html}
 <p style="color:#64748b;font-size:.8rem">IP는 MD5 해시로 비식별화 저장됩니다.</p>
 </body></html>"""
     return html
 
 
+@app.route("/admin/jobs", methods=["GET", "POST"])
+def admin_jobs():
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+
+    if request.method == "POST":
+        if request.form.get("retry", type=int):
+            jobs.retry(request.form.get("retry", type=int))
+        elif request.form.get("enqueue") in jobs._handlers:
+            jobs.enqueue(request.form["enqueue"])
+        return redirect(url_for("admin_jobs", key=ADMIN_KEY))
+
+    counts, recent = jobs.stats()
+    esc = lambda v: str(v or "").replace("&", "&amp;").replace("<", "&lt;")
+    statuses = ("queued", "running", "done", "failed")
+
+    rows = []
+    for j in recent:
+        retry_btn = ""
+        if j["status"] == "failed":
+            retry_btn = f'<form method="post"><button name="retry" value="{j["id"]}">재시도</button></form>'
+        rows.append(
+            f'<tr><td>{j["id"]}</td><td>{esc(j["name"])}</td><td>{j["status"]}</td>'
+            f'<td>{j["attempts"]}/{j["max_attempts"]}</td><td>{esc(j["run_at"])[:19]}</td>'
+            f'<td>{esc(j["updated_at"])[:19]}</td><td><pre>{esc(j["last_error"])}</pre>{retry_btn}</td></tr>'
+        )
+
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8"/><meta name="viewport" content="width=device-width,initial-scale=1"/>
+<title>VibeCoder 작업 큐</title>
+<style>
+  body{{font-family:system-ui,sans-serif;background:#050508;color:#f1f5f9;margin:0;padding:24px}}
+  h1{{color:#a78bfa}} h2{{font-size:1rem;color:#a78bfa;margin-bottom:12px}}
+  table{{width:100%;border-collapse:collapse;background:#0d0d14;margin-bottom:32px}}
+  th{{background:#13131e;padding:8px 12px;text-align:left;font-size:.8rem;color:#64748b}}
+  td{{padding:8px 12px;border-top:1px solid rgba(255,255,255,.04);font-size:.85rem;vertical-align:top}}
+  pre{{margin:0;white-space:pre-wrap;color:#f87171;font-size:.75rem;max-width:480px}}
+  button{{background:#13131e;color:#06b6d4;border:1px solid #334155;border-radius:6px;padding:4px 10px;cursor:pointer}}
+</style>
+</head>
+<body>
+<h1>⚙️ 작업 큐</h1>
+<table><tr>{''.join(f'<th>{s}</th>' for s in statuses)}</tr>
+<tr>{''.join(f'<td>{counts.get(s, 0)}</td>' for s in statuses)}</tr></table>
+
+<h2>즉시 실행</h2>
+<form method="post" style="margin-bottom:32px">
+  {''.join(f'<button name="enqueue" value="{n}">{n}</button> ' for n in sorted(jobs._handlers))}
+</form>
+
+<h2>최근 작업</h2>
+<table><tr><th>#</th><th>작업</th><th>상태</th><th>시도</th><th>실행 예정</th><th>갱신</th><th>오류</th></tr>
+{''.join(rows)}
+</table>
+</body></html>"""
+
+
+@app.route("/admin/moderation", methods=["GET", "POST"])
+def admin_moderation():
+    """작성자(IP, /24, 세션) 또는 거의 같은 본문으로 글/댓글 일괄 삭제·스팸 처리 (moderation.py)"""
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+
+    by = request.values.get("by", "ip")
+    value = request.values.get("value", "").strip()
+    if request.method == "POST":
+        if request.form.get("undo", type=int):
+            moderation.undo(request.form.get("undo", type=int))
+        elif request.form.get("action") in moderation.ACTIONS:
+            moderation.start(by, value, request.form["action"])
+        return redirect(url_for("admin_moderation", key=ADMIN_KEY, by=by, value=value))
+
+    esc = lambda v: str(v or "").replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;")
+    labels = {"ip": "IP", "prefix": "/24 대역", "session": "세션 토큰", "text": "비슷한 본문"}
+    options = "".join(f'<option value="{k}"{" selected" if k == by else ""}>{v}</option>' for k, v in labels.items())
+
+    found_html = ""
+    if value and by in moderation.SELECTORS:
+        found = moderation.preview(by, value)
+        sections = []
+        for kind, title in (("post", "글"), ("comment", "댓글")):
+            f = found[kind]
+            rows = "".join(
+                f'<tr><td>{r["id"]}</td><td>{esc(r["created_at"])[:16]}</td><td>{esc(r["author_name"])}</td>'
+                f'<td>{esc(r["ip_address"])}</td>'
+                f'<td>{esc((r["title"] + " " if r["title"] else "") + (r["content"] or ""))[:120]}</td>'
+                f'<td>{"스팸 " if r["is_spam"] else ""}{"삭제" if r["is_deleted"] else ""}</td>'
+                f'<td><a href="?key={ADMIN_KEY}&by=text&value={kind}:{r["id"]}">비슷한 본문</a></td></tr>'
+                for r in f["rows"]
+            )
+            sections.append(
+                f'<h2>{title} {f["count"]}개 (스팸 {f["spam"]} · 삭제 {f["deleted"]})</h2>'
+                f'<table><tr><th>#</th><th>작성</th><th>작성자</th><th>IP</th><th>내용</th><th>상태</th><th></th></tr>'
+                f'{rows}</table>'
+            )
+        found_html = f"""{''.join(sections)}
+<form method="post">
+  <input type="hidden" name="by" value="{esc(by)}"/><input type="hidden" name="value" value="{esc(value)}"/>
+  <button name="action" value="spam">모두 스팸 처리</button>
+  <button name="action" value="delete">모두 삭제</button>
+</form>"""
+
+    history = []
+    for a in moderation.recent():
+        undo_btn = ""
+        if a["status"] == "done":
+            undo_btn = f'<form method="post"><button name="undo" value="{a["id"]}">되돌리기</button></form>'
+        history.append(
+            f'<tr><td>{a["id"]}</td><td>{esc(a["created_at"])[:16]}</td><td>{labels.get(a["selector"], "")}</td>'
+            f'<td>{esc(a["value"])[:60]}</td><td>{a["action"]}</td><td>{a["status"]}</td><td>{a["affected"]}</td>'
+            f'<td>{undo_btn}</td></tr>'
+        )
+
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8"/><meta name="viewport" content="width=device-width,initial-scale=1"/>
+<title>VibeCoder 일괄 모더레이션</title>
+<style>
+  body{{font-family:system-ui,sans-serif;background:#050508;color:#f1f5f9;margin:0;padding:24px}}
+  h1{{color:#a78bfa}} h2{{font-size:1rem;color:#a78bfa;margin:24px 0 12px}}
+  table{{width:100%;border-collapse:collapse;background:#0d0d14;margin-bottom:16px}}
+  th{{background:#13131e;padding:8px 12px;text-align:left;font-size:.8rem;color:#64748b}}
+  td{{padding:8px 12px;border-top:1px solid rgba(255,255,255,.04);font-size:.85rem;vertical-align:top;word-break:break-all}}
+  input,select{{background:#13131e;color:#f1f5f9;border:1px solid #334155;border-radius:6px;padding:6px 10px}}
+  input[name=value]{{width:420px}}
+  button{{background:#13131e;color:#06b6d4;border:1px solid #334155;border-radius:6px;padding:6px 12px;cursor:pointer}}
+  a{{color:#06b6d4}}
+</style>
+</head>
+<body>
+<h1>🧹 일괄 모더레이션</h1>
+<form method="get">
+  <input type="hidden" name="key" value="{esc(ADMIN_KEY)}"/>
+  <select name="by">{options}</select>
+  <input name="value" value="{esc(value)}" placeholder="1.2.3.4 / 1.2.3.0/24 / 세션 토큰 / 본문 또는 post:123"/>
+  <button>찾기</button>
+</form>
+{found_html}
+<h2>최근 처리</h2>
+<table><tr><th>#</th><th>요청</th><th>기준</th><th>값</th><th>처리</th><th>상태</th><th>대상</th><th></th></tr>{''.join(history)}</table>
+</body></html>"""
+
+
+@app.route("/admin/admission")
+def admin_admission():
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+    return jsonify(admission.stats())
+
+
+@app.route("/admin/profile")
+def admin_profile():
+    """전체 스레드 샘플링 — ?seconds=10&hz=100&format=collapsed|speedscope"""
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+    try:
+        prof = profiler.sample_all(request.args.get("seconds", 5, type=float),
+                                   request.args.get("hz", profiler.DEFAULT_HZ, type=int))
+    except profiler.Busy as e:
+        return str(e), 409
+    body, content_type = profiler.render(prof, request.args.get("format", "collapsed"))
+    return body, 200, {"Content-Type": content_type, "Cache-Control": "no-store"}
+
+
+@app.route("/admin/profile/requests")
+def admin_profile_requests():
+    """X-VC-Profile 헤더로 샘플링한 최근 요청 목록"""
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+    return jsonify(profiler.recent())
+
+
+@app.route("/admin/profile/requests/<int:i>")
+def admin_profile_request(i):
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+    prof = profiler.recent_profile(i)
+    if prof is None:
+        abort(404)
+    body, content_type = profiler.render(prof, request.args.get("format", "collapsed"))
+    return body, 200, {"Content-Type": content_type, "Cache-Control": "no-store"}
+
+
+@app.route("/admin/memory", methods=["GET", "POST"])
+def admin_memory():
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+
+    if request.method == "POST":
+        if request.form.get("tracking") == "on":
+            memtrack.enable()
+        elif request.form.get("tracking") == "off":
+            memtrack.disable()
+        return redirect(url_for("admin_memory", key=ADMIN_KEY))
+
+    rep = memtrack.report()
+    if request.args.get("format") == "json":
+        return jsonify(rep)
+
+    esc = lambda v: str(v).replace("&", "&amp;").replace("<", "&lt;")
+    site_rows = "".join(
+        f'<tr><td>{esc(site)}</td><td>{kb}</td><td>{count}</td><td><pre>{esc(chr(10).join(stack))}</pre></td></tr>'
+        for site, kb, count, stack in rep["top_sites"]
+    )
+    route_rows = "".join(
+        f'<tr><td>{esc(route)}</td><td>{r["samples"]}</td><td>{r["avg_kb"]}</td><td>{r["max_kb"]}</td>'
+        f'<td>{esc(", ".join(f"{site} {kb}KB" for site, kb in r["sites"]))}</td></tr>'
+        for route, r in rep["routes"].items()
+    )
+    object_rows = "".join(f"<tr><td>{esc(name)}</td><td>{n}</td></tr>" for name, n in rep["objects"])
+    toggle = "off" if rep["enabled"] else "on"
+
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8"/><meta name="viewport" content="width=device-width,initial-scale=1"/>
+<title>VibeCoder 메모리</title>
+<style>
+  body{{font-family:system-ui,sans-serif;background:#050508;color:#f1f5f9;margin:0;padding:24px}}
+  h1{{color:#a78bfa}} h2{{font-size:1rem;color:#a78bfa;margin-bottom:12px}}
+  table{{width:100%;border-collapse:collapse;background:#0d0d14;margin-bottom:32px}}
+  th{{background:#13131e;padding:8px 12px;text-align:left;font-size:.8rem;color:#64748b}}
+  td{{padding:8px 12px;border-top:1px solid rgba(255,255,255,.04);font-size:.85rem;vertical-align:top}}
+  pre{{margin:0;white-space:pre-wrap;color:#94a3b8;font-size:.75rem}}
+  button{{background:#13131e;color:#06b6d4;border:1px solid #334155;border-radius:6px;padding:4px 10px;cursor:pointer}}
+</style>
+</head>
+<body>
+<h1>🧠 메모리</h1>
+<table><tr><th>RSS</th><th>추적 중 (tracemalloc)</th><th>추적 최대</th><th>gc 세대별</th><th>요청 샘플링</th></tr>
+<tr><td>{rep["rss_mb"]} MB</td><td>{rep["traced_mb"]} MB</td><td>{rep["traced_peak_mb"]} MB</td>
+<td>{rep["gc_counts"]}</td><td>{"켜짐" if rep["enabled"] else "꺼짐"} · 1/{rep["sample_every"]}</td></tr></table>
+<form method="post" style="margin-bottom:32px"><button name="tracking" value="{toggle}">추적 {"끄기" if rep["enabled"] else "켜기"}</button></form>
+
+<h2>할당 상위 위치</h2>
+<table><tr><th>위치</th><th>KB</th><th>블록</th><th>스택</th></tr>{site_rows}</table>
+
+<h2>경로별 요청 중 순증가 (샘플)</h2>
+<table><tr><th>경로</th><th>샘플</th><th>평균 KB</th><th>최대 KB</th><th>증가 상위 위치</th></tr>{route_rows}</table>
+
+<h2>살아있는 객체 (타입별)</h2>
+<table><tr><th>타입</th><th>개수</th></tr>{object_rows}</table>
+</body></html>"""
+
+
+@app.route("/admin/spam-model")
+def admin_spam_model():
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+    return jsonify(spamscore.stats())
+
+
+@app.route("/admin/bots")
+def admin_bots():
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+    return jsonify(botfilter.stats())
+
+
+@app.route("/admin/warmcache")
+def admin_warmcache():
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+    return jsonify(warmcache.stats())
+
+
+@app.route("/admin/deadlines")
+def admin_deadlines():
+    if request.args.get("key") != ADMIN_KEY:
+        return "401 Unauthorized", 401
+    return jsonify(deadline.stats())
+
+
+# ──────────────────────────────────────────────────────────
+# 백그라운드 작업 (jobs.py)
+# ──────────────────────────────────────────────────────────
+@jobs.job("rescan_spam")
+def rescan_spam(payload):
+    """최근 글/댓글을 현재 스팸 규칙으로 재검사 (키워드 추가 후 소급 적용)"""
+    days = payload.get("days", 7)
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    conn = get_conn()
+    c = conn.cursor()
+    run(c, Q.POSTS_RESCAN, (cutoff,))
+    for post in fetchall(c):
+        if is_spam(post["title"], post["content"] or ""):
+            run(c, Q.POST_MARK_SPAM, (post["id"],))
+            tag_index.adjust_counts(c, tag_index.KIND_POST, post["id"], -1)
+            feeds.remove_post(c, post["slug"], post["category"])
+            counters.add(c, "posts", -1)
+            snapshot.mark(c, *snapshot.post_paths(post["slug"], post["category"]))
+    run(c, Q.COMMENTS_RESCAN, (cutoff,))
+    spam_ids = [(r["id"],) for r in fetchall(c) if is_spam("", r["content"])]
+    if spam_ids:
+        run_many(c, Q.COMMENT_MARK_SPAM, spam_ids)
+    spamscore.relabeled(conn)
+    conn.commit()
+    conn.close()
+
+
+@jobs.job("trend_post")
+def trend_post(payload):
+    import vibe_trend_updater
+    vibe_trend_updater.post_to_lounge(raise_errors=True)
+
+
+@jobs.job("trend_post_v2")
+def trend_post_v2(payload):
+    import vibe_trend_updater_v2
+    vibe_trend_updater_v2.post_to_lounge(raise_errors=True)
+
+
+jobs.schedule("rescan_spam", "30 4 * * *")
+# 트렌드 자동 게시는 cron 표현식을 지정한 경우에만 (예: "0 9 * * *")
+jobs.schedule("trend_post", os.environ.get("TREND_CRON", ""))
+jobs.schedule("trend_post_v2", os.environ.get("TREND_V2_CRON", ""))
+
+
+def start_background():
+    """작업 워커 + 지문 인덱스 로드 — 스키마가 준비된 뒤에만
+    (gunicorn: 이미지 빌드 때 init_db → import 시 기동, python app.py: init_db 뒤에 기동)"""
+    jobs.start_workers(JOB_WORKERS)
+    if JOB_WORKERS:
+        fingerprint.start_warm()  # 중복 지문 인덱스 전체 로드는 기동 시 (요청 경로는 추가분만)
+
+
+if __name__ != "__main__":
+    start_background()
+
+
 # ──────────────────────────────────────────────────────────
 # 툴 허브
 # ──────────────────────────────────────────────────────────
@@ -849,9 +1543,18 @@ def tools():
 # ──────────────────────────────────────────────────────────
 @app.route("/api/projects")
 def api_projects():
-    conn = get_conn()
+    return jsonify(_projects_api())
+
+
+@snapshot.renderer("projects_api")
+def _render_projects_api(_slug=None):
+    return json.dumps(_projects_api(), ensure_ascii=False)
+
+
+def _projects_api():
+    conn = get_conn(readonly=True)
     c = conn.cursor()
-    c.execute("SELECT id,title,slug,description,tech_stack,demo_url,author,view_count,likes,created_at FROM projects ORDER BY created_at DESC LIMIT 20")
+    run(c, Q.PROJECTS_API)
     projects = fetchall(c)
     conn.close()
     for proj in projects:
@@ -860,21 +1563,69 @@ def api_projects():
                 proj["tech_stack"] = json.loads(proj["tech_stack"])
             except Exception:
                 pass
-    return jsonify(projects)
+    return [proj._asdict() for proj in projects]
 
 
 @app.route("/api/stats")
 def api_stats():
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT COUNT(*) as cnt FROM projects")
-    pc = fetchone(c)["cnt"]
-    c.execute("SELECT COUNT(*) as cnt FROM posts WHERE is_spam=0 AND is_deleted=0")
-    lc = fetchone(c)["cnt"]
-    c.execute("SELECT SUM(view_count) as total FROM projects")
-    vc = fetchone(c)["total"] or 0
+    conn = get_conn(readonly=True)
+    totals = counters.get(conn.cursor())
     conn.close()
-    return jsonify({"projects": pc, "posts": lc, "total_views": vc})
+    return jsonify({"projects": totals["projects"], "posts": totals["posts"], "total_views": totals["project_views"]})
+
+
+# ──────────────────────────────────────────────────────────
+# sitemap / 피드 (작업 워커가 미리 만든 문서 전송)
+# ──────────────────────────────────────────────────────────
+def _static_doc(name: str, kind: str):
+    if not JOB_WORKERS:
+        feeds.maybe_rebuild()
+    doc = feeds.get(name)
+    if doc is None:
+        abort(404)
+    body, etag, updated_at = doc
+    resp = make_response(body)
+    resp.headers["Content-Type"] = feeds.CONTENT_TYPES[kind]
+    resp.headers["Cache-Control"] = "public, max-age=300"
+    resp.set_etag(etag)
+    resp.last_modified = datetime.fromisoformat(updated_at).replace(microsecond=0)
+    return resp.make_conditional(request)
+
+
+@app.route("/sitemap.xml")
+def sitemap_index():
+    return _static_doc(feeds.SITEMAP_INDEX, "sitemap")
+
+
+@app.route("/sitemap-<shard>.xml")
+def sitemap_shard(shard):
+    return _static_doc("sitemap-" + shard, "sitemap")
+
+
+@app.route("/feed.xml")
+def lounge_feed():
+    return _static_doc(feeds.FEED_LOUNGE, "feed")
+
+
+@app.route("/feed/<category>.xml")
+def lounge_category_feed(category):
+    if category not in feeds.LOUNGE_CATEGORIES:
+        abort(404)
+    return _static_doc(f"{feeds.FEED_LOUNGE}-{category}", "feed")
+
+
+@app.route("/showcase/feed.xml")
+def showcase_feed():
+    return _static_doc(feeds.FEED_SHOWCASE, "feed")
+
+
+@app.route("/robots.txt")
+def robots_txt():
+    body = f"User-agent: *\nDisallow: /admin\nSitemap: {feeds.SITE_URL}/sitemap.xml\n"
+    resp = make_response(body)
+    resp.headers["Content-Type"] = "text/plain; charset=utf-8"
+    resp.headers["Cache-Control"] = "public, max-age=86400"
+    return resp
 
 
 # ──────────────────────────────────────────────────────────
@@ -892,4 +1643,5 @@ def server_error(e):
 
 if __name__ == "__main__":
     init_db()
+    start_background()
     app.run(debug=True, port=5001)
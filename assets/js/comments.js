@@ -0,0 +1,84 @@
+// 답글 트리 — 답글 대상 지정 / 접힌 가지 불러오기 (/comment/<id>/replies)
+(function(){
+  const parentInput=document.getElementById('reply-parent');
+  const replyTo=document.getElementById('reply-to');
+  if(!parentInput) return;
+
+  function setReply(id, author){
+    parentInput.value=id||'';
+    replyTo.hidden=!id;
+    document.getElementById('reply-to-label').textContent=id?'↳ '+author+'님에게 답글':'';
+    if(id) parentInput.form.querySelector('textarea').focus();
+  }
+  document.getElementById('reply-cancel').addEventListener('click',()=>setReply('',''));
+
+  function el(tag, cls, text){
+    const e=document.createElement(tag);
+    if(cls) e.className=cls;
+    if(text!==undefined) e.textContent=text;
+    return e;
+  }
+
+  function replyItem(r){
+    const item=el('div','comment-item reply'+(r.deleted?' comment-deleted':''));
+    item.id='c'+r.id;
+    item.dataset.id=r.id;
+    item.dataset.depth=r.depth;
+    item.style.setProperty('--depth',r.depth);
+    if(r.deleted){
+      item.appendChild(el('div','comment-body','삭제된 댓글입니다.'));
+      return item;
+    }
+    const meta=el('div','comment-meta');
+    meta.appendChild(el('span','comment-author',r.author_name));
+    meta.appendChild(el('span','comment-time',r.time));
+    item.appendChild(meta);
+    const body=el('div','comment-body rich');
+    body.innerHTML=r.content_html;  // 서버에서 이스케이프/정제된 HTML (render.py)
+    item.appendChild(body);
+    const btn=el('button','comment-reply-btn','↳ 답글');
+    btn.type='button';
+    btn.dataset.reply=r.id;
+    btn.dataset.author=r.author_name;
+    item.appendChild(btn);
+    if(r.mine){
+      const form=el('form');
+      form.method='POST';
+      form.action='/comment/'+r.id+'/delete';
+      form.style.display='inline';
+      form.onsubmit=()=>confirm('댓글을 삭제할까요?');
+      const redirect=el('input');
+      redirect.type='hidden';
+      redirect.name='redirect_url';
+      redirect.value=location.pathname;
+      form.appendChild(redirect);
+      const del=el('button','comment-del-btn','삭제');
+      del.type='submit';
+      form.appendChild(del);
+      item.appendChild(form);
+    }
+    return item;
+  }
+
+  function loadReplies(btn){
+    btn.disabled=true;
+    fetch('/comment/'+btn.dataset.more+'/replies')
+      .then(r=>r.json()).then(d=>{
+        let anchor=btn.closest('.comment-item');
+        d.replies.forEach(r=>{
+          const item=replyItem(r);
+          anchor.after(item);
+          anchor=item;
+        });
+        btn.remove();
+      })
+      .catch(()=>{ btn.disabled=false; });
+  }
+
+  document.addEventListener('click',e=>{
+    const reply=e.target.closest('[data-reply]');
+    if(reply){ setReply(reply.dataset.reply, reply.dataset.author); return; }
+    const more=e.target.closest('[data-more]');
+    if(more) loadReplies(more);
+  });
+})();
@@ -0,0 +1,233 @@
+/* ── 적응형 퍼포먼스 감지 ── */
+let isLowPerf = false;
+(function detectPerf() {
+  const isMobile = /Android|iPhone|iPad|iPod/i.test(navigator.userAgent);
+  const lowMem = navigator.deviceMemory && navigator.deviceMemory < 4;
+  const lowCores = navigator.hardwareConcurrency && navigator.hardwareConcurrency <= 2;
+  if (isMobile || lowMem || lowCores) {
+    document.body.classList.add('low-perf'); isLowPerf = true; return;
+  }
+  let frames = 0, start = performance.now();
+  function probe() {
+    if (++frames >= 30) {
+      const fps = frames / ((performance.now() - start) / 1000);
+      if (fps < 30) { document.body.classList.add('low-perf'); isLowPerf = true; }
+      return;
+    }
+    requestAnimationFrame(probe);
+  }
+  requestAnimationFrame(probe);
+})();
+
+/* ── 파티클 시스템 ── */
+(function initParticles() {
+  const canvas = document.getElementById('particles');
+  if (!canvas) return;
+  const ctx = canvas.getContext('2d');
+  let W, H, pts;
+  function resize() {
+    W = canvas.width = window.innerWidth;
+    H = canvas.height = window.innerHeight;
+  }
+  function mkPt() {
+    return {
+      x: Math.random() * W, y: Math.random() * H,
+      vx: (Math.random() - .5) * .4, vy: (Math.random() - .5) * .4,
+      r: Math.random() * 1.5 + .5,
+      c: Math.random() > .5 ? '#7c3aed' : '#06b6d4'
+    };
+  }
+  function init() {
+    resize();
+    const N = isLowPerf ? 0 : 60;
+    pts = Array.from({ length: N }, mkPt);
+  }
+  function draw() {
+    if (isLowPerf) { return; }
+    ctx.clearRect(0, 0, W, H);
+    for (let i = 0; i < pts.length; i++) {
+      const p = pts[i];
+      p.x += p.vx; p.y += p.vy;
+      if (p.x < 0) p.x = W; if (p.x > W) p.x = 0;
+      if (p.y < 0) p.y = H; if (p.y > H) p.y = 0;
+      ctx.beginPath();
+      ctx.arc(p.x, p.y, p.r, 0, Math.PI * 2);
+      ctx.fillStyle = p.c; ctx.globalAlpha = .5;
+      ctx.fill();
+      for (let j = i + 1; j < pts.length; j++) {
+        const q = pts[j];
+        const dx = p.x - q.x, dy = p.y - q.y;
+        const d = Math.sqrt(dx * dx + dy * dy);
+        if (d < 120) {
+          ctx.beginPath();
+          ctx.moveTo(p.x, p.y); ctx.lineTo(q.x, q.y);
+          ctx.strokeStyle = p.c;
+          ctx.globalAlpha = (1 - d / 120) * .15;
+          ctx.lineWidth = .5; ctx.stroke();
+        }
+      }
+    }
+    ctx.globalAlpha = 1;
+    requestAnimationFrame(draw);
+  }
+  init();
+  window.addEventListener('resize', init);
+  draw();
+})();
+
+/* ── 숫자 카운트업 애니메이션 ── */
+function countUp(el, target, duration = 1200) {
+  if (!el || target === 0) return;
+  let start = 0, startTime = null;
+  function step(ts) {
+    if (!startTime) startTime = ts;
+    const p = Math.min((ts - startTime) / duration, 1);
+    const ease = 1 - Math.pow(1 - p, 3);
+    el.textContent = Math.floor(ease * target);
+    if (p < 1) requestAnimationFrame(step);
+    else el.textContent = target;
+  }
+  requestAnimationFrame(step);
+}
+window.addEventListener('load', () => {
+  const pEl = document.getElementById('stat-projects');
+  const lEl = document.getElementById('stat-posts');
+  if (pEl) countUp(pEl, parseInt(pEl.textContent) || 0);
+  if (lEl) countUp(lEl, parseInt(lEl.textContent) || 0);
+
+  /* ── 바이브코딩 D+ 카운터 ── */
+  const dEl = document.getElementById('stat-days');
+  if (dEl) {
+    const start = new Date('2026-01-01');
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    const days = Math.floor((today - start) / 86400000) + 1;
+    countUp(dEl, days);
+  }
+});
+
+/* ── i18n: 브라우저 언어 감지 → 영문 자동 전환 ── */
+(function initI18n() {
+  const lang = (navigator.language || navigator.userLanguage || 'ko').toLowerCase();
+  const isKo = lang.startsWith('ko');
+  if (isKo) return; // 한국어면 기본 HTML 그대로
+
+  const en = {
+    nav_showcase: 'Showcase',
+    nav_lounge: 'Lounge',
+    nav_submit: 'Submit Project',
+    badge: 'Where AI-built projects live',
+    hero_line1: 'Vibe Coders',
+    hero_line2: 'Changing the World',
+    hero_sub: "If you're building with Claude, ChatGPT, or Cursor — this is your home.<br/>Share projects, swap tips, and meet your people.",
+    btn_showcase: '🚀 Browse Projects',
+    btn_submit: 'Submit Mine',
+    stat_projects: 'Projects',
+    stat_posts: 'Community Posts',
+    stat_days: '⚡ Days Vibe Coding',
+    stat_possible: 'Possibilities',
+  };
+
+  document.querySelectorAll('[data-i18n]').forEach(el => {
+    const key = el.getAttribute('data-i18n');
+    if (en[key]) el.innerHTML = en[key];
+  });
+
+  // 페이지 타이틀 & description
+  document.title = 'VibeCoder — Vibe Coder Community | AI App Builder Hub';
+  const desc = document.querySelector('meta[name="description"]');
+  if (desc) desc.content = 'Community for vibe coders building apps with Claude, ChatGPT, and Cursor. Share projects, tips, and connect — no coding background needed.';
+})();
+
+/* ── 배경 블록깨기 게임 ── */
+(function(){
+  const cv = document.getElementById('vibe-game-canvas');
+  if (!cv) return;
+  const cx = cv.getContext('2d');
+  let W, H;
+  function resize(){ W = cv.width = innerWidth; H = cv.height = innerHeight; initB(); }
+  const PW=110, PH=7, BR=6;
+  const COLS_FN = ()=>Math.max(4, Math.floor(W/88));
+  const COLORS=['#7c3aed33','#06b6d433','#f59e0b33','#10b98133','#ec489933'];
+  let px=0, mx=innerWidth/2, ball={x:0,y:0,dx:2.8,dy:-3.2}, bricks=[], score=0, lives=3, started=false, parts=[];
+
+  function initB(){
+    bricks=[];
+    const cols=COLS_FN(), bw=(W-50)/cols-5;
+    for(let r=0;r<5;r++) for(let c=0;c<cols;c++)
+      bricks.push({x:25+c*(bw+5),y:75+r*26,w:bw,h:18,hp:r<2?1:2,alive:true,col:COLORS[r%5]});
+    ball.x=mx; ball.y=H-140;
+  }
+  resize(); window.addEventListener('resize',resize);
+  document.addEventListener('mousemove',e=>{mx=e.clientX; started=true;});
+  document.addEventListener('touchmove',e=>{mx=e.touches[0].clientX; started=true;},{passive:true});
+
+  function spawnP(x,y,col){
+    for(let i=0;i<6;i++){
+      const a=Math.random()*Math.PI*2, s=Math.random()*2.5+1;
+      parts.push({x,y,dx:Math.cos(a)*s,dy:Math.sin(a)*s,r:Math.random()*2.5+1,life:1,col});
+    }
+  }
+  function loop(){
+    cx.clearRect(0,0,W,H);
+    px+=(mx-PW/2-px)*0.14;
+    px=Math.max(0,Math.min(W-PW,px));
+    const py=H-46;
+
+    if(started){
+      ball.x+=ball.dx; ball.y+=ball.dy;
+      if(ball.x-BR<0){ball.dx=Math.abs(ball.dx);ball.x=BR;}
+      if(ball.x+BR>W){ball.dx=-Math.abs(ball.dx);ball.x=W-BR;}
+      if(ball.y-BR<0){ball.dy=Math.abs(ball.dy);}
+      if(ball.y+BR>H){lives--;ball.x=px+PW/2;ball.y=H-80;ball.dx=(Math.random()-.5)*5+2;ball.dy=-3.5;if(lives<=0){lives=3;score=0;initB();}}
+      if(ball.y+BR>=py&&ball.y-BR<=py+PH&&ball.x>=px&&ball.x<=px+PW){
+        ball.dy=-Math.abs(ball.dy);
+        ball.dx=((ball.x-px)/PW-.5)*8;
+      }
+      bricks.forEach(b=>{
+        if(!b.alive)return;
+        if(ball.x+BR>b.x&&ball.x-BR<b.x+b.w&&ball.y+BR>b.y&&ball.y-BR<b.y+b.h){
+          b.hp--; if(!b.hp){b.alive=false;score++;spawnP(b.x+b.w/2,b.y+b.h/2,b.col);}
+          ball.dy*=-1;
+        }
+      });
+      if(bricks.every(b=>!b.alive)){initB(); ball.dy-=.3;}
+    }
+
+    /* draw */
+    bricks.forEach(b=>{
+      if(!b.alive)return;
+      cx.fillStyle=b.col; cx.strokeStyle=b.col.replace('33','66');
+      cx.lineWidth=1; cx.beginPath(); cx.roundRect(b.x,b.y,b.w,b.h,3); cx.fill(); cx.stroke();
+    });
+    const g=cx.createLinearGradient(px,py,px+PW,py);
+    g.addColorStop(0,'#7c3aed88'); g.addColorStop(1,'#06b6d488');
+    cx.fillStyle=g; cx.beginPath(); cx.roundRect(px,py,PW,PH,4); cx.fill();
+    const bg=cx.createRadialGradient(ball.x-2,ball.y-2,1,ball.x,ball.y,BR);
+    bg.addColorStop(0,'#fff'); bg.addColorStop(1,'#7c3aed');
+    cx.fillStyle=bg; cx.beginPath(); cx.arc(ball.x,ball.y,BR,0,Math.PI*2); cx.fill();
+    parts=parts.filter(p=>p.life>0);
+    parts.forEach(p=>{p.x+=p.dx;p.y+=p.dy;p.dy+=.08;p.life-=.025;cx.save();cx.globalAlpha=p.life;cx.fillStyle=p.col.replace('33','ff');cx.beginPath();cx.arc(p.x,p.y,p.r,0,Math.PI*2);cx.fill();cx.restore();});
+    cx.fillStyle='rgba(255,255,255,0.12)'; cx.font='13px Inter';
+    cx.fillText(`⭐${score}`,14,H-12); cx.fillText(`❤️${lives}`,55,H-12);
+    requestAnimationFrame(loop);
+  }
+  setTimeout(()=>{const h=document.getElementById('vibe-game-hint');if(h){h.style.opacity='0';setTimeout(()=>h.style.display='none',500);}},3000);
+  loop();
+})();
+
+/* ── AI 뉴스 탭 필터 ── */
+(function(){
+  const allCards = Array.from(document.querySelectorAll('#ai-news-grid .ai-news-card'));
+  document.querySelectorAll('.news-ftab').forEach(btn=>{
+    btn.addEventListener('click',()=>{
+      document.querySelectorAll('.news-ftab').forEach(b=>b.classList.remove('active'));
+      btn.classList.add('active');
+      const src = btn.dataset.src;
+      allCards.forEach(card=>{
+        const cardSrc = card.querySelector('.ani-source').textContent.trim();
+        card.style.display = (src==='all' || cardSrc===src) ? '' : 'none';
+      });
+    });
+  });
+})();
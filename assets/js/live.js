@@ -0,0 +1,21 @@
+// 정적 스냅샷 페이지 — 좋아요/조회수, 본인 글·댓글 삭제 버튼을 /api/live 에서 채움
+(function(){
+  const main=document.querySelector('main[data-live]');
+  if(!main) return;
+  fetch(main.dataset.live,{credentials:'same-origin'})
+    .then(r=>r.ok?r.json():null).then(d=>{
+      if(!d) return;
+      for(const id of ['like-count','like-btn-count']){
+        const e=document.getElementById(id);
+        if(e) e.textContent=d.likes;
+      }
+      const views=document.getElementById('view-count');
+      if(views) views.textContent=d.views;
+      const del=document.querySelector('.delete-form');
+      if(del && d.can_edit) del.hidden=false;
+      for(const id of d.mine){
+        const form=document.querySelector('#c'+id+' > .comment-del-form');
+        if(form) form.style.display='inline';
+      }
+    }).catch(()=>{});
+})();
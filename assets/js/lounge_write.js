@@ -0,0 +1,6 @@
+function countChars(el, countId, max){
+  const len=el.value.length;
+  const el2=document.getElementById(countId);
+  el2.textContent=max?`${len}/${max}`:`${len}자`;
+  el2.className='char-count'+(len>10?' ok':'');
+}
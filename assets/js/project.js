@@ -0,0 +1,15 @@
+function likeProject(){
+  fetch(location.pathname + '/like',{method:'POST'})
+    .then(r=>r.json()).then(d=>{
+      document.getElementById('like-count').textContent=d.likes;
+      document.getElementById('like-btn-count').textContent=d.likes;
+      document.getElementById('like-btn').classList.add('liked');
+    });
+}
+function shareProject(){
+  navigator.clipboard.writeText(location.href).then(()=>{
+    const btn=document.querySelector('.share-btn');
+    btn.textContent='✅ 복사됨!';
+    setTimeout(()=>btn.textContent='🔗 공유',2000);
+  });
+}
@@ -0,0 +1,49 @@
+let isLowPerf = false;
+(function () {
+  if (/Android|iPhone|iPad/i.test(navigator.userAgent) ||
+    (navigator.deviceMemory && navigator.deviceMemory < 4)) {
+    document.body.classList.add('low-perf'); isLowPerf = true;
+  }
+})();
+(function () {
+  const canvas = document.getElementById('particles');
+  if (!canvas || isLowPerf) return;
+  const ctx = canvas.getContext('2d');
+  let W, H, pts;
+  function resize() { W = canvas.width = window.innerWidth; H = canvas.height = window.innerHeight; }
+  function init() {
+    resize(); pts = Array.from({ length: 40 }, () => ({
+      x: Math.random() * W, y: Math.random() * H,
+      vx: (Math.random() - .5) * .35, vy: (Math.random() - .5) * .35,
+      r: Math.random() * 1.2 + .4, c: Math.random() > .5 ? '#7c3aed' : '#06b6d4'
+    }));
+  }
+  function draw() {
+    ctx.clearRect(0, 0, W, H);
+    pts.forEach((p, i) => {
+      p.x += p.vx; p.y += p.vy;
+      if (p.x < 0) p.x = W; if (p.x > W) p.x = 0;
+      if (p.y < 0) p.y = H; if (p.y > H) p.y = 0;
+      ctx.beginPath(); ctx.arc(p.x, p.y, p.r, 0, Math.PI * 2);
+      ctx.fillStyle = p.c; ctx.globalAlpha = .5; ctx.fill();
+      for (let j = i + 1; j < pts.length; j++) {
+        const q = pts[j], dx = p.x - q.x, dy = p.y - q.y, d = Math.sqrt(dx * dx + dy * dy);
+        if (d < 100) {
+          ctx.beginPath(); ctx.moveTo(p.x, p.y); ctx.lineTo(q.x, q.y);
+          ctx.strokeStyle = p.c; ctx.globalAlpha = (1 - d / 100) * .12; ctx.lineWidth = .5; ctx.stroke();
+        }
+      }
+    });
+    ctx.globalAlpha = 1; requestAnimationFrame(draw);
+  }
+  init(); window.addEventListener('resize', init); draw();
+})();
+
+function filterCards() {
+  const q = document.getElementById('search-input').value.toLowerCase();
+  document.querySelectorAll('.project-card').forEach(card => {
+    const title = card.dataset.title || '';
+    const tags = card.dataset.tags || '';
+    card.style.display = (title.includes(q) || tags.includes(q)) ? '' : 'none';
+  });
+}
@@ -0,0 +1,21 @@
+function addTech(tech) {
+  const input = document.getElementById('tech_stack');
+  const current = input.value.trim();
+  const chips = document.querySelectorAll('.tech-chip');
+  let already = false;
+
+  // 중복 체크
+  if (current) {
+    const list = current.split(',').map(s => s.trim().toLowerCase());
+    already = list.includes(tech.toLowerCase());
+  }
+
+  if (!already) {
+    input.value = current ? (current + ', ' + tech) : tech;
+  }
+
+  // 칩 토글
+  chips.forEach(c => {
+    if (c.textContent === tech) c.classList.toggle('selected', !already);
+  });
+}
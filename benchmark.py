@@ -0,0 +1,1102 @@
+"""VibeCoder 벤치마크 모음
+사용법: python benchmark.py <항목> [옵션]
+  fingerprint  — 근사 중복 조회 비용 vs 코퍼스 크기
+  sqlite       — 기본 설정 vs SQLITE_PRODUCTION 읽기/쓰기 처리량
+  pageweight   — 페이지별 HTML/CSS/JS 전송량 (첫 방문 / 재방문)
+  rows         — 행 표현 비교 (SELECT * + dict vs 컬럼 지정 + 슬롯 행)
+  admission    — 댓글 폭주 중 조회 지연 (수용 제어 없음 vs admission.py)
+  memory       — 요청 수천 개 반복 후 메모리 증가가 상한 이내인지 확인 (누수 회귀, 실패 시 종료 코드 1)
+  enrich       — 로컬 GitHub API 대역으로 링크 메타데이터 수집 동작 확인 (실패 시 종료 코드 1)
+  counters     — 홈//api/stats 총계: COUNT(*) 전체 스캔 vs site_counters, 보정 작업 확인 (실패 시 종료 코드 1)
+  moderation   — 10만 건 일괄 삭제 중 다른 쓰기 지연, 되돌리기 후 원상 복구 확인 (실패 시 종료 코드 1)
+  warm         — 재시작 직후 첫 요청: 빈 캐시 vs warmcache 스냅샷 복원, 오래된/안 맞는 스냅샷 거부 (실패 시 종료 코드 1)
+  bots         — 봇/크롤러 섞인 요청 1천 개당 통계·조회수 쓰기 행 수 (판별 끔 vs botfilter), 판별 지연 (실패 시 종료 코드 1)
+  spam         — 학습형 스팸 점수: 판정 지연(µs), 정확도, 증분 학습 = 전체 재학습 확인 (실패 시 종료 코드 1)
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import threading
+
+
+def bench_fingerprint(sizes=(10_000, 100_000, 1_000_000), lookups=2000):
+    """코퍼스가 커져도 LSH 조회 비용이 평탄한지 확인"""
+    from fingerprint import DuplicateIndex
+
+    rnd = random.Random(42)
+    index = DuplicateIndex()
+    print(f"{'corpus':>10} | {'µs/lookup':>10} | {'hits':>5}")
+    for size in sizes:
+        while len(index) < size:
+            index.add(rnd.getrandbits(64), "post", len(index))
+        index.compact()
+        # 절반은 기존 해시에서 3비트만 바꾼 근사 중복, 절반은 무작위
+        probes = []
+        for i in range(lookups):
+            if i % 2:
+                probes.append(rnd.getrandbits(64))
+            else:
+                sig = index._sigs[rnd.randrange(len(index))]
+                for bit in rnd.sample(range(64), 3):
+                    sig ^= 1 << bit
+                probes.append(sig)
+        t0 = time.perf_counter()
+        hits = sum(1 for sig in probes if index.find(sig))
+        elapsed = time.perf_counter() - t0
+        print(f"{size:>10} | {elapsed / lookups * 1e6:>10.1f} | {hits:>5}")
+
+
+def _use_sqlite(path: str, production: bool):
+    """벤치마크용으로 db 모듈 설정 전환"""
+    import db
+    import retention
+    import warmcache
+    retention._ensured.clear()
+    warmcache.WARM_DIR = os.path.join(os.path.dirname(path), "warm")  # 다른 DB의 스냅샷을 복원하지 않게
+    db.DB_PATH = path
+    db.SQLITE_PRODUCTION = production
+    db._wal_ready = False
+    db._pools = {False: db._Pool(lambda: db._open_sqlite(False)), True: db._Pool(lambda: db._open_sqlite(True))}
+
+
+def _seed_posts(n=200):
+    import db
+    from datetime import datetime
+    db.init_db()
+    conn = db.get_conn()
+    c = conn.cursor()
+    p = db.ph()
+    c.executemany(
+        f"INSERT INTO posts (created_at, title, slug, content, category) VALUES ({p},{p},{p},{p},'free')",
+        [(datetime.now().isoformat(), f"bench {i}", f"bench-{i}", "x" * 2000) for i in range(n)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def bench_sqlite(threads=8, seconds=3.0):
+    """8스레드 혼합 부하: 조회 60% / 조회수 UPDATE 25% / 페이지뷰 INSERT 15%"""
+    import db
+    import retention
+    from datetime import datetime
+
+    def worker(stop, stats):
+        rnd = random.Random()
+        p = db.ph()
+        while not stop.is_set():
+            slug = f"bench-{rnd.randrange(200)}"
+            op = rnd.random()
+            try:
+                if op < 0.60:
+                    conn = db.get_conn(readonly=True)
+                    c = conn.cursor()
+                    c.execute(f"SELECT * FROM posts WHERE slug={p}", (slug,))
+                    db.fetchone(c)
+                    c.execute(f"SELECT * FROM comments WHERE post_id={p}", (1,))
+                    db.fetchall(c)
+                    conn.close()
+                    stats["read"] += 1
+                elif op < 0.85:
+                    conn = db.get_conn(readonly=True)
+                    db.defer_write(f"UPDATE posts SET view_count=view_count+1 WHERE slug={p}", (slug,), conn)
+                    conn.close()
+                    stats["write"] += 1
+                else:
+                    conn = db.get_conn()
+                    retention.insert_pageviews(conn.cursor(), [
+                        (datetime.now().isoformat(), "/lounge", "bench", "", "bench-agent", "ko"),
+                    ])
+                    conn.commit()
+                    conn.close()
+                    stats["write"] += 1
+            except Exception as e:
+                stats["errors"] += 1
+                stats["last_error"] = str(e)
+
+    print(f"{'mode':>11} | {'reads/s':>9} | {'writes/s':>9} | {'errors':>6}")
+    for production in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            _use_sqlite(os.path.join(tmp, "bench.db"), production)
+            _seed_posts()
+            stop = threading.Event()
+            per_thread = [{"read": 0, "write": 0, "errors": 0} for _ in range(threads)]
+            workers = [threading.Thread(target=worker, args=(stop, st)) for st in per_thread]
+            t0 = time.perf_counter()
+            for w in workers:
+                w.start()
+            time.sleep(seconds)
+            stop.set()
+            for w in workers:
+                w.join()
+            db.flush_writes()  # 큐에 남은 쓰기까지 포함해 측정
+            elapsed = time.perf_counter() - t0
+            reads = sum(st["read"] for st in per_thread)
+            writes = sum(st["write"] for st in per_thread)
+            errors = sum(st["errors"] for st in per_thread)
+            label = "production" if production else "baseline"
+            print(f"{label:>11} | {reads / elapsed:>9.0f} | {writes / elapsed:>9.0f} | {errors:>6}")
+            for st in per_thread:
+                if st.get("last_error"):
+                    print(f"  예: {st['last_error']}")
+                    break
+
+
+def bench_rows(posts=5000, repeat=500):
+    """행 표현 비교 — SELECT * + dict 행 vs 컬럼 지정 + 슬롯 행 (라운지 목록 20행, 전체 스캔)"""
+    import tracemalloc
+    import db
+    import queries as Q
+    from datetime import datetime
+
+    def measure(fn, n):
+        fn()  # 워밍업 (행 클래스 생성, 문장 캐시)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        elapsed = (time.perf_counter() - t0) / n
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return elapsed, peak
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), False)
+        db.init_db()
+        conn = db.get_conn()
+        c = conn.cursor()
+        p = db.ph()
+        rnd = random.Random(7)
+        c.executemany(
+            f"""INSERT INTO posts (created_at, title, slug, content, category, author_name,
+                password_hash, session_token, ip_address, tags) VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p},{p})""",
+            [(datetime.now().isoformat(), f"bench post {i}", f"bench-{i}",
+              "본문 " * rnd.randint(200, 1500), "free", "익명코더", "$2b$12$" + "x" * 53,
+              f"{i:032x}", f"10.0.{i % 256}.{i // 256 % 256}", "python, flask")
+             for i in range(posts)],
+        )
+        conn.commit()
+
+        def page_dict():
+            c.execute("SELECT * FROM posts WHERE is_spam=0 AND is_deleted=0 ORDER BY created_at DESC LIMIT 20 OFFSET 0")
+            return [dict(r) for r in c.fetchall()]
+
+        def page_rows():
+            return db.fetchall(db.run(c, Q.POSTS_PAGE, (20, 0)))
+
+        def scan_dict():
+            c.execute("SELECT * FROM posts")
+            return sum(len(r["title"]) for r in [dict(r) for r in c.fetchall()])
+
+        def scan_rows():
+            c.execute(f"SELECT {Q.POST_ROW} FROM posts")
+            return sum(len(r["title"]) for r in db.iterrows(c))
+
+        print(f"{'case':>28} | {'µs/call':>9} | {'peak KB':>8}")
+        for label, fn, n in [
+            ("lounge page: * + dict", page_dict, repeat),
+            ("lounge page: cols + Row", page_rows, repeat),
+            (f"scan {posts}: * + dict list", scan_dict, 5),
+            (f"scan {posts}: cols + iterrows", scan_rows, 5),
+        ]:
+            elapsed, peak = measure(fn, n)
+            print(f"{label:>28} | {elapsed * 1e6:>9.0f} | {peak / 1024:>8.1f}")
+        conn.close()
+
+
+def bench_pageweight():
+    """페이지별 전송량 — 첫 방문(HTML+로컬 CSS/JS) / 재방문(HTML만, 번들은 캐시) / 외부 요청 수"""
+    import re
+    import gzip
+    import db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), False)
+        os.environ["JOB_WORKERS"] = "0"
+        import app as vc
+        vc.init_db()
+        vc.news.fetch_feeds = lambda *a, **k: ([], True)
+        client = vc.app.test_client()
+        client.post("/submit", data={"title": "Bench project", "description": "벤치마크용 프로젝트 설명입니다",
+                                     "tech_stack": "Python, Flask"})
+        r = client.post("/lounge/write", data={"title": "Bench post", "content": "벤치마크용 게시글 본문입니다"})
+        post_path = r.headers.get("Location", "/lounge")
+        project = db.fetchone(db.get_conn().cursor().execute("SELECT slug FROM projects LIMIT 1"))
+
+        def size(body: bytes):
+            return len(body), len(gzip.compress(body, 6))
+
+        cached = {}
+        print(f"{'page':>14} | {'html':>7} | {'html.gz':>7} | {'first.gz':>8} | {'repeat.gz':>9} | {'3rd-party':>9}")
+        for path in ["/", "/showcase", f"/showcase/{project['slug']}", "/lounge", post_path,
+                     "/lounge/write", "/submit", "/trends", "/tools", "/nope-404"]:
+            html = client.get(path).data
+            raw, gz = size(html)
+            first = gz
+            refs = re.findall(rb'<script[^>]+src="([^"]+)"', html)
+            for tag in re.findall(rb"<link[^>]+>", html):
+                if re.search(rb'rel="(?:stylesheet|preload)"', tag):
+                    refs += re.findall(rb'href="([^"]+)"', tag)
+            external = sum(1 for ref in refs if ref.startswith((b"http:", b"https:", b"//")))
+            for ref in refs:
+                if ref.startswith(b"/"):
+                    if ref not in cached:
+                        cached[ref] = size(client.get(ref.decode()).data)[1]
+                    first += cached[ref]
+            label = path if len(path) <= 14 else path[:11] + "..."
+            print(f"{label:>14} | {raw:>7} | {gz:>7} | {first:>8} | {gz:>9} | {external:>9}")
+
+
+def bench_admission(threads=8, writes=120, reads=200, write_ms=150, read_ms=5):
+    """gunicorn 8스레드 흉내 — 느린 POST(bcrypt 등) 폭주 뒤에 도착한 조회의 지연(대기 포함)과 503 수"""
+    from concurrent.futures import ThreadPoolExecutor
+    import admission
+
+    def slow_app(environ, start_response):
+        time.sleep((write_ms if environ["REQUEST_METHOD"] == "POST" else read_ms) / 1000)
+        start_response("200 OK", [])
+        return [b"ok"]
+
+    def call(wsgi, method, path):
+        status = []
+        body = wsgi({"REQUEST_METHOD": method, "PATH_INFO": path}, lambda s, h: status.append(s))
+        b"".join(body)
+        if hasattr(body, "close"):
+            body.close()
+        return status[0][:3], time.perf_counter()
+
+    print(f"{'mode':>10} | {'read p50 ms':>11} | {'read p95 ms':>11} | {'reads 200':>9} | "
+          f"{'writes 200':>10} | {'writes 503':>10} | {'total s':>7}")
+    for label in ("none", "admission"):
+        if label == "none":
+            wsgi = slow_app
+        else:
+            admission._gates = admission._make_gates()
+            wsgi = admission.AdmissionMiddleware(slow_app)
+        rnd = random.Random(3)
+        # 댓글 폭주 절반이 먼저 도착, 나머지 쓰기와 조회는 섞여서 이어짐
+        rest = ["POST"] * (writes - writes // 2) + ["GET"] * reads
+        rnd.shuffle(rest)
+        methods = ["POST"] * (writes // 2) + rest
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            submitted = []
+            for method in methods:
+                submitted.append((method, time.perf_counter(), pool.submit(call, wsgi, method, "/lounge")))
+                time.sleep(0.001)
+            results = [(method, arrived) + fut.result() for method, arrived, fut in submitted]
+        total = time.perf_counter() - t0
+        read_lat = sorted(done - arrived for method, arrived, status, done in results
+                          if method == "GET" and status == "200")
+        count = lambda m, s: sum(1 for method, _, status, _ in results if method == m and status == s)
+        p50 = read_lat[len(read_lat) // 2] * 1000 if read_lat else 0
+        p95 = read_lat[int(len(read_lat) * 0.95)] * 1000 if read_lat else 0
+        print(f"{label:>10} | {p50:>11.0f} | {p95:>11.0f} | {count('GET', '200'):>9} | "
+              f"{count('POST', '200'):>10} | {count('POST', '503'):>10} | {total:>7.2f}")
+
+
+def bench_memory(warmup=500, rounds=5, per_round=1000, limit_kb=512):
+    """읽기/쓰기 요청을 반복 재생하며 라운드마다 tracemalloc 추적량 기록
+    워밍업(캐시·행 클래스·템플릿 컴파일) 이후 첫 라운드 대비 증가가 limit_kb를 넘으면 실패
+    """
+    import gc
+    import tracemalloc
+    import db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), False)
+        os.environ["JOB_WORKERS"] = "0"
+        import app as vc
+        vc.init_db()
+        vc.news.fetch_feeds = lambda *a, **k: ([], True)
+        client = vc.app.test_client()
+        client.post("/submit", data={"title": "Bench project", "description": "메모리 벤치마크용 프로젝트 설명입니다",
+                                     "tech_stack": "Python, Flask"})
+        r = client.post("/lounge/write", data={"title": "Bench post", "content": "메모리 벤치마크용 게시글 본문입니다"})
+        post_path = r.headers.get("Location", "/lounge")
+        project = db.fetchone(db.get_conn().cursor().execute("SELECT slug FROM projects LIMIT 1"))
+        project_path = f"/showcase/{project['slug']}"
+
+        requests = [
+            ("GET", "/"), ("GET", "/showcase"), ("GET", "/showcase?tech=python"), ("GET", project_path),
+            ("GET", "/lounge"), ("GET", "/lounge?page=2"), ("GET", post_path), ("GET", "/trends"),
+            ("GET", "/api/stats"), ("GET", "/api/projects"), ("GET", "/nope-404"),
+            ("POST", post_path + "/like"), ("POST", project_path + "/like"),
+        ]
+        rnd = random.Random(11)
+
+        def replay(n):
+            for _ in range(n):
+                method, path = rnd.choice(requests)
+                # 브라우저 UA + 여러 IP — 봇으로 판별되면 방문 통계 경로를 거치지 않음
+                client.open(path, method=method, headers={"User-Agent": f"Mozilla/5.0 (bench-{rnd.randrange(50)})",
+                                                          "X-Forwarded-For": f"10.0.0.{rnd.randrange(250)}"})
+            vc.flush_pageviews()
+            vc.botfilter.flush()
+            db.flush_writes()
+
+        replay(warmup)
+        gc.collect()
+        tracemalloc.start()
+        print(f"{'round':>5} | {'requests':>8} | {'traced KB':>9} | {'growth KB':>9} | {'RSS MB':>6}")
+        import memtrack
+        base = None
+        for i in range(rounds):
+            replay(per_round)
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            base = current if base is None else base
+            print(f"{i + 1:>5} | {(i + 1) * per_round:>8} | {current / 1024:>9.0f} | "
+                  f"{(current - base) / 1024:>9.0f} | {memtrack.rss_bytes() / 1048576:>6.1f}")
+        growth = (current - base) / 1024
+        top = tracemalloc.take_snapshot().statistics("lineno")[:5]
+        tracemalloc.stop()
+        if growth > limit_kb:
+            print(f"FAIL: {(rounds - 1) * per_round}개 요청 동안 {growth:.0f} KB 증가 (상한 {limit_kb} KB)")
+            for stat in top:
+                print(f"  {stat}")
+            sys.exit(1)
+        print(f"OK: {(rounds - 1) * per_round}개 요청 동안 {growth:.0f} KB 증가 (상한 {limit_kb} KB)")
+
+
+def bench_enrich(repos=30, demos=10):
+    """enrich.py를 로컬 HTTP 대역(GitHub API + 데모 사이트)에 대고 실행
+    확인: 동시 요청 상한 / 두 번째 조회는 조건부 요청(304) / rate limit 응답 후 GitHub 조회 중단 / 404·오류 처리
+    """
+    import json
+    from datetime import datetime
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    import db
+
+    state = {"inflight": {"gh": 0, "demo": 0}, "peak": {"gh": 0, "demo": 0}, "requests": 0,
+             "conditional": 0, "limited_after": None}
+    lock = threading.Lock()
+
+    class StandIn(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _handle(self, body: bool):
+            kind = "gh" if self.path.startswith("/repos/") else "demo"
+            with lock:
+                state["requests"] += kind == "gh"
+                state["inflight"][kind] += 1
+                state["peak"][kind] = max(state["peak"][kind], state["inflight"][kind])
+                count = state["requests"]
+            try:
+                time.sleep(0.03)
+                if kind == "demo":
+                    code = 500 if self.path.startswith("/down") else 200
+                    self.send_response(code)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                name = self.path.rsplit("/", 1)[-1]
+                limit = state["limited_after"]
+                if limit is not None and count > limit:
+                    self.send_response(403)
+                    self.send_header("X-RateLimit-Remaining", "0")
+                    self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if name == "missing":
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = f'"{name}-v1"'
+                if self.headers.get("If-None-Match") == etag:
+                    with lock:
+                        state["conditional"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                payload = json.dumps({"stargazers_count": len(name), "forks_count": 1,
+                                      "pushed_at": "2026-01-01T00:00:00Z", "archived": False}).encode()
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("X-RateLimit-Remaining", "4000")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(payload)
+            finally:
+                with lock:
+                    state["inflight"][kind] -= 1
+
+        def do_GET(self):
+            self._handle(True)
+
+        def do_HEAD(self):
+            self._handle(False)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    failures = []
+
+    def expect(ok: bool, msg: str):
+        print(f"  {'ok  ' if ok else 'FAIL'} {msg}")
+        if not ok:
+            failures.append(msg)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), False)
+        db.init_db()
+        import enrich
+        enrich.GITHUB_API = base
+        enrich.ALLOW_PRIVATE = True
+        conn = db.get_conn()
+        c = conn.cursor()
+        now = datetime.now().isoformat()
+        names = [f"repo{i}" for i in range(repos - 1)] + ["missing"]
+        for i, name in enumerate(names):
+            demo = f"{base}/{'down' if i % 5 == 0 else 'up'}/{i}" if i < demos else ""
+            c.execute("INSERT INTO projects (created_at, title, slug, github_url, demo_url) VALUES (?,?,?,?,?)",
+                      (now, name, f"p-{i}", f"https://github.com/bench/{name}", demo))
+            c.execute("SELECT id FROM projects WHERE slug=?", (f"p-{i}",))
+            enrich.track(c, db.fetchone(c)["id"], f"https://github.com/bench/{name}", demo)
+        conn.commit()
+
+        def run_batch():
+            t0 = time.perf_counter()
+            n = enrich.enrich_projects({"batch": repos})
+            return n, time.perf_counter() - t0
+
+        def expire_all():
+            c.execute("UPDATE project_meta SET expires_at=?", (now,))
+            conn.commit()
+
+        n, elapsed = run_batch()
+        print(f"1차 조회: {n}건 {elapsed * 1000:.0f}ms (GitHub 동시 {state['peak']['gh']}, 데모 동시 {state['peak']['demo']})")
+        expect(state["peak"]["gh"] <= enrich.GITHUB_CONCURRENCY, f"GitHub 동시 요청 ≤ {enrich.GITHUB_CONCURRENCY}")
+        expect(state["peak"]["demo"] <= enrich.DEMO_CONCURRENCY, f"데모 동시 요청 ≤ {enrich.DEMO_CONCURRENCY}")
+        c.execute("SELECT status, COUNT(*) AS cnt FROM project_meta WHERE kind='github' GROUP BY status")
+        by_status = {r["status"]: r["cnt"] for r in db.fetchall(c)}
+        expect(by_status == {"ok": repos - 1, "missing": 1}, f"GitHub 결과 ok {repos - 1} / missing 1 ({by_status})")
+        c.execute("SELECT data FROM project_meta WHERE kind='demo'")
+        ups = [json.loads(r["data"])["up"] for r in db.fetchall(c)]
+        expect(ups.count(False) == (demos + 4) // 5, f"데모 응답 없음 {(demos + 4) // 5}건 ({ups.count(False)})")
+        c.execute("SELECT project_id FROM project_meta WHERE kind='github' AND status='ok' LIMIT 1")
+        meta = enrich.for_project(c, db.fetchone(c)["project_id"])
+        expect(meta.get("github", {}).get("stars", 0) > 0, "화면용 캐시 값 (for_project)")
+
+        expire_all()
+        n, elapsed = run_batch()
+        print(f"2차 조회: {n}건 {elapsed * 1000:.0f}ms, 304 {state['conditional']}건")
+        expect(state["conditional"] == repos - 1, f"ETag 조건부 요청 → 304 {repos - 1}건")
+
+        expire_all()
+        state["limited_after"] = state["requests"] + 5
+        before = state["requests"]
+        run_batch()
+        sent = state["requests"] - before
+        print(f"3차 조회 (5건 뒤 rate limit): GitHub 요청 {sent}건, 중단 {enrich.stats()['github_paused_for']}초")
+        expect(sent <= 5 + enrich.GITHUB_CONCURRENCY, "rate limit 응답 뒤 GitHub 요청 중단")
+        c.execute("SELECT COUNT(*) AS cnt FROM project_meta WHERE kind='github' AND expires_at<=?",
+                  (datetime.now().isoformat(),))
+        expect(db.fetchone(c)["cnt"] >= repos - 5 - enrich.GITHUB_CONCURRENCY, "못 받은 행은 만료 상태 유지 (재개 후 조회)")
+        before = state["requests"]
+        run_batch()
+        expect(state["requests"] == before, "중단 중 다음 배치는 GitHub 요청 없음")
+        conn.close()
+    server.shutdown()
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+def bench_counters(posts=200_000, reads=300, threads=4, adds=500):
+    """글 수가 많을 때 총계 조회 비용 비교 + 동시 증감 합계 / 보정 작업이 실제 값과 맞추는지"""
+    from datetime import datetime
+    import db
+    import counters
+
+    failures = []
+
+    def expect(ok: bool, msg: str):
+        print(f"  {'ok  ' if ok else 'FAIL'} {msg}")
+        if not ok:
+            failures.append(msg)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), False)
+        db.init_db()
+        conn = db.get_conn()
+        c = conn.cursor()
+        now = datetime.now().isoformat()
+        # 카운터를 거치지 않고 넣은 행 → 보정 작업이 채워야 함
+        c.executemany("INSERT INTO posts (created_at, title, slug, content, is_spam, view_count) VALUES (?,?,?,?,?,?)",
+                      [(now, f"t{i}", f"s{i}", "본문", int(i % 10 == 0), 0) for i in range(posts)])
+        c.executemany("INSERT INTO projects (created_at, title, slug, view_count) VALUES (?,?,?,?)",
+                      [(now, f"p{i}", f"p{i}", i) for i in range(1000)])
+        conn.commit()
+        drift = counters.reconcile_counters()
+        expect(drift.get("posts") == posts - posts // 10 and drift.get("project_views") == sum(range(1000)),
+               f"보정 작업이 직접 넣은 행을 반영 ({drift})")
+
+        def timed(fn):
+            t0 = time.perf_counter()
+            for _ in range(reads):
+                fn()
+            return (time.perf_counter() - t0) / reads * 1000
+
+        def scan():
+            c.execute("SELECT COUNT(*) AS cnt FROM posts WHERE is_spam=0 AND is_deleted=0")
+            c.fetchall()
+            c.execute("SELECT COUNT(*) AS cnt FROM projects")
+            c.fetchall()
+            c.execute("SELECT SUM(view_count) AS total FROM projects")
+            c.fetchall()
+
+        scan_ms, counter_ms = timed(scan), timed(lambda: counters.get(c))
+        print(f"총계 조회 ({posts}개 글): COUNT/SUM {scan_ms:.2f}ms → site_counters {counter_ms:.3f}ms")
+        expect(counter_ms < scan_ms, "카운터 조회가 전체 스캔보다 빠름")
+
+        def worker(seed):
+            rnd = random.Random(seed)
+            wconn = db.get_conn()
+            wc = wconn.cursor()
+            total = 0
+            for _ in range(adds):
+                delta = rnd.choice((1, 1, 1, -1))
+                counters.add(wc, "comments", delta)
+                wconn.commit()
+                total += delta
+            wconn.close()
+            return total
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(threads) as pool:
+            expected = sum(pool.map(worker, range(threads)))
+        c.execute("SELECT COUNT(*) AS cnt FROM site_counters WHERE name='comments'")
+        shards = db.fetchone(c)["cnt"]
+        expect(counters.get(c)["comments"] == expected, f"동시 증감 합계 {expected} (샤드 행 {shards}개)")
+        drift = counters.reconcile_counters()
+        expect(drift == {"comments": -expected} and counters.get(c)["comments"] == 0,
+               "댓글이 실제로 없으므로 보정 후 0")
+        expect(counters.reconcile_counters() == {}, "보정 직후 차이 없음")
+        conn.close()
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+def bench_moderation(spam_comments=100_000, spam_posts=2000, writes=400):
+    """/24 대역 하나가 올린 댓글 10만 건 + 글을 일괄 삭제하는 동안 일반 쓰기 지연 측정,
+    되돌리기 후 댓글 트리 답글 수 / 태그 카운트 / 플래그가 처음과 같은지 확인
+    """
+    from datetime import datetime
+    import db
+    import tags
+    import moderation
+    from comment_tree import segment
+
+    failures = []
+
+    def expect(ok: bool, msg: str):
+        print(f"  {'ok  ' if ok else 'FAIL'} {msg}")
+        if not ok:
+            failures.append(msg)
+
+    def tree_state(c):
+        c.execute("SELECT id, is_deleted, is_spam, reply_count FROM comments ORDER BY id")
+        comments = [tuple(r) for r in db.fetchall(c)]
+        c.execute("SELECT id, is_deleted, is_spam FROM posts ORDER BY id")
+        posts = [tuple(r) for r in db.fetchall(c)]
+        c.execute("SELECT norm, use_count FROM tags ORDER BY norm")
+        return comments, posts, [tuple(r) for r in db.fetchall(c)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), True)
+        db.init_db()
+        moderation.PAUSE = 0.02
+        conn = db.get_conn()
+        c = conn.cursor()
+        now = datetime.now().isoformat()
+        rnd = random.Random(5)
+
+        # 일반 글 20개 + 스팸 글 (태그 카운트 포함)
+        post_rows = [(i, now, f"정상 글 {i}", f"ok-{i}", "내용", f"10.0.{i}.1", f"10.0.{i}") for i in range(1, 21)]
+        post_rows += [(i, now, f"광고 {i}", f"ad-{i}", "광고 내용", f"203.0.113.{i % 250 + 1}", "203.0.113")
+                      for i in range(21, 21 + spam_posts)]
+        c.executemany("INSERT INTO posts (id, created_at, title, slug, content, ip_address, ip_prefix) "
+                      "VALUES (?,?,?,?,?,?,?)", post_rows)
+        for pid, *_ in post_rows:
+            tags.link_tags(c, tags.KIND_POST, pid, ["python" if pid <= 20 else "광고"])
+
+        # 댓글: 일반 댓글 2000개 (최상위), 스팸은 최상위/일반 댓글의 답글/스팸 댓글의 답글이 섞임
+        comments, paths, replies = [], {}, {}
+        for cid in range(1, 2001):
+            paths[cid] = segment(cid)
+            comments.append((cid, now, rnd.randint(1, 20), "좋은 글", f"10.1.{cid % 200}.9", f"10.1.{cid % 200}",
+                             None, paths[cid], 0))
+        for cid in range(2001, 2001 + spam_comments):
+            parent = rnd.choice((None, rnd.randint(1, 2000), rnd.randint(2001, cid - 1) if cid > 2001 else None))
+            if parent and paths[parent].count(".") >= 3:
+                parent = None
+            paths[cid] = paths[parent] + "." + segment(cid) if parent else segment(cid)
+            if parent:
+                replies[parent] = replies.get(parent, 0) + 1
+            comments.append((cid, now, rnd.randint(1, 20), "광고 댓글", f"203.0.113.{cid % 250 + 1}", "203.0.113",
+                             parent, paths[cid], paths[cid].count(".")))
+        c.executemany("INSERT INTO comments (id, created_at, post_id, content, ip_address, ip_prefix, parent_id, path, depth) "
+                      "VALUES (?,?,?,?,?,?,?,?,?)", comments)
+        c.executemany("UPDATE comments SET reply_count=? WHERE id=?", [(n, cid) for cid, n in replies.items()])
+        conn.commit()
+        before = tree_state(c)
+
+        c.execute("EXPLAIN QUERY PLAN SELECT id FROM comments WHERE ip_prefix=? AND id>? AND is_deleted=0 "
+                  "ORDER BY id LIMIT 500", ("203.0.113", 0))
+        plan = " ".join(r["detail"] for r in db.fetchall(c))
+        expect("idx_comments_prefix" in plan, f"/24 조회가 전용 인덱스 사용 ({plan})")
+        found = moderation.preview("prefix", "203.0.113.77")
+        expect(found["comment"]["count"] == spam_comments and found["post"]["count"] == spam_posts,
+               f"미리보기 /24: 글 {found['post']['count']} · 댓글 {found['comment']['count']}")
+
+        # 일괄 삭제를 돌리는 동안 다른 스레드가 일반 댓글을 계속 씀
+        latencies = []
+        done = threading.Event()
+
+        def writer():
+            wconn = db.get_conn()
+            wc = wconn.cursor()
+            for i in range(writes):
+                if done.is_set():
+                    break
+                t0 = time.perf_counter()
+                wc.execute("INSERT INTO comments (created_at, post_id, content, ip_address) VALUES (?,?,?,?)",
+                           (now, 1, f"동시 쓰기 {i}", "198.51.100.1"))
+                wconn.commit()
+                latencies.append(time.perf_counter() - t0)
+                time.sleep(0.005)
+            wconn.close()
+
+        action_id = moderation.start("prefix", "203.0.113.0/24", "delete")
+        w = threading.Thread(target=writer)
+        w.start()
+        t0 = time.perf_counter()
+        moderation.moderate({"action_id": action_id})
+        elapsed = time.perf_counter() - t0
+        done.set()
+        w.join()
+        latencies.sort()
+        p50, worst = latencies[len(latencies) // 2] * 1000, latencies[-1] * 1000
+        print(f"일괄 삭제 {spam_comments + spam_posts}건 {elapsed:.1f}s — 동시 쓰기 {len(latencies)}건 "
+              f"p50 {p50:.1f}ms, 최대 {worst:.0f}ms")
+        expect(worst < 1000, "일괄 처리 중 다른 쓰기 최대 대기 < 1s")
+
+        c.execute("SELECT COUNT(*) AS cnt FROM comments WHERE ip_prefix='203.0.113' AND is_deleted=0")
+        left = db.fetchone(c)["cnt"]
+        c.execute("SELECT use_count FROM tags WHERE norm='광고'")
+        tag_left = db.fetchone(c)["use_count"]
+        expect(left == 0 and tag_left == 0, f"대상 전부 삭제, 태그 카운트 0 (남은 댓글 {left}, 태그 {tag_left})")
+        c.execute("SELECT COUNT(*) AS cnt FROM comments WHERE id<=2000 AND reply_count>0")
+        expect(db.fetchone(c)["cnt"] == 0, "정상 댓글의 답글 수에서 삭제된 답글이 빠짐")
+
+        c.execute("DELETE FROM comments WHERE ip_address='198.51.100.1'")
+        conn.commit()
+        expect(moderation.undo(action_id), "되돌리기 적재")
+        t0 = time.perf_counter()
+        moderation.moderate_undo({"action_id": action_id})
+        print(f"되돌리기 {time.perf_counter() - t0:.1f}s")
+        expect(tree_state(c) == before, "되돌린 뒤 플래그/답글 수/태그 카운트가 처음과 동일")
+
+        # 거의 같은 본문 — 지문 기반
+        import fingerprint
+        spam_text = "지금 가입하면 코인 리딩방 무료 초대, 하루 수익 30% 보장합니다. 문의는 텔레그램으로 주세요"
+        for i, variant in enumerate((spam_text, spam_text + "!!", f"  {spam_text} https://t.example/join")):
+            cid = 2001 + spam_comments + 10 + i
+            c.execute("INSERT INTO comments (id, created_at, post_id, content, ip_address) VALUES (?,?,?,?,?)",
+                      (cid, now, 1, variant, f"192.0.2.{i}"))
+            fingerprint.record(c, "comment", cid, fingerprint.simhash(variant))
+        conn.commit()
+        similar = moderation.preview("text", f"comment:{2001 + spam_comments + 10}")
+        expect(similar["comment"]["count"] == 3, f"비슷한 본문 3건 ({similar['comment']['count']})")
+
+        # 댓글 spam — 삭제 경로로 화면에서 숨김, 되돌리면 라벨까지 원래대로 (자동 판정돼 있던 댓글은 스팸 그대로)
+        auto_id = 2001 + spam_comments + 12
+        c.execute("UPDATE comments SET is_spam=1, spam_auto=1 WHERE id=?", (auto_id,))
+        conn.commit()
+        spam_id = moderation.start("text", f"comment:{2001 + spam_comments + 10}", "spam")
+        moderation.moderate({"action_id": spam_id})
+        c.execute("SELECT COUNT(*) AS cnt FROM comments WHERE content LIKE '%코인 리딩방%' "
+                  "AND is_spam=1 AND is_deleted=1")
+        expect(db.fetchone(c)["cnt"] == 3, "스팸 처리한 댓글은 is_spam + 삭제 경로로 숨김")
+        moderation.undo(spam_id)
+        moderation.moderate_undo({"action_id": spam_id})
+        c.execute("SELECT id, is_spam, spam_auto FROM comments WHERE content LIKE '%코인 리딩방%' AND is_deleted=0")
+        labels = {r["id"]: (r["is_spam"], r["spam_auto"]) for r in db.fetchall(c)}
+        expect(len(labels) == 3, "스팸 되돌리기 후 다시 보임")
+        expect(labels.get(auto_id) == (1, 1) and sum(v[0] for v in labels.values()) == 1,
+               f"되돌리기는 처리 전 라벨로 ({labels})")
+        conn.close()
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+def bench_spam(ham=1500, spam=400, scores=2000):
+    """합성 글로 spamscore 학습 → 판정 지연/정확도, 라벨 뒤집기 후 증분 학습 카운트가 전체 재학습과 같은지"""
+    from datetime import datetime
+    import db
+    import spamscore
+    if spamscore.np is None:
+        print("NumPy가 없어 건너뜀")
+        return
+    np = spamscore.np
+
+    rnd = random.Random(7)
+    dev = ("파이썬 리액트 배포 에러 질문 커서 클로드 프롬프트 API 서버 데이터베이스 로그인 버그 해결 "
+           "후기 공유 vercel supabase nextjs 컴포넌트 상태관리 테스트 리팩터링 타입스크립트 도커").split()
+    promo = ("무료 상담 카톡 문의 대출 수익 보장 당일 입금 코인 리딩방 바로가기 casino bonus 할인 "
+             "이벤트 가입 즉시 지급 텔레그램").split()
+
+    def make(words, n, link):
+        text = " ".join(rnd.choice(words if rnd.random() < 0.85 else dev + promo) for _ in range(n))
+        return text + (f" https://promo{rnd.randint(1, 9)}.example.com/r?{rnd.randint(1, 999)}" if link else "")
+
+    failures = []
+
+    def expect(ok: bool, msg: str):
+        print(f"  {'ok  ' if ok else 'FAIL'} {msg}")
+        if not ok:
+            failures.append(msg)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), False)
+        db.init_db()
+        spamscore.MODEL_DIR = os.path.join(tmp, "model")
+        conn = db.get_conn()
+        c = conn.cursor()
+        now = datetime.now().isoformat()
+        labels = [0] * ham + [1] * spam
+        rnd.shuffle(labels)
+        rows, holdout = [], []
+        for i, label in enumerate(labels):
+            title = make(promo if label else dev, 6, False)
+            content = make(promo if label else dev, rnd.randint(20, 120), label and rnd.random() < 0.7)
+            if i % 5 == 0:
+                holdout.append((title, content, label))  # 학습에 넣지 않는 평가용
+                continue
+            rows.append((now, title, f"s-{i}", content, label))
+        c.executemany("INSERT INTO posts (created_at, title, slug, content, is_spam) VALUES (?,?,?,?,?)", rows)
+        conn.commit()
+
+        t0 = time.perf_counter()
+        applied = spamscore.train_spam()
+        print(f"학습: {applied}건 {(time.perf_counter() - t0) * 1000:.0f}ms, 모델 v{spamscore.stats()['version']}")
+        expect(applied == len(rows), f"전체 {len(rows)}건 반영")
+
+        correct = sum(spamscore.predict(t, body) == bool(label) for t, body, label in holdout)
+        print(f"평가용 {len(holdout)}건 정확도 {correct / len(holdout):.1%} (임계값 {spamscore.THRESHOLD})")
+        expect(correct / len(holdout) >= 0.9, "정확도 ≥ 90%")
+
+        texts = [spamscore._text(t, body) for t, body, _ in holdout]
+        long_text = make(dev, 2000, True)
+        timings = []
+        for i in range(scores):
+            text = long_text if i % 10 == 0 else texts[i % len(texts)]
+            t0 = time.perf_counter()
+            spamscore.score(text)
+            timings.append((time.perf_counter() - t0) * 1e6)
+        timings.sort()
+        p50, p99 = timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+        print(f"판정: p50 {p50:.0f}µs, p99 {p99:.0f}µs (10%는 최대 길이 본문)")
+        expect(p99 < 1000, "p99 < 1ms")
+
+        # 관리자가 라벨을 뒤집음 → 증분 학습 카운트 == 처음부터 학습한 카운트
+        c.execute("UPDATE posts SET is_spam=1-is_spam WHERE id % 17 = 0")
+        spamscore.relabeled(conn)
+        conn.commit()
+        applied = spamscore.train_spam()
+        c.execute("SELECT COUNT(*) AS cnt FROM posts WHERE id % 17 = 0")
+        flipped = db.fetchone(c)["cnt"]
+        expect(applied == flipped, f"뒤집힌 {flipped}건만 다시 반영 ({applied})")
+        incremental = spamscore._latest(c)
+        c.execute("DELETE FROM spam_labels")
+        c.execute("DELETE FROM spam_model")
+        conn.commit()
+        spamscore.train_spam()
+        full = spamscore._latest(c)
+        same = (np.array_equal(np.frombuffer(bytes(incremental["counts"]), dtype="<f4"),
+                               np.frombuffer(bytes(full["counts"]), dtype="<f4"))
+                and (incremental["docs_ham"], incremental["docs_spam"]) == (full["docs_ham"], full["docs_spam"]))
+        expect(same, "증분 학습 카운트 = 전체 재학습 카운트")
+
+        # 모델/중복 판정으로 붙은 라벨(spam_auto=1)은 학습하지 않음
+        c.execute("INSERT INTO posts (created_at, title, slug, content, is_spam, spam_auto) VALUES (?,?,?,?,1,1)",
+                  (now, "자동 판정", "s-auto", make(dev, 60, False)))
+        conn.commit()
+        expect(spamscore.train_spam() == 0, "자동 판정 라벨은 학습에서 제외")
+
+        # 재시작: DB 조회 없이 로컬 파일(mmap)에서 바로
+        spamscore._model = None
+        spamscore._state.update(checked=0.0, local_loaded=False)
+        model = spamscore._current()
+        expect(model is not None and model["version"] == full["version"], "재시작 시 로컬 모델 파일 mmap 로드")
+        expect(len(os.listdir(spamscore.MODEL_DIR)) == 1, "이전 버전 파일 정리")
+        conn.close()
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+def bench_warm(fingerprints=200_000, news_items=200):
+    """재시작 흉내(메모리 캐시 초기화) 뒤 첫 중복 검사 / 첫 뉴스 조회 지연 — 빈 캐시 vs 스냅샷 복원"""
+    from datetime import datetime, timedelta
+    import db
+    import news
+    import fingerprint
+    import warmcache
+
+    failures = []
+
+    def expect(ok: bool, msg: str):
+        print(f"  {'ok  ' if ok else 'FAIL'} {msg}")
+        if not ok:
+            failures.append(msg)
+
+    def restart():
+        """프로세스 재시작 — 메모리 캐시와 복원 기록만 비움"""
+        fingerprint._index.__init__()
+        fingerprint._ready.clear()
+        fingerprint._done.clear()
+        fingerprint._warm_started = False
+        news.invalidate()
+        warmcache._restored.clear()
+        warmcache._file.update(mm=None, index=None, key=None)
+
+    def first_request(text):
+        t0 = time.perf_counter()
+        fingerprint.warm()  # 기동 시 로드 (app.py: fingerprint.start_warm)
+        conn = db.get_conn(readonly=True)
+        dup = fingerprint.find_duplicate(conn.cursor(), text)[1]
+        conn.close()
+        t1 = time.perf_counter()
+        items = news.latest()
+        t2 = time.perf_counter()
+        return dup, items, (t1 - t0) * 1000, (t2 - t1) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), False)
+        warmcache.WARM_DIR = os.path.join(tmp, "warm")
+        db.init_db()
+        conn = db.get_conn()
+        c = conn.cursor()
+        rnd = random.Random(7)
+        now = datetime.now()
+        text = "재시작 직후에도 같은 글을 다시 올리면 중복으로 잡혀야 합니다 — 워밍 캐시 확인용 본문"
+        c.executemany(
+            "INSERT INTO content_fingerprints (kind, target_id, simhash, created_at) VALUES (?,?,?,?)",
+            [("post", i, fingerprint._to_db(rnd.getrandbits(64)), now.isoformat()) for i in range(fingerprints)],
+        )
+        c.execute("INSERT INTO posts (id, created_at, title, slug, content) VALUES (?,?,?,?,?)",
+                  (fingerprints, now.isoformat(), "원본", "warm-original", text))
+        fingerprint.record(c, "post", fingerprints, fingerprint.simhash(text))
+        c.executemany(
+            "INSERT INTO news_items (url_hash, url, title, source, published_at, fetched_at) VALUES (?,?,?,?,?,?)",
+            [(f"h{i}", f"https://example.com/{i}", f"기사 {i}", "AI News",
+              (now - timedelta(minutes=i)).isoformat(), now.isoformat()) for i in range(news_items)],
+        )
+        conn.commit()
+
+        restart()
+        cold_dup, cold_items, cold_fp, cold_news = first_request(text)
+        saved = warmcache.save()
+        print(f"스냅샷: {', '.join(f'{k} {v / 1024:.0f}KB' for k, v in saved.items())}")
+
+        restart()
+        warm_dup, warm_items, warm_fp, warm_news = first_request(text)
+        print(f"기동 지문 로드 + 첫 중복 검사 ({fingerprints}개 지문): 빈 캐시 {cold_fp:.0f}ms → 복원 {warm_fp:.0f}ms")
+        print(f"첫 뉴스 조회: 빈 캐시 {cold_news:.2f}ms → 복원 {warm_news:.2f}ms")
+        expect(warmcache.stats()["restored"] == {"fingerprints": "file", "news": "file"}, "두 캐시 모두 파일에서 복원")
+        expect(warm_dup == cold_dup and warm_dup is not None, f"복원 인덱스의 중복 판정이 같음 ({warm_dup})")
+        expect([i["id"] for i in warm_items] == [i["id"] for i in cold_items], "복원한 뉴스 첫 페이지가 같음")
+        expect(warm_fp < cold_fp, "복원이 DB 전체 로드보다 빠름")
+
+        # 같은 프로세스가 다시 저장하면 새 파일을 읽음 (비어 있는 캐시는 방금 쓴 구간을 유지)
+        saved_at = warmcache._file_section("news")[1]
+        time.sleep(0.01)
+        warmcache.save(to_db=False)
+        news.invalidate()
+        warmcache.save(to_db=False)
+        kept = warmcache._file_section("news")
+        expect(kept is not None and kept[1] > saved_at, "재저장 후 새 파일 기준으로 구간 유지")
+
+        # 스냅샷 이후 추가된 지문은 증분으로 따라잡음
+        restart()
+        c.execute("DELETE FROM content_fingerprints WHERE target_id=?", (fingerprints,))
+        c.execute("INSERT INTO posts (id, created_at, title, slug, content) VALUES (?,?,?,?,?)",
+                  (fingerprints + 1, now.isoformat(), "재게시", "warm-repost", text))
+        fingerprint.record(c, "post", fingerprints + 1, fingerprint.simhash(text))
+        conn.commit()
+        dup = first_request(text)[0]
+        expect(warmcache.stats()["restored"].get("fingerprints") is None and dup == ("post", fingerprints + 1, 0),
+               "행 수가 안 맞는 스냅샷은 버리고 DB에서 다시 로드")
+
+        # 새 인스턴스 (디스크 비어 있음) → DB 사본, 오래된 스냅샷은 거부
+        warmcache.save()
+        restart()
+        os.remove(os.path.join(warmcache.WARM_DIR, "warm.snap"))
+        first_request(text)
+        restored = warmcache.stats()["restored"]
+        expect(restored == {"fingerprints": None, "news": "db"},
+               f"새 디스크: 작은 캐시만 DB에서 복원 ({restored})")
+        restart()
+        old = (datetime.now() - timedelta(seconds=news.WARM_MAX_AGE + 60)).isoformat()
+        c.execute("UPDATE cache_snapshots SET saved_at=?", (old,))
+        conn.commit()
+        first_request(text)
+        expect(warmcache.stats()["restored"].get("news") is None, "max_age가 지난 스냅샷은 복원 안 함")
+
+        # 작성자가 지운 원본은 중복으로 치지 않음 (지우고 다시 올리기)
+        c.execute("UPDATE posts SET is_deleted=1 WHERE id=?", (fingerprints + 1,))
+        conn.commit()
+        expect(fingerprint.find_duplicate(c, text)[1] is None, "삭제된 원본은 중복 판정에서 제외")
+        conn.close()
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+def bench_bots(requests=1000, humans=200):
+    """사람 50% / UA 크롤러 25% / HTTP 클라이언트 10% / 브라우저 UA로 긁는 IP 하나 15% 섞인 요청 재생
+    pv_log 행 + 조회수 UPDATE + project_views 증감 + 봇 카운터 쓰기를 판별 끔/켬으로 비교
+    """
+    import db
+    import botfilter
+
+    failures = []
+
+    def expect(ok: bool, msg: str):
+        print(f"  {'ok  ' if ok else 'FAIL'} {msg}")
+        if not ok:
+            failures.append(msg)
+
+    browser = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+               "Chrome/128.0.0.0 Safari/537.36")
+    crawlers = [
+        "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+        "Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)",
+        "Mozilla/5.0 (compatible; Yeti/1.1; +http://naver.me/spd)",
+        "Mozilla/5.0 AppleWebKit/537.36 (KHTML, like Gecko; compatible; GPTBot/1.2; +https://openai.com/gptbot)",
+        "Mozilla/5.0 (compatible; AhrefsBot/7.0; +http://ahrefs.com/robot/)",
+        "facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)",
+    ]
+    clients = ["curl/8.5.0", "python-requests/2.31.0", "Go-http-client/1.1", ""]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_sqlite(os.path.join(tmp, "bench.db"), False)
+        os.environ["JOB_WORKERS"] = "0"
+        import app as vc
+        vc.init_db()
+        vc.news.fetch_feeds = lambda *a, **k: ([], True)
+        client = vc.app.test_client()
+        client.post("/submit", data={"title": "Bench project", "description": "봇 판별 벤치마크용 프로젝트 설명입니다",
+                                     "tech_stack": "Python, Flask"})
+        r = client.post("/lounge/write", data={"title": "Bench post", "content": "봇 판별 벤치마크용 게시글 본문입니다"})
+        post_path = r.headers.get("Location", "/lounge")
+        conn = db.get_conn()
+        c = conn.cursor()
+        c.execute("SELECT slug FROM projects LIMIT 1")
+        project_path = f"/showcase/{db.fetchone(c)['slug']}"
+        pages = ["/", "/showcase", "/trends", "/lounge", project_path, post_path]
+
+        def written():
+            vc.flush_pageviews()
+            botfilter.flush()
+            db.flush_writes()
+            c.execute("SELECT COUNT(*) AS cnt FROM page_views")
+            pv = db.fetchone(c)["cnt"]
+            c.execute("SELECT (SELECT SUM(view_count) FROM projects) + (SELECT SUM(view_count) FROM posts) AS cnt")
+            views = db.fetchone(c)["cnt"]
+            c.execute("SELECT COUNT(*) AS cnt FROM site_counters WHERE name='bot_hits'")
+            return {"pv": pv, "views": views, "bot_rows": db.fetchone(c)["cnt"]}
+
+        def replay(seed):
+            rnd = random.Random(seed)
+            human_pages = 0
+            for _ in range(requests):
+                roll = rnd.random()
+                if roll < 0.5:
+                    ua, ip = browser, f"10.0.{rnd.randrange(humans) // 250}.{rnd.randrange(humans) % 250}"
+                elif roll < 0.75:
+                    ua, ip = rnd.choice(crawlers), f"66.249.66.{rnd.randrange(50)}"
+                elif roll < 0.85:
+                    ua, ip = rnd.choice(clients), f"203.0.113.{rnd.randrange(50)}"
+                else:
+                    ua, ip = browser, "198.51.100.7"
+                path = rnd.choice(pages)
+                client.get(path, headers={"User-Agent": ua, "X-Forwarded-For": ip})
+                human_pages += roll < 0.5
+            return human_pages
+
+        results = {}
+        for enabled in (False, True):
+            botfilter.ENABLED = enabled
+            botfilter._rates.clear()
+            before = written()
+            human = replay(3)
+            after = written()
+            delta = {k: after[k] - before[k] for k in after}
+            # project_views 증감은 조회수 UPDATE와 1:1 (프로젝트 조회분), 봇 카운터는 flush당 1행
+            c.execute("SELECT SUM(value) AS v FROM site_counters WHERE name='project_views'")
+            results[enabled] = (delta, human, db.fetchone(c)["v"] or 0)
+        off, _human, pv_before = results[False]
+        on, human, pv_after = results[True]
+        rows_off = off["pv"] + off["views"] + pv_before
+        rows_on = on["pv"] + on["views"] + (pv_after - pv_before) + 1
+        print(f"요청 {requests}개당 쓰기 행: 판별 끔 {rows_off} (pv {off['pv']}, 조회수 {off['views']}) "
+              f"→ botfilter {rows_on} (pv {on['pv']}, 조회수 {on['views']}, 봇 카운터 1)")
+        print(f"감소 {(1 - rows_on / rows_off) * 100:.0f}% · 봇 판별 {botfilter.stats()['by_kind']}")
+        c.execute("SELECT SUM(value) AS v FROM site_counters WHERE name='bot_hits'")
+        counters_total = db.fetchone(c)["v"]
+        counted = sum(botfilter.stats()["by_kind"].values())
+        expect(counters_total == counted, f"봇 카운터 합계 = 판별 수 ({counted})")
+        expect(botfilter.stats()["by_kind"].get("rate", 0) > 0, "브라우저 UA로 긁는 IP를 빈도로 잡음")
+        expect(rows_on < rows_off * 0.6, "쓰기 행 40% 이상 감소")
+        # 긁는 IP는 RATE_LIMIT번째 요청까지는 사람과 구분되지 않음
+        recorded = on["pv"] + on["views"]
+        expect(recorded == human + botfilter.RATE_LIMIT,
+               f"사람 요청은 전부 기록 ({recorded} = 사람 {human} + 빈도 판정 전 {botfilter.RATE_LIMIT})")
+
+        uas = [browser] * 5 + crawlers + clients
+        t0 = time.perf_counter()
+        for i in range(20000):
+            botfilter.classify(uas[i % len(uas)], f"h{i % 500}")
+        print(f"판별 {(time.perf_counter() - t0) / 20000 * 1e6:.1f}µs/요청")
+        botfilter.flush()
+        conn.close()
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+BENCHES = {
+    "fingerprint": bench_fingerprint,
+    "sqlite": bench_sqlite,
+    "pageweight": bench_pageweight,
+    "rows": bench_rows,
+    "admission": bench_admission,
+    "memory": bench_memory,
+    "enrich": bench_enrich,
+    "counters": bench_counters,
+    "moderation": bench_moderation,
+    "spam": bench_spam,
+    "warm": bench_warm,
+    "bots": bench_bots,
+}
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else ""
+    if name not in BENCHES:
+        print(__doc__)
+        sys.exit(1)
+    BENCHES[name]()
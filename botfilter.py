@@ -0,0 +1,147 @@
+"""VibeCoder 봇/크롤러 판별 — 요청마다 한 번 (app.py 미들웨어), 결과는 request.environ["vc.bot"]
+  crawler : 알려진 검색/SNS/AI 크롤러, bot·spider·crawl 등이 들어간 UA
+  client  : HTTP 라이브러리/CLI (curl, python-requests, Go-http-client ...), 빈 UA
+  headless: 헤드리스 브라우저/측정 도구 (HeadlessChrome, Lighthouse ...)
+  rate    : UA는 평범하지만 ip_hash 하나가 RATE_WINDOW 안에 RATE_LIMIT번 넘게 요청 → FLAG_TTL 동안
+봇 요청은 방문 통계(pv_log) 기록과 조회수/project_views 증가를 건너뛴다 (BOT_PV_SAMPLE 비율만 통계에 남김).
+대신 종류별 개수를 메모리에 모아 FLUSH_INTERVAL마다 site_counters "bot_hits" 한 행에 더한다.
+UA 판별은 정규식 한 번 + LRU 캐시, 빈도 판별은 ip_hash별 고정 창 카운터 (프로세스 단위, 상한 MAX_TRACKED).
+같은 NAT 뒤의 사람들이 rate로 잡혀도 통계만 빠질 뿐 요청은 그대로 처리된다.
+"""
+
+import os
+import re
+import time
+import random
+import threading
+from functools import lru_cache
+
+import jobs
+import counters
+from db import get_conn
+
+ENABLED = os.environ.get("BOT_FILTER", "1") != "0"
+BOT_PV_SAMPLE = float(os.environ.get("BOT_PV_SAMPLE", "0"))  # 봇 페이지뷰 중 통계에 남길 비율
+RATE_WINDOW = 60       # 초
+RATE_LIMIT = 90        # 창 하나에서 이보다 많이 요청하면 rate (페이지 + /api/live 등 포함)
+FLAG_TTL = 600         # rate로 잡힌 ip_hash 유지 (초)
+MAX_TRACKED = 50_000   # 빈도 카운터 상한 (넘으면 오래된 창 정리)
+FLUSH_INTERVAL = 30
+
+_CRAWLER = re.compile(
+    r"googlebot|bingbot|slurp|duckduckbot|baiduspider|yandex(?:bot|images)|yeti|daumoa|naverbot|sogou|exabot"
+    r"|applebot|petalbot|bytespider|seznambot|qwantify|facebookexternalhit|facebookcatalog|twitterbot"
+    r"|linkedinbot|slackbot|discordbot|telegrambot|kakaotalk-scrap|redditbot|embedly"
+    r"|gptbot|chatgpt-user|oai-searchbot|claudebot|claude-web|anthropic-ai|ccbot|perplexitybot|amazonbot"
+    r"|google-extended|ahrefsbot|semrushbot|mj12bot|dotbot|rogerbot|blexbot|dataforseobot|serpstatbot"
+    r"|ia_archiver|archive\.org_bot|uptimerobot|pingdom|statuscake|site24x7|feedfetcher|feedly|inoreader"
+    r"|\bbot\b|bot[/;)+]|crawl|spider|scrap|preview|monitor|validator|checker",
+    re.I,
+)
+_CLIENT = re.compile(
+    r"^(?:curl|wget|httpie|python-requests|python-urllib|python-httpx|aiohttp|go-http-client|java/"
+    r"|okhttp|apache-httpclient|libwww-perl|lwp::|php/|guzzlehttp|ruby|axios|node-fetch|undici|got \("
+    r"|postmanruntime|insomnia|scrapy|mechanize|winhttp|powershell)",
+    re.I,
+)
+_HEADLESS = re.compile(r"headlesschrome|phantomjs|lighthouse|pagespeed|puppeteer|playwright|selenium", re.I)
+
+_rates = {}     # ip_hash → [창 시작, 요청 수, rate 판정 만료 시각]
+_counts = {}    # 종류 → 아직 DB에 더하지 않은 봇 요청 수
+_totals = {}    # 종류 → 프로세스 기동 후 누적 (관리자 화면용)
+_lock = threading.Lock()
+_last_flush = 0.0
+
+
+@lru_cache(maxsize=4096)
+def classify_ua(ua: str):
+    """UA 문자열만으로 판별 → "crawler" / "client" / "headless" / None(브라우저로 보임)"""
+    if not ua or len(ua) < 10:
+        return "client"
+    if _CLIENT.match(ua):
+        return "client"
+    if _HEADLESS.search(ua):
+        return "headless"
+    if _CRAWLER.search(ua):
+        return "crawler"
+    if "mozilla/" not in ua.lower() and "opera/" not in ua.lower():
+        return "client"
+    return None
+
+
+def _rate_exceeded(ip_hash: str, now: float) -> bool:
+    with _lock:
+        entry = _rates.get(ip_hash)
+        if entry is None:
+            if len(_rates) >= MAX_TRACKED:
+                for key in [k for k, v in _rates.items() if now - v[0] >= RATE_WINDOW and v[2] <= now]:
+                    del _rates[key]
+                if len(_rates) >= MAX_TRACKED:
+                    _rates.clear()
+            _rates[ip_hash] = [now, 1, 0.0]
+            return False
+        if now - entry[0] >= RATE_WINDOW:
+            entry[0], entry[1] = now, 0
+        entry[1] += 1
+        if entry[1] > RATE_LIMIT:
+            entry[2] = now + FLAG_TTL
+        return entry[2] > now
+
+
+def classify(ua: str, ip_hash: str, now: float = None):
+    """요청 판별 (요청마다 한 번) → 봇 종류 또는 None. 봇이면 개수도 센다"""
+    if not ENABLED:
+        return None
+    kind = classify_ua(ua or "")
+    # UA로 이미 봇이면 빈도 카운터에 넣지 않음 (카운터 크기 절약)
+    if kind is None and ip_hash and _rate_exceeded(ip_hash, time.time() if now is None else now):
+        kind = "rate"
+    if kind is not None:
+        with _lock:
+            _counts[kind] = _counts.get(kind, 0) + 1
+            _totals[kind] = _totals.get(kind, 0) + 1
+    return kind
+
+
+def sampled() -> bool:
+    """봇 페이지뷰 중 통계에 남길 표본인지"""
+    return BOT_PV_SAMPLE > 0 and random.random() < BOT_PV_SAMPLE
+
+
+@jobs.tick(FLUSH_INTERVAL)
+def flush():
+    """모은 봇 요청 수를 site_counters에 한 번에"""
+    with _lock:
+        total = sum(_counts.values())
+        _counts.clear()
+    if not total:
+        return
+    conn = get_conn()
+    try:
+        counters.add(conn.cursor(), "bot_hits", total)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def maybe_flush():
+    """작업 워커 없이 (JOB_WORKERS=0) — 요청 경로에서 FLUSH_INTERVAL마다 한 번만"""
+    global _last_flush
+    now = time.time()
+    if now - _last_flush >= FLUSH_INTERVAL:
+        _last_flush = now
+        flush()
+
+
+def shutdown():
+    """정상 종료 시 (atexit) — 근사 카운터라 DB에 못 쓰면 버린다"""
+    try:
+        flush()
+    except Exception:
+        pass
+
+
+def stats() -> dict:
+    with _lock:
+        return {"enabled": ENABLED, "by_kind": dict(_totals), "pending": sum(_counts.values()),
+                "tracked_ips": len(_rates), "ua_cache": classify_ua.cache_info()._asdict()}
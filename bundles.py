@@ -0,0 +1,179 @@
+"""VibeCoder 프론트엔드 에셋 빌드 — assets/ 원본 → static/dist/
+  css/*.css, js/*.js : 주석/공백 압축 후 <이름>.<콘텐츠 해시>.<확장자> 로 저장
+  Inter 폰트         : 가변 폰트를 라틴 범위로 서브셋한 woff2 (fontTools 필요, 없으면 시스템 폰트)
+  manifest.json      : 원본 경로 → 배포 파일, 템플릿은 stylesheet() / script() / asset_url()로 참조
+파일명이 내용 해시라 배포 파일은 immutable 캐시 (app.py after_request)
+실행: python bundles.py [--fetch-fonts]   (Dockerfile 빌드 단계, 개발 중에는 앱 기동 시 자동)
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import urllib.request
+
+from markupsafe import Markup
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(ROOT, "assets")
+DIST_DIR = os.path.join(ROOT, "static", "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+URL_PREFIX = "/static/dist/"
+
+FONT_DIR = os.path.join(SRC_DIR, "fonts")
+FONT_SOURCES = ["InterVariable.woff2", "InterVariable.ttf"]
+FONT_URL = os.environ.get("INTER_FONT_URL", "https://rsms.me/inter/font-files/InterVariable.woff2")
+FONT_KEY = "fonts/inter-latin.woff2"
+# 구글 폰트 latin 서브셋과 같은 범위 — 한글은 시스템 폰트로 표시
+LATIN_RANGE = ("U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,U+0308,"
+               "U+0329,U+2000-206F,U+2074,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD")
+FONT_FACE = ("@font-face{{font-family:'Inter';font-style:normal;font-weight:100 900;font-display:swap;"
+             "src:url({url}) format('woff2');unicode-range:{range}}}")
+
+
+# ──────────────────────────────────────────────────────────
+# 압축
+# ──────────────────────────────────────────────────────────
+_CSS_STRING = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    parts = _CSS_STRING.split(css)
+    for i in range(0, len(parts), 2):  # 짝수 인덱스 = 문자열 리터럴 밖
+        part = re.sub(r"\s+", " ", parts[i])
+        part = re.sub(r"\s*([{};,>])\s*", r"\1", part)
+        parts[i] = re.sub(r":\s+", ":", part).replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def minify_js(js: str) -> str:
+    """줄 단위 보수적 압축 — 들여쓰기, 빈 줄, 줄 전체 주석만 제거 (문법 변환 없음)"""
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if not line or line.startswith("//") or (line.startswith("/*") and line.endswith("*/")):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# ──────────────────────────────────────────────────────────
+# 빌드
+# ──────────────────────────────────────────────────────────
+def _emit(name: str, data: bytes) -> str:
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    out = f"{stem}.{digest}{ext}"
+    with open(os.path.join(DIST_DIR, out), "wb") as f:
+        f.write(data)
+    return out
+
+
+def _unicodes(ranges: str):
+    codes = []
+    for part in ranges.split(","):
+        lo, _, hi = part[2:].partition("-")
+        codes.extend(range(int(lo, 16), int(hi or lo, 16) + 1))
+    return codes
+
+
+def _build_font(fetch: bool):
+    src = next((os.path.join(FONT_DIR, n) for n in FONT_SOURCES if os.path.exists(os.path.join(FONT_DIR, n))), None)
+    if src is None and fetch:
+        os.makedirs(FONT_DIR, exist_ok=True)
+        src = os.path.join(FONT_DIR, FONT_SOURCES[0])
+        urllib.request.urlretrieve(FONT_URL, src)
+    if src is None:
+        return None
+    try:
+        from fontTools import subset
+    except ImportError:
+        print("fontTools 없음 — 폰트 서브셋 생략 (pip install fonttools brotli)")
+        return None
+    opts = subset.Options()
+    opts.flavor = "woff2"
+    opts.layout_features = ["kern", "liga", "calt", "tnum"]
+    font = subset.load_font(src, opts)
+    subsetter = subset.Subsetter(opts)
+    subsetter.populate(unicodes=_unicodes(LATIN_RANGE))
+    subsetter.subset(font)
+    tmp = os.path.join(DIST_DIR, "inter-latin.woff2")
+    subset.save_font(font, tmp, opts)
+    with open(tmp, "rb") as f:
+        data = f.read()
+    os.remove(tmp)
+    return _emit("inter-latin.woff2", data)
+
+
+def build(fetch_fonts: bool = False) -> dict:
+    """assets/ 전체를 다시 빌드하고 manifest 반환"""
+    global _manifest
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.makedirs(DIST_DIR)
+    manifest = {}
+    font = _build_font(fetch_fonts)
+    if font:
+        manifest[FONT_KEY] = font
+    for kind, minify in (("css", minify_css), ("js", minify_js)):
+        for name in sorted(os.listdir(os.path.join(SRC_DIR, kind))):
+            with open(os.path.join(SRC_DIR, kind, name), encoding="utf-8") as f:
+                source = f.read()
+            if kind == "css" and name == "base.css" and font:
+                source = FONT_FACE.format(url=URL_PREFIX + font, range=LATIN_RANGE) + "\n" + source
+            manifest[f"{kind}/{name}"] = _emit(name, minify(source).encode("utf-8"))
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    _manifest = manifest
+    return manifest
+
+
+def _stale() -> bool:
+    if not os.path.exists(MANIFEST_PATH):
+        return True
+    built = os.path.getmtime(MANIFEST_PATH)
+    for kind in ("css", "js"):
+        folder = os.path.join(SRC_DIR, kind)
+        if any(os.path.getmtime(os.path.join(folder, n)) > built for n in os.listdir(folder)):
+            return True
+    return False
+
+
+# ──────────────────────────────────────────────────────────
+# 템플릿 헬퍼
+# ──────────────────────────────────────────────────────────
+_manifest = None
+
+
+def manifest() -> dict:
+    """빌드 결과 로드 (없거나 원본이 더 새로우면 폰트 제외하고 즉석 빌드)"""
+    global _manifest
+    if _manifest is None:
+        if _stale():
+            build()
+        else:
+            with open(MANIFEST_PATH, encoding="utf-8") as f:
+                _manifest = json.load(f)
+    return _manifest
+
+
+def asset_url(name: str):
+    path = manifest().get(name)
+    return URL_PREFIX + path if path else None
+
+
+def stylesheet(name: str):
+    return Markup(f'<link rel="stylesheet" href="{asset_url(name)}"/>')
+
+
+def script(name: str):
+    return Markup(f'<script src="{asset_url(name)}" defer></script>')
+
+
+if __name__ == "__main__":
+    result = build(fetch_fonts="--fetch-fonts" in sys.argv[1:])
+    for key, path in sorted(result.items()):
+        size = os.path.getsize(os.path.join(DIST_DIR, path))
+        print(f"{key:<28} → {path:<36} {size:>7,} B")
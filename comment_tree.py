@@ -0,0 +1,118 @@
+"""VibeCoder 댓글 트리 — materialized path로 답글 저장
+path: 조상부터 자기 자신까지 id를 10자리로 맞춰 "."로 이은 문자열
+  0000000012                       최상위 댓글 #12
+  0000000012.0000000031            #12의 답글 #31
+path 순 정렬 = 화면 순서 (부모 다음에 자식들이 작성 순), 서브트리 = path 범위 조회 한 번
+  path > '0000000012' AND path < '0000000012/'   ('/'는 '.' 다음 문자)
+depth는 0부터, MAX_DEPTH 단계를 넘는 답글은 가장 깊은 허용 단계에 붙인다.
+reply_count: 화면에 보이는 직계 답글 수 (삭제 안 된 답글 + 답글이 남은 삭제 댓글)
+  삭제된 댓글은 답글이 남아 있으면 "삭제된 댓글입니다" 자리로 남고, 없으면 사라진다.
+"""
+
+from db import run, fetchone, fetchall
+
+import queries as Q
+
+SEG = 10            # path 한 단계 자릿수
+MAX_DEPTH = 5       # 최대 단계 수 (depth 0..4)
+INITIAL_DEPTH = 3   # 상세 화면 첫 로드 단계 수, 더 깊은 가지는 접어두고 JSON으로 불러옴
+BATCH = 500
+
+
+def segment(comment_id: int) -> str:
+    return f"{comment_id:0{SEG}d}"
+
+
+def subtree_bounds(path: str):
+    """path의 자손 범위 (양 끝 제외)"""
+    return path, path + "/"
+
+
+def resolve_parent(c, parent_id, post_id, project_id):
+    """답글 대상 확인 → 실제로 붙일 부모 행 (같은 글의 댓글이 아니면 None = 최상위)
+    깊이 제한에 걸리면 가장 깊은 허용 단계의 조상으로 올린다.
+    """
+    if not parent_id:
+        return None
+    run(c, Q.COMMENT_PARENT, (parent_id,))
+    parent = fetchone(c)
+    if parent is None or parent["post_id"] != post_id or parent["project_id"] != project_id:
+        return None
+    if parent["is_deleted"] and not parent["reply_count"]:
+        return None  # 화면에서 사라진 댓글
+    if parent["depth"] >= MAX_DEPTH - 1:
+        ancestor = int(parent["path"].split(".")[MAX_DEPTH - 2])
+        run(c, Q.COMMENT_PARENT, (ancestor,))
+        parent = fetchone(c)
+    return parent
+
+
+def attach(c, comment_id: int, parent, hidden: bool = False):
+    """INSERT 직후 path/depth 설정 + 부모 답글 수 증가 (같은 트랜잭션)
+    hidden: 스팸/중복으로 처음부터 숨기는 댓글 — 삭제 처리된 답글 없는 댓글과 같은 상태로 (부모 답글 수 그대로)
+    """
+    if hidden:
+        run(c, Q.COMMENT_SOFT_DELETE, (comment_id,))
+    if parent is None:
+        run(c, Q.COMMENT_SET_PATH, (None, segment(comment_id), 0, comment_id))
+        return
+    run(c, Q.COMMENT_SET_PATH, (parent["id"], parent["path"] + "." + segment(comment_id),
+                                parent["depth"] + 1, comment_id))
+    if not hidden:
+        run(c, Q.COMMENT_REPLY_COUNT, (1, parent["id"]))
+
+
+def soft_delete(c, comment):
+    """삭제 처리 — 답글이 남아 있으면 자리만 남기고, 사라지는 댓글은 부모 답글 수를 줄인다.
+    부모도 이미 삭제된 상태에서 마지막 답글이 사라지면 부모도 사라지므로 위로 전파.
+    """
+    if comment["is_deleted"]:
+        return
+    run(c, Q.COMMENT_SOFT_DELETE, (comment["id"],))
+    if comment["reply_count"]:
+        return
+    ancestors = [int(s) for s in (comment["path"] or "").split(".")[:-1]]
+    for ancestor_id in reversed(ancestors):
+        run(c, Q.COMMENT_REPLY_COUNT, (-1, ancestor_id))
+        run(c, Q.COMMENT_TREE_STATE, (ancestor_id,))
+        row = fetchone(c)
+        if not row or not row["is_deleted"] or row["reply_count"] > 0:
+            break
+
+
+def restore(c, comment):
+    """soft_delete의 역 — 다시 보이게 하고, 화면에서 사라졌던 댓글이면 조상 답글 수를 되돌린다.
+    comment는 현재 상태로 읽은 행 (여러 개를 되돌릴 때는 삭제의 역순으로)
+    """
+    if not comment["is_deleted"]:
+        return
+    run(c, Q.COMMENT_RESTORE, (comment["id"],))
+    if comment["reply_count"]:
+        return  # 자리로 남아 있던 댓글 — 조상 카운트는 그대로
+    ancestors = [int(s) for s in (comment["path"] or "").split(".")[:-1]]
+    for ancestor_id in reversed(ancestors):
+        run(c, Q.COMMENT_REPLY_COUNT, (1, ancestor_id))
+        run(c, Q.COMMENT_TREE_STATE, (ancestor_id,))
+        row = fetchone(c)
+        if not row or not row["is_deleted"] or row["reply_count"] > 1:
+            break  # 조상이 원래 보이던 상태 — 더 위는 변화 없음
+
+
+def replies(c, parent_path: str) -> list:
+    """접힌 가지 불러오기 — 서브트리 전체를 화면 순서로 (인덱스 범위 조회 한 번)"""
+    lo, hi = subtree_bounds(parent_path)
+    run(c, Q.COMMENT_SUBTREE, (lo, hi))
+    return fetchall(c)
+
+
+def backfill(conn):
+    """path가 없는 기존 댓글 → 최상위 댓글로 (재실행 안전)"""
+    c = conn.cursor()
+    while True:
+        run(c, Q.COMMENTS_WITHOUT_PATH, (BATCH,))
+        ids = [r["id"] for r in fetchall(c)]
+        if not ids:
+            break
+        for comment_id in ids:
+            run(c, Q.COMMENT_SET_PATH, (None, segment(comment_id), 0, comment_id))
+        conn.commit()
@@ -0,0 +1,95 @@
+"""VibeCoder 사이트 전체 카운터 — 홈 / 쇼케이스 / 라운지 / /api/stats / 관리자 화면의 총계
+site_counters (name, shard, value): 이름마다 SHARDS개 행, 쓰기는 무작위 샤드에 증감 (같은 행 경합 분산)
+읽기는 이름별 SUM — 행 수가 이름 × SHARDS로 고정이라 테이블 크기와 무관 (COUNT(*) 전체 스캔 없음)
+증감은 글/댓글/프로젝트를 쓰는 트랜잭션 안에서 (작성, 삭제, 스팸 전환, 일괄 모더레이션, 조회수).
+reconcile_counters 작업 (COUNTER_CRON, 기본 30분마다)이 실제 값과의 차이를 한 문장으로 보정한다
+— 실제 값과 현재 합계를 같은 스냅샷에서 읽어 차이만 더하므로 동시에 들어온 증감은 그대로 남는다.
+SOURCES에 없는 이름(bot_hits — botfilter.py)은 기준 값이 없으므로 보정하지 않는다.
+"""
+
+import os
+import random
+
+import jobs
+from db import get_conn, ph, fetchall, fetchone, defer_write
+
+SHARDS = 8
+
+# 이름 → 실제 값 (보정 기준)
+SOURCES = {
+    "projects": "SELECT COUNT(*) FROM projects",
+    "posts": "SELECT COUNT(*) FROM posts WHERE is_spam=0 AND is_deleted=0",
+    "comments": "SELECT COUNT(*) FROM comments WHERE is_deleted=0",
+    "project_views": "SELECT COALESCE(SUM(view_count), 0) FROM projects",
+}
+
+
+def _upsert_sql() -> str:
+    p = ph()
+    return (f"INSERT INTO site_counters (name, shard, value) VALUES ({p},{p},{p}) "
+            f"ON CONFLICT (name, shard) DO UPDATE SET value=site_counters.value+excluded.value")
+
+
+def add(c, name: str, delta: int = 1):
+    """증감 (호출자 트랜잭션, 커밋은 호출자)"""
+    if delta:
+        c.execute(_upsert_sql(), (name, random.randrange(SHARDS), delta))
+
+
+def defer_add(name: str, delta: int = 1, conn=None):
+    """응답과 무관한 증감 (조회수) — defer_write와 같은 경로로"""
+    defer_write(_upsert_sql(), (name, random.randrange(SHARDS), delta), conn)
+
+
+def get(c) -> dict:
+    """{이름: 값} — 없는 이름은 0"""
+    c.execute("SELECT name, SUM(value) AS value FROM site_counters GROUP BY name")
+    values = {name: 0 for name in SOURCES}
+    values.update({r["name"]: r["value"] or 0 for r in fetchall(c)})
+    return values
+
+
+def reconcile(conn) -> dict:
+    """실제 값과 다른 카운터 보정 (커밋 포함) → {이름: 보정한 차이}"""
+    c = conn.cursor()
+    p = ph()
+    drift = {}
+    for name, source in SOURCES.items():
+        c.execute(f"SELECT ({source}) AS actual, "
+                  f"(SELECT COALESCE(SUM(value), 0) FROM site_counters WHERE name={p}) AS counted", (name,))
+        row = fetchone(c)
+        if row["actual"] == row["counted"]:
+            continue
+        # 확인과 보정 사이의 증감까지 반영되도록 차이는 보정 문장 안에서 다시 계산 (WHERE는 SQLite upsert 문법)
+        c.execute(
+            f"INSERT INTO site_counters (name, shard, value) "
+            f"SELECT {p}, 0, ({source}) - (SELECT COALESCE(SUM(value), 0) FROM site_counters WHERE name={p}) "
+            f"WHERE 1=1 ON CONFLICT (name, shard) DO UPDATE SET value=site_counters.value+excluded.value",
+            (name, name),
+        )
+        drift[name] = row["actual"] - row["counted"]
+    conn.commit()
+    return drift
+
+
+def setup(conn):
+    """처음 (카운터 행이 없을 때) 실제 값으로 채움"""
+    c = conn.cursor()
+    c.execute("SELECT COUNT(*) AS cnt FROM site_counters")
+    if not fetchone(c)["cnt"]:
+        reconcile(conn)
+
+
+@jobs.job("reconcile_counters")
+def reconcile_counters(payload=None):
+    conn = get_conn()
+    try:
+        drift = reconcile(conn)
+    finally:
+        conn.close()
+    if drift:
+        print(f"카운터 보정: {drift}")
+    return drift
+
+
+jobs.schedule("reconcile_counters", os.environ.get("COUNTER_CRON", "*/30 * * * *"))
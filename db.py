@@ -3,47 +3,708 @@
 """
 
 import os
+import time
+import queue
+import atexit
 import sqlite3
+import keyword
+import itertools
+import threading
+import traceback
+import contextvars
+
+import deadline
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
 USE_POSTGRES = bool(DATABASE_URL)
+DB_PATH = os.path.join(os.path.dirname(__file__), "vibecoder.db")
 
+# ── SQLite 운영 모드 (SQLITE_PRODUCTION=1) ──
+# WAL + mmap/cache pragma + busy_timeout/재시도 + 커넥션 풀(읽기 전용 풀 분리)
+# + 조회수/통계 같은 비동기 쓰기를 모아 한 트랜잭션으로 처리하는 단일 writer 스레드
+SQLITE_PRODUCTION = not USE_POSTGRES and os.environ.get("SQLITE_PRODUCTION") == "1"
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",        # 64MB
+    "PRAGMA mmap_size=268435456",      # 256MB
+    "PRAGMA temp_store=MEMORY",
+)
+BUSY_TIMEOUT = 5.0      # sqlite busy handler 대기 (초)
+LOCK_RETRIES = 5        # busy_timeout 초과 후 추가 재시도 횟수
+POOL_SIZE = 16          # 풀별 유휴 커넥션 상한
+POOL_CHECK_AFTER = 30   # 이보다 오래 쉰 PostgreSQL 커넥션은 꺼낼 때 SELECT 1로 확인 (초)
+WRITE_BATCH_MAX = 500   # writer 스레드 한 트랜잭션당 최대 문장 수
+STATEMENT_CACHE = 256   # sqlite3 커넥션별 컴파일된 문장 캐시 크기
 
-def get_conn():
-    if USE_POSTGRES:
-        import psycopg2
-        import psycopg2.extras
-        conn = psycopg2.connect(DATABASE_URL)
+
+def _is_locked(e) -> bool:
+    msg = str(e).lower()
+    return "locked" in msg or "busy" in msg
+
+
+def _retry(fn):
+    for attempt in range(LOCK_RETRIES + 1):
+        try:
+            return fn()
+        except sqlite3.OperationalError as e:
+            if not _is_locked(e) or attempt == LOCK_RETRIES:
+                raise
+            time.sleep(0.05 * 2 ** attempt)
+
+
+def _deadline_error(e):
+    """요청 데드라인이 지나 중단된 문장이면 DeadlineExceeded, 아니면 None
+    (run()을 거치지 않은 helper 모듈의 c.execute도 500 대신 504가 되도록 커서에서 변환)"""
+    if deadline.expired():
+        return deadline.DeadlineExceeded("db")
+    return None
+
+
+class _DeadlineCursor(sqlite3.Cursor):
+    """progress handler가 중단시킨 문장(OperationalError: interrupted) → DeadlineExceeded"""
+
+    def execute(self, sql, params=()):
+        try:
+            return super().execute(sql, params)
+        except sqlite3.OperationalError as e:
+            err = _deadline_error(e)
+            if err is None:
+                raise
+            raise err from e
+
+    def executemany(self, sql, seq):
+        try:
+            return super().executemany(sql, seq)
+        except sqlite3.OperationalError as e:
+            err = _deadline_error(e)
+            if err is None:
+                raise
+            raise err from e
+
+
+class _Connection(sqlite3.Connection):
+    def cursor(self, factory=_DeadlineCursor):
+        return super().cursor(factory)
+
+
+class _RetryCursor(_DeadlineCursor):
+    """database is locked 시 지수 백오프 재시도"""
+
+    def execute(self, sql, params=()):
+        return _retry(lambda: super(_RetryCursor, self).execute(sql, params))
+
+    def executemany(self, sql, seq):
+        seq = list(seq)
+        return _retry(lambda: super(_RetryCursor, self).executemany(sql, seq))
+
+
+class _PooledConnection(_Connection):
+    """close() 시 실제로 닫지 않고 풀에 반납 (열린 트랜잭션은 롤백)"""
+
+    pool = None
+
+    def cursor(self, factory=_RetryCursor):
+        return super().cursor(factory)
+
+    def commit(self):
+        return _retry(super().commit)
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+        if self.pool is None or not self.pool.release(self):
+            super().close()
+
+
+class _Pool:
+    """유휴 커넥션 스택 — opener()로 새 커넥션 생성, 커넥션의 close()가 release() 호출
+    PostgreSQL은 꺼낼 때 상태 확인 (끊긴 커넥션, POOL_CHECK_AFTER 넘게 쉬었으면 SELECT 1) → 실패하면 버리고 다음"""
+
+    def __init__(self, opener):
+        self._opener = opener
+        self._idle = []   # (커넥션, 반납 시각)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, since = self._idle.pop()
+            if self._alive(conn, since):
+                return conn
+            self._discard(conn)
+        conn = self._opener()
+        conn.pool = self
+        return conn
+
+    def release(self, conn) -> bool:
+        with self._lock:
+            if len(self._idle) < POOL_SIZE:
+                self._idle.append((conn, time.time()))
+                return True
+        return False
+
+    def clear(self):
+        """유휴 커넥션 전부 닫기 (복제본 장애 등)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _since in idle:
+            self._discard(conn)
+
+    @staticmethod
+    def _alive(conn, since: float) -> bool:
+        if not USE_POSTGRES:
+            return True
+        import psycopg2.extensions
+        if conn.closed or conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if time.time() - since < POOL_CHECK_AFTER:
+            return True
+        try:
+            c = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+            c.execute("SELECT 1")
+            c.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(conn):
+        conn.pool = None  # 풀로 돌아오지 않게
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def _open_sqlite(readonly: bool):
+    conn = sqlite3.connect(
+        DB_PATH, timeout=BUSY_TIMEOUT, check_same_thread=False,
+        factory=_PooledConnection,
+        # 첫 쓰기 전에 RESERVED 잠금 확보 → WAL 스냅샷 업그레이드 실패 방지
+        isolation_level="IMMEDIATE",
+        cached_statements=STATEMENT_CACHE,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.set_progress_handler(deadline.progress_handler, deadline.PROGRESS_STEPS)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    if readonly:
+        conn.execute("PRAGMA query_only=1")
+    return conn
+
+
+_PgConnection = None
+
+
+def _pg_connect(dsn: str, **kwargs):
+    """psycopg2 커넥션 (서브클래스: 풀 반납 + 서버측 PREPARE 이름 추적)"""
+    global _PgConnection
+    import psycopg2
+    import psycopg2.extensions
+    if _PgConnection is None:
+        class _PgCursor(psycopg2.extensions.cursor):
+            """데드라인이 있으면 statement_timeout을 남은 시간으로 맞추고, 그 때문에 취소된 문장은 DeadlineExceeded"""
+
+            def execute(self, sql, params=None):
+                _apply_statement_timeout(self.connection)
+                try:
+                    return super().execute(sql, params)
+                except psycopg2.extensions.QueryCanceledError as e:
+                    err = _deadline_error(e)
+                    if err is None:
+                        raise
+                    raise err from e
+
+        class _PgConnection(psycopg2.extensions.connection):
+            pool = None
+
+            def __init__(self, *args, **kw):
+                super().__init__(*args, **kw)
+                self.cursor_factory = _PgCursor
+                self.prepared = set()
+                self.statement_timeout = 0   # 요청 데드라인으로 설정한 값 (ms, 0이면 미설정)
+
+            def close(self):
+                if self.pool is not None and not self.closed:
+                    try:
+                        self.rollback()
+                        if self.statement_timeout:
+                            # 다음 사용자(작업 워커 등)에게 요청 예산이 남지 않도록
+                            self.cursor(cursor_factory=psycopg2.extensions.cursor).execute("RESET statement_timeout")
+                            self.commit()
+                            self.statement_timeout = 0
+                        if self.pool.release(self):
+                            return
+                    except psycopg2.Error:
+                        pass
+                super().close()
+    return psycopg2.connect(dsn, connection_factory=_PgConnection, **kwargs)
+
+
+_pools = {False: _Pool(lambda: _open_sqlite(False)), True: _Pool(lambda: _open_sqlite(True))}
+_pg_pool = _Pool(lambda: _pg_connect(DATABASE_URL))
+_wal_ready = False
+
+
+# ── 읽기 복제본 (DATABASE_REPLICA_URLS, 콤마 구분) ──
+# PostgreSQL: postgres://... / SQLite: sqlite:///경로 (로컬 테스트용 파일 복사본)
+# 조회 전용 커넥션만 복제본으로 보내고, 장애/지연 복제본은 잠시 제외 후 primary로 폴백
+REPLICA_URLS = [u.strip() for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+REPLICA_RETRY_AFTER = 30    # 장애 복제본 제외 시간 (초)
+REPLICA_PROBE_INTERVAL = 5  # 상태/지연 확인 주기 (초)
+REPLICA_MAX_LAG = 10        # 허용 복제 지연 (초, PostgreSQL)
+
+# 현재 요청(스레드/컨텍스트)의 조회를 primary로 고정 — 방금 쓴 세션의 read-your-writes
+_read_primary = contextvars.ContextVar("read_primary", default=False)
+
+
+class _Replica:
+    """복제본 하나 — primary처럼 자체 커넥션 풀 (서버측 PREPARE가 커넥션과 함께 재사용됨)"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.down_until = 0.0
+        self.last_probe = 0.0
+        self.last_error = ""
+        self.pool = _Pool(self._connect)
+
+    def _connect(self):
+        if USE_POSTGRES:
+            conn = _pg_connect(self.url, connect_timeout=3)
+            conn.set_session(readonly=True)
+            return conn
+        if not self.url.startswith("sqlite:///"):
+            raise ValueError(f"SQLite 복제본은 sqlite:///경로 형식이어야 합니다: {self.url}")
+        path = self.url[len("sqlite:///"):]
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT, factory=_PooledConnection,
+                               check_same_thread=False, cached_statements=STATEMENT_CACHE)
+        conn.row_factory = sqlite3.Row
+        conn.set_progress_handler(deadline.progress_handler, deadline.PROGRESS_STEPS)
         return conn
+
+    def _probe(self, conn):
+        """주기적 상태 확인 — PostgreSQL은 복제 지연까지 확인"""
+        c = conn.cursor()
+        if USE_POSTGRES:
+            c.execute(
+                "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                "FROM (SELECT 1) t WHERE pg_is_in_recovery()"
+            )
+            row = c.fetchone()
+            if row and row[0] > REPLICA_MAX_LAG:
+                raise RuntimeError(f"복제 지연 {row[0]:.0f}s")
+        else:
+            c.execute("SELECT 1")
+        c.close()
+
+    def connect(self):
+        """정상이면 커넥션, 장애면 None (REPLICA_RETRY_AFTER 동안 제외)"""
+        now = time.time()
+        if now < self.down_until:
+            return None
+        conn = None
+        try:
+            conn = self.pool.acquire()
+            if now - self.last_probe >= REPLICA_PROBE_INTERVAL:
+                self._probe(conn)
+                self.last_probe = now
+            return conn
+        except Exception as e:
+            if conn is not None:
+                _Pool._discard(conn)
+            self.pool.clear()
+            self.down_until = now + REPLICA_RETRY_AFTER
+            self.last_error = str(e)
+            return None
+
+
+_replicas = [_Replica(u) for u in REPLICA_URLS]
+_replica_rr = itertools.count()
+
+
+def _replica_conn():
+    """라운드 로빈으로 정상 복제본 선택, 모두 장애면 None"""
+    start = next(_replica_rr)
+    for i in range(len(_replicas)):
+        conn = _replicas[(start + i) % len(_replicas)].connect()
+        if conn is not None:
+            return conn
+    return None
+
+
+def read_from_primary(pinned: bool = True):
+    """현재 컨텍스트의 조회를 primary로 고정 (Token 반환, reset_read_routing으로 복구)"""
+    return _read_primary.set(pinned)
+
+
+def reset_read_routing(token):
+    _read_primary.reset(token)
+
+
+def replica_status() -> list:
+    now = time.time()
+    return [
+        {"url": r.url.split("@")[-1], "healthy": now >= r.down_until, "last_error": r.last_error}
+        for r in _replicas
+    ]
+
+
+def get_conn(readonly: bool = False):
+    """DB 커넥션 — readonly=True는 조회 전용 경로
+    복제본이 설정돼 있으면 복제본으로, 운영 모드 SQLite면 읽기 풀에서
+    요청 데드라인이 있으면 PostgreSQL statement_timeout을 남은 시간으로 설정
+    """
+    deadline.check("db")
+    conn = None
+    if readonly and _replicas and not _read_primary.get():
+        conn = _replica_conn()
+    if conn is None:
+        conn = _primary_conn(readonly)
+    if USE_POSTGRES:
+        _apply_statement_timeout(conn)
+    return conn
+
+
+# statement_timeout은 문장마다 적용되므로, 남은 시간이 이만큼 줄면 다시 설정 (왕복 횟수 절감)
+TIMEOUT_SLACK_MS = 1000
+
+
+def _apply_statement_timeout(conn):
+    left = deadline.remaining()
+    if left is None or not hasattr(conn, "statement_timeout"):
+        return
+    ms = max(1, int(left * 1000))
+    if conn.statement_timeout and conn.statement_timeout - ms < TIMEOUT_SLACK_MS:
+        return
+    # 세션 SET (커밋 후에도 유지), 풀 반납 시 RESET — 기본 커서로 (_PgCursor 재진입 방지)
+    import psycopg2.extensions
+    conn.cursor(cursor_factory=psycopg2.extensions.cursor).execute(f"SET statement_timeout = {ms}")
+    conn.statement_timeout = ms
+
+
+def _primary_conn(readonly: bool):
+    global _wal_ready
+    if USE_POSTGRES:
+        return _pg_pool.acquire()
+    elif SQLITE_PRODUCTION:
+        if not _wal_ready:
+            # journal_mode는 DB 파일에 영구 저장 — 프로세스당 1회만 설정
+            conn = _pools[False].acquire()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.close()
+            _wal_ready = True
+        return _pools[readonly].acquire()
     else:
         conn = sqlite3.connect(
-            os.path.join(os.path.dirname(__file__), "vibecoder.db"),
+            DB_PATH,
             check_same_thread=False,
+            factory=_Connection,
+            cached_statements=STATEMENT_CACHE,
         )
         conn.row_factory = sqlite3.Row
+        conn.set_progress_handler(deadline.progress_handler, deadline.PROGRESS_STEPS)
         return conn
 
 
+# ── 쿼리 레지스트리 (queries.py에서 선언) ──
+# 문장은 import 시점에 한 번만 백엔드용으로 변환한다.
+#   SQLite: ? 그대로 → sqlite3 커넥션의 문장 캐시(STATEMENT_CACHE)가 컴파일 결과 재사용
+#   PostgreSQL: $1..$n 으로 변환해 커넥션별 PREPARE 1회 → 이후 EXECUTE
+QUERIES = {}
+
+
+class Query:
+    __slots__ = ("name", "sql", "nparams", "_prepare", "_execute")
+
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = " ".join(sql.split())
+        self.nparams = self.sql.count("?")
+        if USE_POSTGRES:
+            parts = self.sql.split("?")
+            pg_sql = parts[0] + "".join(f"${i}{part}" for i, part in enumerate(parts[1:], 1))
+            self._prepare = f"PREPARE vc_{name} AS {pg_sql}"
+            args = ", ".join(["%s"] * self.nparams)
+            self._execute = f"EXECUTE vc_{name}" + (f" ({args})" if args else "")
+        else:
+            self._prepare = None
+            self._execute = self.sql
+
+    def __repr__(self):
+        return f"<Query {self.name}: {self.sql}>"
+
+
+def query(name: str, sql: str) -> Query:
+    """문장 선언 (placeholder는 ? 로 작성) — 이름 중복은 선언 오류"""
+    if name in QUERIES:
+        raise ValueError(f"이미 선언된 쿼리: {name}")
+    q = QUERIES[name] = Query(name, sql)
+    return q
+
+
+def _prepared(c, q: Query) -> str:
+    if q._prepare is not None:
+        conn = c.connection
+        prepared = getattr(conn, "prepared", None)
+        if prepared is None:
+            # 풀 밖의 일반 커넥션 — PREPARE 없이 직접 실행
+            return q.sql.replace("%", "%%").replace("?", "%s")
+        if q.name not in prepared:
+            c.execute(q._prepare)
+            prepared.add(q.name)
+    return q._execute
+
+
+def run(c, q, params=()):
+    """Query 또는 SQL 문자열 실행 — 요청 데드라인 초과로 중단되면 DeadlineExceeded"""
+    if deadline.remaining() is None:
+        c.execute(_prepared(c, q) if isinstance(q, Query) else q, params)
+        return c
+    deadline.check("db")
+    if USE_POSTGRES:
+        _apply_statement_timeout(c.connection)
+    with deadline.stage("db"):
+        try:
+            c.execute(_prepared(c, q) if isinstance(q, Query) else q, params)
+        except Exception as e:
+            # SQLite: OperationalError("interrupted"), PostgreSQL: QueryCanceled
+            if deadline.expired():
+                raise deadline.DeadlineExceeded("db") from e
+            raise
+    return c
+
+
+def run_many(c, q, seq):
+    """배치 실행 — PostgreSQL은 execute_batch로 왕복 횟수 절감"""
+    seq = list(seq)
+    if not seq:
+        return c
+    sql = _prepared(c, q) if isinstance(q, Query) else q
+    if USE_POSTGRES:
+        import psycopg2.extras
+        psycopg2.extras.execute_batch(c, sql, seq)
+    else:
+        c.executemany(sql, seq)
+    return c
+
+
+# ── 단일 writer 스레드 ──
+class _Writer:
+    """defer_write()로 들어온 문장을 모아 하나의 트랜잭션으로 커밋"""
+
+    def __init__(self):
+        self._q = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, sql, params):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vc-db-writer", daemon=True)
+                self._thread.start()
+        self._q.put((sql, params))
+
+    def flush(self):
+        """대기 중인 쓰기가 모두 커밋될 때까지 대기"""
+        if self._thread is not None:
+            self._q.join()
+
+    def _run(self):
+        while True:
+            batch = [self._q.get()]
+            while len(batch) < WRITE_BATCH_MAX:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._commit(batch)
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+
+    def _commit(self, batch):
+        conn = get_conn()
+        try:
+            c = conn.cursor()
+            try:
+                for sql, params in batch:
+                    run(c, sql, params)
+                conn.commit()
+            except Exception:
+                # 배치 실패 시 문장별로 다시 시도해 나머지는 살림
+                conn.rollback()
+                for sql, params in batch:
+                    try:
+                        run(c, sql, params)
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        traceback.print_exc()
+        finally:
+            conn.close()
+
+
+_writer = _Writer()
+atexit.register(_writer.flush)
+
+
+def defer_write(sql, params=(), conn=None):
+    """응답에 결과가 필요 없는 쓰기 (조회수 등)
+    운영 모드: writer 스레드 큐에 적재 / 그 외: conn에서 바로 실행 후 커밋
+    """
+    if SQLITE_PRODUCTION:
+        _writer.submit(sql, params)
+        return
+    # 복제본 커넥션일 수 있으므로 복제본 구성 시에는 primary 커넥션을 따로 연다
+    own = conn is None or bool(_replicas)
+    if own:
+        conn = get_conn()
+    run(conn.cursor(), sql, params)
+    conn.commit()
+    if own:
+        conn.close()
+
+
+def flush_writes():
+    _writer.flush()
+
+
 def ph():
     return "%s" if USE_POSTGRES else "?"
 
 
+# ── 행 표현 ──
+# 결과 모양(컬럼 이름 튜플)마다 __slots__ 행 클래스를 한 번 만들어 재사용한다.
+# 행마다 dict를 만드는 것보다 작고 빠르며, row["x"] / row.x(템플릿) / row.get("x") 모두 지원.
+ITER_BATCH = 500   # iterrows() fetchmany 크기
+
+
+class Row:
+    __slots__ = ()
+    _fields = ()
+    _fieldset = frozenset()
+
+    def __getitem__(self, key):
+        if key in self._fieldset:
+            return getattr(self, key)
+        if isinstance(key, int):
+            return getattr(self, self._fields[key])
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self._fieldset:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._fieldset
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fieldset else default
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return [getattr(self, f) for f in self._fields]
+
+    def items(self):
+        return [(f, getattr(self, f)) for f in self._fields]
+
+    def _asdict(self):
+        """JSON 응답 등 dict가 필요한 곳에서 사용"""
+        return {f: getattr(self, f) for f in self._fields}
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return self._asdict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Row({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+
+_row_types = {}
+
+
+def _row_type(cols: tuple):
+    """컬럼 이름 튜플 → 행 생성자 (식별자로 쓸 수 없는 이름이 있으면 dict)"""
+    make = _row_types.get(cols)
+    if make is None:
+        usable = (len(set(cols)) == len(cols)
+                  and all(c.isidentifier() and not keyword.iskeyword(c) and not hasattr(Row, c) for c in cols))
+        if usable:
+            args = ", ".join(f"_{i}" for i in range(len(cols)))
+            body = "".join(f"\n    self.{c} = _{i}" for i, c in enumerate(cols)) or "\n    pass"
+            ns = {}
+            exec(f"def __init__(self, {args}):{body}", ns)
+            make = type("Row", (Row,), {
+                "__slots__": cols, "_fields": cols, "_fieldset": frozenset(cols),
+                "__init__": ns["__init__"],
+            })
+        else:
+            make = lambda *values: dict(zip(cols, values))  # noqa: E731
+        _row_types[cols] = make
+    return make
+
+
+def _cursor_row_type(cursor):
+    return _row_type(tuple(d[0] for d in cursor.description))
+
+
 def fetchall(cursor):
     rows = cursor.fetchall()
-    if USE_POSTGRES:
-        cols = [d[0] for d in cursor.description]
-        return [dict(zip(cols, r)) for r in rows]
-    return [dict(r) for r in rows]
+    if not rows:
+        return []
+    make = _cursor_row_type(cursor)
+    return [make(*r) for r in rows]
 
 
 def fetchone(cursor):
     row = cursor.fetchone()
     if row is None:
         return None
+    return _cursor_row_type(cursor)(*row)
+
+
+def iterrows(cursor, size: int = ITER_BATCH):
+    """fetchmany 단위 스트리밍 — 큰 스캔에서 전체 목록을 만들지 않음 (순회 중 같은 커서 재사용 금지)"""
+    if cursor.description is None:
+        return
+    make = _cursor_row_type(cursor)
+    while True:
+        batch = cursor.fetchmany(size)
+        if not batch:
+            return
+        for r in batch:
+            yield make(*r)
+
+
+def add_columns(c, table: str, columns: dict):
+    """기존 테이블에 없는 컬럼만 추가 (스키마 확장용, 재실행 안전)"""
     if USE_POSTGRES:
-        cols = [d[0] for d in cursor.description]
-        return dict(zip(cols, row))
-    return dict(row)
+        for name, decl in columns.items():
+            c.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {name} {decl}")
+        return
+    c.execute(f"PRAGMA table_info({table})")
+    existing = {r["name"] for r in fetchall(c)}
+    for name, decl in columns.items():
+        if name not in existing:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
 
 
 def init_db():
@@ -98,6 +759,17 @@ def init_db():
         )
     """)
 
+    # ── 게시글 요약 (summary.py) — 목록 화면은 본문 대신 이 컬럼만 조회 ──
+    add_columns(c, "posts", {
+        "excerpt": "TEXT",
+        "word_count": "INTEGER DEFAULT 0",
+        "reading_time": "INTEGER DEFAULT 0",
+        "has_code": "INTEGER DEFAULT 0",
+    })
+
+    # ── 렌더링된 본문 (render.py) — 상세 화면은 content_html을 그대로 출력 ──
+    add_columns(c, "posts", {"content_html": "TEXT", "render_version": "INTEGER DEFAULT 0"})
+
     # ── 댓글 테이블 ──
     c.execute(f"""
         CREATE TABLE IF NOT EXISTS comments (
@@ -115,6 +787,18 @@ def init_db():
             is_deleted INTEGER DEFAULT 0
         )
     """)
+    add_columns(c, "comments", {"content_html": "TEXT", "render_version": "INTEGER DEFAULT 0"})
+
+    # ── 답글 트리 (comment_tree.py) — materialized path, 글별 path 순 = 화면 순서 ──
+    add_columns(c, "comments", {
+        "parent_id": "INTEGER",
+        "path": "TEXT",
+        "depth": "INTEGER DEFAULT 0",
+        "reply_count": "INTEGER DEFAULT 0",
+    })
+    c.execute("CREATE INDEX IF NOT EXISTS idx_comments_post_path ON comments (post_id, path)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_comments_project_path ON comments (project_id, path)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_comments_path ON comments (path)")
 
     # ── IP 속도 제한 테이블 (Flask-Limiter 없이 직접 구현) ──
     c.execute(f"""
@@ -126,19 +810,272 @@ def init_db():
         )
     """)
 
-    # ── 방문자 통계 테이블 ──
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_lookup ON rate_limits (ip_address, action, created_at)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_created ON rate_limits (created_at)")
+
+    # ── 방문자 통계 (retention.py) ──
+    # pv_log: 월 파티션 원본 (PostgreSQL은 RANGE 파티션 부모, SQLite는 월 테이블 UNION 뷰)
+    # page_views: 기존 컬럼 형태의 읽기 전용 뷰 (retention.rebuild_views)
+    if USE_POSTGRES:
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS pv_log (
+                id BIGSERIAL,
+                created_at TEXT NOT NULL,
+                path TEXT NOT NULL,
+                ip_hash TEXT,
+                ref_id INTEGER,
+                ua_id INTEGER,
+                country_hint TEXT
+            ) PARTITION BY RANGE (created_at)
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_pv_log_created ON pv_log (created_at)")
+    for lookup in ("user_agents", "referrers"):
+        c.execute(f"""
+            CREATE TABLE IF NOT EXISTS {lookup} (
+                id {PK},
+                value TEXT UNIQUE NOT NULL
+            )
+        """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS pv_rollup (
+            day TEXT NOT NULL,
+            dim TEXT NOT NULL,
+            value TEXT NOT NULL,
+            cnt INTEGER DEFAULT 0,
+            PRIMARY KEY (day, dim, value)
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS visitors (
+            ip_hash TEXT PRIMARY KEY,
+            first_seen TEXT
+        )
+    """)
+
+    # ── 태그 인덱스 (tech_stack / posts.tags 정규화) ──
+    # use_count: 노출 중인 글 기준 패싯 카운트 (쓰기 경로에서 증감)
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS tags (
+            id {PK},
+            kind TEXT NOT NULL,
+            norm TEXT NOT NULL,
+            name TEXT NOT NULL,
+            use_count INTEGER DEFAULT 0,
+            UNIQUE (kind, norm)
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS project_tags (
+            project_id INTEGER NOT NULL,
+            tag_id INTEGER NOT NULL,
+            PRIMARY KEY (project_id, tag_id)
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS post_tags (
+            post_id INTEGER NOT NULL,
+            tag_id INTEGER NOT NULL,
+            PRIMARY KEY (post_id, tag_id)
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_project_tags_tag ON project_tags (tag_id, project_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_post_tags_tag ON post_tags (tag_id, post_id)")
+
+    # ── 중복 콘텐츠 지문 (64비트 SimHash) ──
+    BIGINT = "BIGINT" if USE_POSTGRES else "INTEGER"
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS content_fingerprints (
+            id {PK},
+            kind TEXT NOT NULL,
+            target_id INTEGER NOT NULL,
+            simhash {BIGINT} NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_fingerprints_target ON content_fingerprints (kind, target_id)")
+
+    # ── 백그라운드 작업 큐 (jobs.py) ──
+    # status: queued → running → done / failed, locked_until: 가시성 타임아웃
     c.execute(f"""
-        CREATE TABLE IF NOT EXISTS page_views (
+        CREATE TABLE IF NOT EXISTS jobs (
             id {PK},
+            name TEXT NOT NULL,
+            payload TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            run_at TEXT NOT NULL,
+            locked_until TEXT,
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 5,
+            last_error TEXT,
+            dedupe_key TEXT UNIQUE,
             created_at TEXT NOT NULL,
+            updated_at TEXT
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_run ON jobs (status, run_at)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_updated ON jobs (status, updated_at)")
+
+    # ── sitemap / 피드 (feeds.py) — URL 목록과 완성된 문서 ──
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS sitemap_entries (
+            loc TEXT PRIMARY KEY,
+            shard TEXT NOT NULL,
+            lastmod TEXT NOT NULL
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sitemap_entries_shard ON sitemap_entries (shard, loc)")
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS static_docs (
+            name TEXT PRIMARY KEY,
+            body TEXT NOT NULL,
+            etag TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    # 다시 만들 문서 표시 — 추가만 하는 기록이라 같은 피드에 몰리는 쓰기도 한 행을 두고 다투지 않는다
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS static_dirty (
+            id {PK},
+            name TEXT NOT NULL
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_static_dirty_name ON static_dirty (name, id)")
+
+    # ── 정적 스냅샷 변경 기록 (snapshot.py) — 각 인스턴스가 새 변경분의 경로만 다시 렌더링 ──
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS snapshot_changes (
+            id {PK},
             path TEXT NOT NULL,
-            ip_hash TEXT,
-            referrer TEXT,
-            user_agent TEXT,
-            country_hint TEXT
+            created_at TEXT NOT NULL
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_snapshot_changes_created ON snapshot_changes (created_at)")
+
+    # ── AI 뉴스 보관소 (news.py) — url_hash: 정규화 URL 해시 ──
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS news_items (
+            id {PK},
+            url_hash TEXT UNIQUE NOT NULL,
+            url TEXT NOT NULL,
+            title TEXT NOT NULL,
+            source TEXT NOT NULL,
+            published_at TEXT NOT NULL,
+            fetched_at TEXT NOT NULL
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_news_items_published ON news_items (published_at, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_news_items_source ON news_items (source, published_at, id)")
+
+    # ── 프로젝트 링크 메타데이터 캐시 (enrich.py) — kind: github / demo ──
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS project_meta (
+            project_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            data TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            failures INTEGER DEFAULT 0,
+            last_error TEXT,
+            checked_at TEXT,
+            expires_at TEXT NOT NULL,
+            PRIMARY KEY (project_id, kind)
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_project_meta_due ON project_meta (kind, expires_at)")
+
+    # ── 일괄 모더레이션 (moderation.py) — 작성자(IP, /24, 세션)별 조회 인덱스와 되돌리기 기록 ──
+    for table in ("posts", "comments"):
+        add_columns(c, table, {"ip_prefix": "TEXT"})
+        c.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_ip ON {table} (ip_address, id)")
+        c.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_prefix ON {table} (ip_prefix, id)")
+        c.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_session ON {table} (session_token, id)")
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS moderation_actions (
+            id {PK},
+            selector TEXT NOT NULL,
+            value TEXT NOT NULL,
+            action TEXT NOT NULL,
+            status TEXT NOT NULL,
+            affected INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS moderation_undo (
+            id {PK},
+            action_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            target_id INTEGER NOT NULL
+        )
+    """)
+    # prev_spam/prev_auto: 처리 전 is_spam/spam_auto — 되돌릴 때 원래 라벨로 (작성 시 자동 판정 포함)
+    add_columns(c, "moderation_undo", {"prev_spam": "INTEGER", "prev_auto": "INTEGER"})
+    c.execute("CREATE INDEX IF NOT EXISTS idx_moderation_undo_action ON moderation_undo (action_id, id)")
+
+    # ── 사이트 전체 카운터 (counters.py) — 이름별 샤드 행, 읽기는 SUM ──
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS site_counters (
+            name TEXT NOT NULL,
+            shard INTEGER NOT NULL,
+            value {"BIGINT" if USE_POSTGRES else "INTEGER"} NOT NULL DEFAULT 0,
+            PRIMARY KEY (name, shard)
+        )
+    """)
+
+    # ── 학습형 스팸 점수 (spamscore.py) — 학습에 반영한 라벨과 버전별 카운트 ──
+    # spam_auto: is_spam이 모델/중복 판정으로만 붙은 행 (학습에서 제외 — 자기 판정을 다시 배우지 않게)
+    for table in ("posts", "comments"):
+        add_columns(c, table, {"spam_auto": "INTEGER DEFAULT 0"})
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS spam_labels (
+            kind TEXT NOT NULL,
+            target_id INTEGER NOT NULL,
+            label INTEGER NOT NULL,
+            PRIMARY KEY (kind, target_id)
+        )
+    """)
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS spam_model (
+            version {PK},
+            features INTEGER NOT NULL,
+            docs_ham INTEGER NOT NULL,
+            docs_spam INTEGER NOT NULL,
+            counts {"BYTEA" if USE_POSTGRES else "BLOB"} NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+
+    # 프로세스 캐시 스냅샷 (warmcache — 새 인스턴스의 첫 요청용)
+    c.execute(f"""
+        CREATE TABLE IF NOT EXISTS cache_snapshots (
+            name TEXT PRIMARY KEY,
+            body {"BYTEA" if USE_POSTGRES else "BLOB"} NOT NULL,
+            saved_at TEXT NOT NULL,
+            format INTEGER NOT NULL
         )
     """)
 
     conn.commit()
+
+    import tags
+    import fingerprint
+    import retention
+    import comment_tree
+    import feeds
+    import enrich
+    import moderation
+    import counters
+    retention.setup(conn)
+    tags.backfill(conn)
+    fingerprint.backfill(conn)
+    comment_tree.backfill(conn)
+    feeds.backfill(conn)
+    enrich.backfill(conn)
+    moderation.backfill(conn)
+    counters.setup(conn)
+
     conn.close()
     print(f"DB 초기화 완료 ({'PostgreSQL' if USE_POSTGRES else 'SQLite'})")
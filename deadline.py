@@ -0,0 +1,173 @@
+"""VibeCoder 요청 데드라인 — 경로별 시간 예산을 DB / 외부 HTTP / bcrypt까지 전파
+gunicorn --timeout 0 이라 워커 타임아웃이 없다. 요청마다 예산(초)을 정하고
+  DB     : PostgreSQL statement_timeout = 남은 시간, SQLite progress handler로 중단
+           (db.run 밖의 c.execute도 db 커서가 중단 오류를 DeadlineExceeded로 변환)
+  HTTP   : urlopen timeout = min(기본값, 남은 시간)
+  bcrypt : 시작 전에 남은 시간 확인 (실행 중에는 중단 불가)
+예산을 넘기면 DeadlineExceeded → app.py가 504로 응답.
+단계(db/http/bcrypt)별 소요 시간을 누적해 어느 단계가 예산을 썼는지 경로별로 집계한다.
+예산: 수용 제어 종류(admission.classify)별 기본값 + 엔드포인트별 지정
+설정: DEADLINE_BUDGETS="read=5,index=8,lounge_write=10" (종류 또는 엔드포인트=초)
+요청 밖(작업 워커, writer 스레드)에서는 데드라인이 없어 모든 함수가 아무것도 하지 않는다.
+"""
+
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# 수용 제어 종류별 기본 예산 (초)
+CLASS_BUDGETS = {"read": 5.0, "write": 10.0, "api": 5.0, "admin": 30.0}
+# 엔드포인트별 예산 — RSS를 직접 받아올 수 있는 화면은 조금 넉넉하게
+ENDPOINT_BUDGETS = {"index": 8.0, "trends": 8.0, "api_ai_news": 8.0}
+STAGES = ("db", "http", "bcrypt")
+PROGRESS_STEPS = 1000   # SQLite VM 명령 N개마다 데드라인 확인
+
+
+class DeadlineExceeded(Exception):
+    """예산 초과 — stage: 초과를 감지한 단계"""
+
+    def __init__(self, stage: str):
+        super().__init__(f"요청 시간 예산 초과 ({stage})")
+        self.stage = stage
+
+
+class _Budget:
+    __slots__ = ("route", "started", "deadline", "spent", "_stage")
+
+    def __init__(self, route: str, seconds: float):
+        self.route = route
+        self.started = time.monotonic()
+        self.deadline = self.started + seconds
+        self.spent = dict.fromkeys(STAGES, 0.0)
+        self._stage = None
+
+
+_current = contextvars.ContextVar("deadline", default=None)
+
+
+def _configured_budgets():
+    budgets = {}
+    for part in os.environ.get("DEADLINE_BUDGETS", "").split(","):
+        name, _, value = part.partition("=")
+        try:
+            budgets[name.strip()] = max(0.1, float(value))
+        except ValueError:
+            continue
+    return budgets
+
+
+_overrides = _configured_budgets()
+
+
+def budget_for(endpoint: str, kind: str):
+    """엔드포인트/종류 → 예산 초 (None이면 제한 없음)"""
+    for key, table in ((endpoint, ENDPOINT_BUDGETS), (kind, CLASS_BUDGETS)):
+        if key in _overrides:
+            return _overrides[key]
+        if key in table:
+            return table[key]
+    return None
+
+
+def start(route: str, seconds):
+    """요청 시작 시 예산 설정 (Token 반환, finish()로 해제)"""
+    return _current.set(_Budget(route, seconds) if seconds else None)
+
+
+def finish(token, exc=None):
+    """요청 종료 — 단계별 소요 시간 집계 후 해제"""
+    b = _current.get()
+    _current.reset(token)
+    if b is not None:
+        _record(b, exc)
+
+
+def remaining():
+    """남은 초 (데드라인이 없으면 None, 지났으면 0 이하)"""
+    b = _current.get()
+    return None if b is None else b.deadline - time.monotonic()
+
+
+def expired() -> bool:
+    b = _current.get()
+    return b is not None and time.monotonic() >= b.deadline
+
+
+def check(stage: str):
+    """이미 예산을 다 썼으면 다음 단계를 시작하지 않고 DeadlineExceeded"""
+    if expired():
+        raise DeadlineExceeded(stage)
+
+
+def timeout(default: float) -> float:
+    """외부 호출용 timeout — min(기본값, 남은 시간), 이미 지났으면 DeadlineExceeded"""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("http")
+    return min(default, left)
+
+
+@contextmanager
+def stage(name: str):
+    """단계 소요 시간 누적 (중첩되면 바깥 단계만 집계)"""
+    b = _current.get()
+    if b is None or b._stage is not None:
+        yield
+        return
+    b._stage = name
+    t0 = time.monotonic()
+    try:
+        yield
+    finally:
+        b.spent[name] += time.monotonic() - t0
+        b._stage = None
+
+
+def progress_handler() -> int:
+    """sqlite3 set_progress_handler용 — 0이 아니면 실행 중인 문장 중단 (OperationalError: interrupted)"""
+    b = _current.get()
+    return 1 if b is not None and time.monotonic() >= b.deadline else 0
+
+
+# ──────────────────────────────────────────────────────────
+# 집계
+# ──────────────────────────────────────────────────────────
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(b: _Budget, exc):
+    elapsed = time.monotonic() - b.started
+    spent = dict(b.spent)
+    spent["app"] = max(0.0, elapsed - sum(spent.values()))
+    with _stats_lock:
+        s = _stats.get(b.route)
+        if s is None:
+            s = _stats[b.route] = {"requests": 0, "exceeded": 0, "over_budget": 0,
+                                   "seconds": dict.fromkeys(spent, 0.0), "exceeded_by": {}}
+        s["requests"] += 1
+        for name, sec in spent.items():
+            s["seconds"][name] += sec
+        if isinstance(exc, DeadlineExceeded) or elapsed > b.deadline - b.started:
+            # 504로 끝났든, 중단 지점이 없어 끝까지 처리했든 예산을 넘긴 요청
+            key = "exceeded" if isinstance(exc, DeadlineExceeded) else "over_budget"
+            s[key] += 1
+            top = max(spent, key=spent.get)
+            s["exceeded_by"][top] = s["exceeded_by"].get(top, 0) + 1
+
+
+def stats() -> dict:
+    """경로별 요청 수 / 504 수 / 예산 초과 수 / 단계별 평균 ms / 초과 시 가장 오래 걸린 단계"""
+    with _stats_lock:
+        return {
+            route: {
+                "requests": s["requests"], "exceeded": s["exceeded"], "over_budget": s["over_budget"],
+                "avg_ms": {k: round(v / s["requests"] * 1000, 1) for k, v in s["seconds"].items()},
+                "exceeded_by": dict(s["exceeded_by"]),
+            }
+            for route, s in sorted(_stats.items())
+        }
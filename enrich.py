@@ -0,0 +1,362 @@
+"""VibeCoder 프로젝트 링크 메타데이터 — 백그라운드에서 모아 project_meta에 캐시
+  github : GitHub API /repos/{owner}/{repo} → 별/포크 수, 최근 푸시(커밋) 시각, 보관(archived) 여부
+  demo   : 데모 URL HEAD (405면 GET) → 접속 가능 여부, 응답 코드
+상세 화면은 project_meta만 읽는다 (외부 호출 없음). 갱신은 enrich_projects 작업 (ENRICH_CRON):
+  - 만료(expires_at)된 행만 BATCH개씩, 종류별 동시 요청 상한 (GITHUB_CONCURRENCY / DEMO_CONCURRENCY)
+  - 저장된 ETag / Last-Modified로 조건부 요청 → 304면 값은 그대로 두고 만료만 연장
+    (GitHub은 인증 요청의 304를 rate limit에 세지 않음)
+  - GitHub rate limit: 403/429 + X-RateLimit-Remaining: 0 / Retry-After → 리셋 시각까지 GitHub 조회 중단,
+    남은 한도가 RATE_RESERVE 이하여도 미리 멈춤. 실패는 지수 백오프 (FAIL_BASE × 2^n, 최대 FAIL_MAX)
+값이 바뀌면 프로젝트 상세 스냅샷을 다시 만들도록 표시 (snapshot.py).
+데모 URL은 사용자 입력 — 접속할 때마다 주소를 해석해 공개 주소만 허용하고, 검증한 IP로 바로 연결한다
+(재해석으로 바뀌는 DNS rebinding 차단). 리다이렉트도 같은 연결 경로라 hop마다 다시 검증, 최대 MAX_REDIRECTS번.
+"""
+
+import os
+import re
+import json
+import time
+import socket
+import ipaddress
+import threading
+import http.client
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from datetime import datetime, timedelta
+
+import jobs
+import snapshot
+from db import get_conn, ph, fetchall
+
+GITHUB_API = os.environ.get("GITHUB_API", "https://api.github.com").rstrip("/")
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
+BATCH = 40
+GITHUB_CONCURRENCY = 4
+DEMO_CONCURRENCY = 8
+TIMEOUT = 8
+RATE_RESERVE = 5                 # 남은 한도가 이 이하면 리셋까지 대기
+TTL = {"github": timedelta(hours=6), "demo": timedelta(hours=1)}
+MISSING_TTL = timedelta(hours=24)   # 404 (저장소 삭제/비공개)
+FAIL_BASE = timedelta(minutes=15)
+FAIL_MAX = timedelta(hours=24)
+USER_AGENT = "VibeCoder-enrich/1.0"
+ALLOW_PRIVATE = False            # 데모 URL이 내부망(메타데이터 서버 등)을 가리키면 조회 안 함
+MAX_REDIRECTS = 5
+
+_GITHUB_RE = re.compile(r"^https?://(?:www\.)?github\.com/([\w.-]+)/([\w.-]+?)(?:\.git)?/?(?:[#?].*)?$", re.I)
+
+_pause = {"until": 0.0}
+_pause_lock = threading.Lock()
+_stats = {"fetched": 0, "not_modified": 0, "failed": 0, "rate_limited": 0}
+_stats_lock = threading.Lock()
+
+
+class RateLimited(Exception):
+    def __init__(self, until: float):
+        super().__init__(f"rate limited until {until:.0f}")
+        self.until = until
+
+
+def github_repo(url: str):
+    """github_url → "owner/repo" 또는 None (저장소 페이지가 아닌 링크)"""
+    m = _GITHUB_RE.match((url or "").strip())
+    return f"{m.group(1)}/{m.group(2)}" if m else None
+
+
+def _count(key: str):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def stats() -> dict:
+    with _stats_lock:
+        out = dict(_stats)
+    out["github_paused_for"] = max(0, round(_pause["until"] - time.time()))
+    return out
+
+
+# ──────────────────────────────────────────────────────────
+# 등록 (호출자 트랜잭션) — 새 링크는 바로 만료 상태로 넣어 다음 배치에서 조회
+# ──────────────────────────────────────────────────────────
+def track(c, project_id: int, github_url: str, demo_url: str):
+    p = ph()
+    now = datetime.now().isoformat()
+    targets = []
+    if github_repo(github_url):
+        targets.append(("github", github_url.strip()))
+    if (demo_url or "").strip().lower().startswith(("http://", "https://")):
+        targets.append(("demo", demo_url.strip()))
+    for kind, url in targets:
+        c.execute(
+            f"INSERT INTO project_meta (project_id, kind, url, status, failures, expires_at) "
+            f"VALUES ({p},{p},{p},'pending',0,{p}) ON CONFLICT (project_id, kind) DO NOTHING",
+            (project_id, kind, url, now),
+        )
+
+
+def backfill(conn):
+    """링크가 있는데 메타 행이 없는 프로젝트 등록 (재실행 안전)"""
+    c = conn.cursor()
+    c.execute("""SELECT id, github_url, demo_url FROM projects p
+                 WHERE (github_url<>'' OR demo_url<>'')
+                   AND NOT EXISTS (SELECT 1 FROM project_meta m WHERE m.project_id=p.id)""")
+    for r in fetchall(c):
+        track(c, r["id"], r["github_url"], r["demo_url"])
+    conn.commit()
+
+
+# ──────────────────────────────────────────────────────────
+# 조회 (워커 스레드)
+# ──────────────────────────────────────────────────────────
+def _conditional(req, row):
+    if row["etag"]:
+        req.add_header("If-None-Match", row["etag"])
+    if row["last_modified"]:
+        req.add_header("If-Modified-Since", row["last_modified"])
+
+
+def _rate_limit_until(headers, status: int):
+    """rate limit 응답이면 재개 시각(epoch), 아니면 None"""
+    retry_after = headers.get("Retry-After")
+    if status in (403, 429) and (headers.get("X-RateLimit-Remaining") == "0" or retry_after):
+        if retry_after and retry_after.isdigit():
+            return time.time() + int(retry_after)
+        reset = headers.get("X-RateLimit-Reset", "")
+        return float(reset) if reset.isdigit() else time.time() + 60
+    return None
+
+
+def _note_remaining(headers):
+    """성공 응답의 남은 한도가 바닥이면 미리 멈춤"""
+    remaining, reset = headers.get("X-RateLimit-Remaining", ""), headers.get("X-RateLimit-Reset", "")
+    if remaining.isdigit() and int(remaining) <= RATE_RESERVE and reset.isdigit():
+        _pause_until(float(reset))
+
+
+def _pause_until(until: float):
+    with _pause_lock:
+        _pause["until"] = max(_pause["until"], until)
+
+
+def _paused() -> bool:
+    return time.time() < _pause["until"]
+
+
+def _fetch_github(row) -> dict:
+    """→ {"status", "data", "etag", "last_modified"} — 304면 status "not_modified" """
+    if _paused():
+        raise RateLimited(_pause["until"])
+    req = urllib.request.Request(f"{GITHUB_API}/repos/{github_repo(row['url'])}", headers={
+        "Accept": "application/vnd.github+json", "User-Agent": USER_AGENT,
+    })
+    if GITHUB_TOKEN:
+        req.add_header("Authorization", f"Bearer {GITHUB_TOKEN}")
+    _conditional(req, row)
+    try:
+        with urllib.request.urlopen(req, timeout=TIMEOUT) as r:
+            _note_remaining(r.headers)
+            repo = json.loads(r.read())
+            return {
+                "status": "ok",
+                "data": {
+                    "stars": repo.get("stargazers_count", 0),
+                    "forks": repo.get("forks_count", 0),
+                    "pushed_at": repo.get("pushed_at"),
+                    "archived": bool(repo.get("archived")),
+                },
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            _note_remaining(e.headers)
+            return {"status": "not_modified"}
+        until = _rate_limit_until(e.headers, e.code)
+        if until is not None:
+            _pause_until(until)
+            raise RateLimited(until)
+        if e.code == 404:
+            return {"status": "missing", "data": {}}
+        raise
+
+
+class PrivateAddress(OSError):
+    """데모 URL(또는 리다이렉트 대상)이 공개 주소가 아님"""
+
+
+def _public_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None, *args, **kwargs):
+    """socket.create_connection 대체 — 해석한 주소가 모두 공개 주소일 때만, 그중 하나로 직접 연결"""
+    host, port = address
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    if not infos or not all(ipaddress.ip_address(info[4][0].split("%")[0]).is_global for info in infos):
+        raise PrivateAddress(f"공개 주소가 아님: {host}")
+    return socket.create_connection(infos[0][4][:2], timeout, source_address)
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _public_connection
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _public_connection  # TLS SNI/인증서 확인은 원래 host 이름으로
+
+
+class _PublicHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+class _RedirectHandler(urllib.request.HTTPRedirectHandler):
+    max_redirections = MAX_REDIRECTS
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        if urlsplit(newurl).scheme not in ("http", "https"):
+            raise urllib.error.HTTPError(newurl, code, f"리다이렉트 차단: {newurl}", headers, fp)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+# 프록시 환경 변수 무시 (프록시를 거치면 접속 주소 검증이 의미 없음)
+_demo_opener = urllib.request.build_opener(
+    urllib.request.ProxyHandler({}), _PublicHTTPHandler, _PublicHTTPSHandler, _RedirectHandler,
+)
+
+
+def _open_demo(req):
+    if ALLOW_PRIVATE:
+        return urllib.request.urlopen(req, timeout=TIMEOUT)
+    return _demo_opener.open(req, timeout=TIMEOUT)
+
+
+def _fetch_demo(row) -> dict:
+    req = urllib.request.Request(row["url"], method="HEAD", headers={"User-Agent": USER_AGENT})
+    _conditional(req, row)
+    try:
+        try:
+            r = _open_demo(req)
+        except urllib.error.HTTPError as e:
+            if e.code != 405:
+                raise
+            req = urllib.request.Request(row["url"], headers={"User-Agent": USER_AGENT})
+            r = _open_demo(req)
+        with r:
+            return {"status": "ok", "data": {"up": True, "code": r.status},
+                    "etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, PrivateAddress):
+            return {"status": "missing", "data": {}}
+        if not isinstance(e, urllib.error.HTTPError):
+            raise
+        if e.code == 304:
+            return {"status": "not_modified"}
+        # 응답은 왔지만 오류 — 실패가 아니라 "접속 불가"라는 결과
+        return {"status": "ok", "data": {"up": False, "code": e.code}, "etag": None, "last_modified": None}
+
+
+_FETCHERS = {"github": _fetch_github, "demo": _fetch_demo}
+
+
+def _lookup(row):
+    """(행, 결과 또는 None, 오류 문자열 또는 None) — 예외를 밖으로 내지 않음"""
+    try:
+        return row, _FETCHERS[row["kind"]](row), None
+    except RateLimited as e:
+        _count("rate_limited")
+        return row, None, str(e)
+    except Exception as e:
+        _count("failed")
+        return row, None, f"{type(e).__name__}: {e}"[:200]
+
+
+def _save(c, row, result, error):
+    """결과 저장 → 표시 값이 바뀌었으면 True"""
+    p = ph()
+    now = datetime.now()
+    if result is None:
+        if _paused() and row["kind"] == "github":
+            return False  # rate limit — 만료 상태 그대로 두고 재개 후 조회
+        delay = min(FAIL_MAX, FAIL_BASE * (2 ** min(row["failures"], 10)))
+        c.execute(
+            f"UPDATE project_meta SET failures=failures+1, last_error={p}, expires_at={p} "
+            f"WHERE project_id={p} AND kind={p}",
+            (error, (now + delay).isoformat(), row["project_id"], row["kind"]),
+        )
+        return False
+    if result["status"] == "not_modified":
+        _count("not_modified")
+        c.execute(
+            f"UPDATE project_meta SET failures=0, last_error=NULL, checked_at={p}, expires_at={p} "
+            f"WHERE project_id={p} AND kind={p}",
+            (now.isoformat(), (now + TTL[row["kind"]]).isoformat(), row["project_id"], row["kind"]),
+        )
+        return False
+    _count("fetched")
+    data = json.dumps(result["data"], sort_keys=True)
+    ttl = MISSING_TTL if result["status"] == "missing" else TTL[row["kind"]]
+    c.execute(
+        f"UPDATE project_meta SET status={p}, data={p}, etag={p}, last_modified={p}, failures=0, "
+        f"last_error=NULL, checked_at={p}, expires_at={p} WHERE project_id={p} AND kind={p}",
+        (result["status"], data, result.get("etag"), result.get("last_modified"), now.isoformat(),
+         (now + ttl).isoformat(), row["project_id"], row["kind"]),
+    )
+    return data != row["data"] or result["status"] != row["status"]
+
+
+def _due(c, kind: str, limit: int):
+    c.execute(
+        f"SELECT m.project_id, m.kind, m.url, m.status, m.data, m.etag, m.last_modified, m.failures, p.slug "
+        f"FROM project_meta m JOIN projects p ON p.id=m.project_id "
+        f"WHERE m.kind={ph()} AND m.expires_at<={ph()} ORDER BY m.expires_at LIMIT {ph()}",
+        (kind, datetime.now().isoformat(), limit),
+    )
+    return fetchall(c)
+
+
+@jobs.job("enrich_projects")
+def enrich_projects(payload=None):
+    """만료된 메타데이터 갱신 — 종류별 동시 요청 상한 안에서 한 배치"""
+    limit = (payload or {}).get("batch", BATCH)
+    conn = get_conn()
+    c = conn.cursor()
+    try:
+        rows = {"github": [] if _paused() else _due(c, "github", limit), "demo": _due(c, "demo", limit)}
+        results = []
+        with ThreadPoolExecutor(GITHUB_CONCURRENCY, thread_name_prefix="vc-enrich-gh") as gh, \
+                ThreadPoolExecutor(DEMO_CONCURRENCY, thread_name_prefix="vc-enrich-demo") as demo:
+            futures = [gh.submit(_lookup, r) for r in rows["github"]] + [demo.submit(_lookup, r) for r in rows["demo"]]
+            results = [f.result() for f in futures]
+        changed = []
+        for row, result, error in results:
+            if _save(c, row, result, error):
+                changed.append(snapshot.PATHS["project"].format(row["slug"]))
+        snapshot.mark(c, *changed)
+        conn.commit()
+    finally:
+        conn.close()
+    return len(results)
+
+
+jobs.schedule("enrich_projects", os.environ.get("ENRICH_CRON", "*/5 * * * *"))
+
+
+# ──────────────────────────────────────────────────────────
+# 화면용 (캐시 값만)
+# ──────────────────────────────────────────────────────────
+def for_project(c, project_id: int) -> dict:
+    """{"github": {...}, "demo": {...}} — 값이 있는 종류만, checked_at 포함"""
+    c.execute(f"SELECT kind, status, data, checked_at FROM project_meta WHERE project_id={ph()}", (project_id,))
+    meta = {}
+    for r in fetchall(c):
+        if r["status"] == "ok" and r["data"]:
+            meta[r["kind"]] = dict(json.loads(r["data"]), checked_at=r["checked_at"])
+    return meta
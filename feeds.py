@@ -0,0 +1,298 @@
+"""VibeCoder sitemap.xml / Atom 피드 — 쓰기 시점에 갱신, 요청 시에는 저장된 문서만 전송
+  sitemap_entries : URL 한 줄씩 (loc, shard, lastmod) — 글 작성/삭제/스팸 처리 트랜잭션에서 추가·삭제
+  static_docs     : 완성된 XML 문서 + ETag
+  static_dirty    : 다시 만들 문서 이름 (변경마다 한 행 추가 — 인기 피드 한 행에 쓰기가 몰리지 않게)
+샤드: pages / posts-N / projects-N (id // SITEMAP_MAX_URLS) → 샤드당 URL 5만 개 이하,
+      /sitemap.xml은 샤드 목록(sitemap index), /sitemap-<샤드>.xml이 각 샤드
+피드: /feed.xml (라운지 전체), /feed/<카테고리>.xml, /showcase/feed.xml — 최신 FEED_SIZE개
+쓰기 경로는 행 추가 + dirty 표시만 하고, 문서 재생성은 작업 워커 틱(REBUILD_INTERVAL)에서
+dirty 문서만 샤드/카테고리 단위 인덱스 조회로 만든다. 요청 경로는 문서 한 행 조회 (+ 메모리 캐시).
+작업 워커가 없으면 (JOB_WORKERS=0) maybe_rebuild()로 쓰기/피드 요청 뒤 REBUILD_INTERVAL마다 한 번만.
+"""
+
+import os
+import time
+import hashlib
+import threading
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+import jobs
+from db import get_conn, ph, fetchall, fetchone
+
+SITE_URL = os.environ.get("SITE_URL", "https://vibecoder-328967213016.asia-northeast3.run.app").rstrip("/")
+SITEMAP_MAX_URLS = 50000
+FEED_SIZE = 20
+REBUILD_INTERVAL = 10   # dirty 문서 재생성 주기 (초)
+CACHE_TTL = 10          # 요청 경로 메모리 캐시 (초)
+
+LOUNGE_CATEGORIES = {"tip": "꿀팁", "qna": "Q&A", "showcase": "쇼케이스", "free": "자유", "info": "정보"}
+STATIC_PAGES = ["/", "/showcase", "/lounge", "/trends", "/tools", "/submit"]
+
+SITEMAP_INDEX = "sitemap"
+FEED_LOUNGE = "feed-lounge"
+FEED_SHOWCASE = "feed-showcase"
+
+CONTENT_TYPES = {"sitemap": "application/xml; charset=utf-8", "feed": "application/atom+xml; charset=utf-8"}
+
+_cache = {}
+_cache_lock = threading.Lock()
+_last_rebuild = 0.0
+
+
+def _shard(kind: str, target_id: int) -> str:
+    return f"{kind}-{target_id // SITEMAP_MAX_URLS}"
+
+
+def _day(dt_str: str) -> str:
+    return (dt_str or datetime.now().isoformat())[:10]
+
+
+def mark_dirty(c, *names):
+    """변경마다 static_dirty에 한 행 — 재생성 중에 들어온 변경(더 큰 id)은 다음 틱에서 다시 처리"""
+    p = ph()
+    for name in dict.fromkeys(names):
+        c.execute(f"INSERT INTO static_dirty (name) VALUES ({p})", (name,))
+
+
+# ──────────────────────────────────────────────────────────
+# 쓰기 경로 (호출자 트랜잭션, 커밋은 호출자)
+# ──────────────────────────────────────────────────────────
+def _add_entry(c, loc: str, shard: str, lastmod: str):
+    p = ph()
+    c.execute(
+        f"INSERT INTO sitemap_entries (loc, shard, lastmod) VALUES ({p},{p},{p}) "
+        f"ON CONFLICT (loc) DO UPDATE SET lastmod=excluded.lastmod",
+        (loc, shard, _day(lastmod)),
+    )
+    mark_dirty(c, "sitemap-" + shard)
+
+
+def _remove_entry(c, loc: str):
+    p = ph()
+    c.execute(f"SELECT shard FROM sitemap_entries WHERE loc={p}", (loc,))
+    row = fetchone(c)
+    if row:
+        c.execute(f"DELETE FROM sitemap_entries WHERE loc={p}", (loc,))
+        mark_dirty(c, "sitemap-" + row["shard"])
+
+
+def post_feeds(category: str) -> list:
+    names = [FEED_LOUNGE]
+    if category in LOUNGE_CATEGORIES:
+        names.append(f"{FEED_LOUNGE}-{category}")
+    return names
+
+
+def add_post(c, post_id: int, slug: str, category: str, created_at: str):
+    """노출되는 글 작성 시"""
+    _add_entry(c, f"/lounge/{slug}", _shard("posts", post_id), created_at)
+    mark_dirty(c, *post_feeds(category))
+
+
+def remove_post(c, slug: str, category: str):
+    """삭제/스팸 처리 시"""
+    _remove_entry(c, f"/lounge/{slug}")
+    mark_dirty(c, *post_feeds(category))
+
+
+def add_project(c, project_id: int, slug: str, created_at: str):
+    _add_entry(c, f"/showcase/{slug}", _shard("projects", project_id), created_at)
+    mark_dirty(c, FEED_SHOWCASE)
+
+
+def remove_project(c, slug: str):
+    _remove_entry(c, f"/showcase/{slug}")
+    mark_dirty(c, FEED_SHOWCASE)
+
+
+# ──────────────────────────────────────────────────────────
+# 문서 생성
+# ──────────────────────────────────────────────────────────
+def _build_shard(c, shard: str):
+    """샤드 문서 (URL이 없으면 None → 문서 삭제)"""
+    p = ph()
+    c.execute(f"SELECT loc, lastmod FROM sitemap_entries WHERE shard={p} ORDER BY loc", (shard,))
+    rows = fetchall(c)
+    if not rows:
+        return None
+    urls = "".join(
+        f"<url><loc>{escape(SITE_URL + r['loc'])}</loc><lastmod>{r['lastmod']}</lastmod></url>\n" for r in rows
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n' + urls + "</urlset>\n")
+
+
+def _build_index(c):
+    c.execute("SELECT name, updated_at FROM static_docs WHERE name LIKE 'sitemap-%' AND etag<>'' ORDER BY name")
+    items = "".join(
+        f"<sitemap><loc>{escape(SITE_URL)}/{r['name']}.xml</loc><lastmod>{_day(r['updated_at'])}</lastmod></sitemap>\n"
+        for r in fetchall(c)
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n' + items + "</sitemapindex>\n")
+
+
+def _atom(title: str, path: str, feed_path: str, entries: list) -> str:
+    updated = max((e["updated"] for e in entries), default=datetime.now().isoformat(timespec="seconds"))
+    body = "".join(
+        "<entry>"
+        f"<title>{escape(e['title'])}</title>"
+        f'<link href="{escape(SITE_URL + e["path"])}"/>'
+        f"<id>{escape(SITE_URL + e['path'])}</id>"
+        f"<updated>{e['updated']}</updated>"
+        f"<author><name>{escape(e['author'] or '익명코더')}</name></author>"
+        f"<summary>{escape(e['summary'] or '')}</summary>"
+        "</entry>\n"
+        for e in entries
+    )
+    return ('<?xml version="1.0" encoding="utf-8"?>\n'
+            '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+            f"<title>{escape(title)}</title>"
+            f'<link href="{escape(SITE_URL + path)}"/>'
+            f'<link rel="self" href="{escape(SITE_URL + feed_path)}"/>'
+            f"<id>{escape(SITE_URL + feed_path)}</id><updated>{_rfc3339(updated)}</updated>\n"
+            + body + "</feed>\n")
+
+
+def _rfc3339(dt_str: str) -> str:
+    """저장된 naive ISO 시각 → Atom updated (서버 로컬 시각을 오프셋과 함께)"""
+    try:
+        return datetime.fromisoformat(dt_str).astimezone().isoformat(timespec="seconds")
+    except (TypeError, ValueError):
+        return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+def _build_feed(c, name: str):
+    p = ph()
+    if name == FEED_SHOWCASE:
+        c.execute(
+            f"SELECT title, slug, author, description, created_at FROM projects "
+            f"ORDER BY created_at DESC LIMIT {p}", (FEED_SIZE,),
+        )
+        entries = [{"title": r["title"], "path": f"/showcase/{r['slug']}", "author": r["author"],
+                    "summary": (r["description"] or "")[:300], "updated": _rfc3339(r["created_at"])}
+                   for r in fetchall(c)]
+        return _atom("VibeCoder 쇼케이스", "/showcase", "/showcase/feed.xml", entries)
+
+    category = name[len(FEED_LOUNGE) + 1:] if name != FEED_LOUNGE else ""
+    cols = "title, slug, author_name, excerpt, created_at"
+    if category:
+        c.execute(
+            f"SELECT {cols} FROM posts WHERE is_spam=0 AND is_deleted=0 AND category={p} "
+            f"ORDER BY created_at DESC LIMIT {p}", (category, FEED_SIZE),
+        )
+        title, feed_path = f"VibeCoder 라운지 — {LOUNGE_CATEGORIES.get(category, category)}", f"/feed/{category}.xml"
+    else:
+        c.execute(
+            f"SELECT {cols} FROM posts WHERE is_spam=0 AND is_deleted=0 "
+            f"ORDER BY created_at DESC LIMIT {p}", (FEED_SIZE,),
+        )
+        title, feed_path = "VibeCoder 라운지", "/feed.xml"
+    entries = [{"title": r["title"], "path": f"/lounge/{r['slug']}", "author": r["author_name"],
+                "summary": r["excerpt"], "updated": _rfc3339(r["created_at"])}
+               for r in fetchall(c)]
+    return _atom(title, "/lounge" + (f"?category={category}" if category else ""), feed_path, entries)
+
+
+def _build(c, name: str):
+    if name == SITEMAP_INDEX:
+        return _build_index(c)
+    if name.startswith("sitemap-"):
+        return _build_shard(c, name[len("sitemap-"):])
+    return _build_feed(c, name)
+
+
+def _store(c, name: str, body, seen: int):
+    """seen: 재생성 시작 때 읽은 마지막 static_dirty id — 그 이하 표시만 지운다"""
+    p = ph()
+    if body is None:
+        c.execute(f"DELETE FROM static_docs WHERE name={p}", (name,))
+    else:
+        etag = hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+        c.execute(
+            f"INSERT INTO static_docs (name, body, etag, updated_at) VALUES ({p},{p},{p},{p}) "
+            f"ON CONFLICT (name) DO UPDATE SET body=excluded.body, etag=excluded.etag, updated_at=excluded.updated_at",
+            (name, body, etag, datetime.now().isoformat()),
+        )
+    if seen:
+        c.execute(f"DELETE FROM static_dirty WHERE name={p} AND id<={p}", (name, seen))
+
+
+@jobs.tick(REBUILD_INTERVAL)
+def rebuild_dirty(conn=None):
+    """dirty 문서 재생성 — 샤드/피드 먼저, 샤드가 바뀌었으면 sitemap index도"""
+    own = conn is None
+    if own:
+        conn = get_conn()
+    c = conn.cursor()
+    c.execute("SELECT name, MAX(id) AS seen FROM static_dirty GROUP BY name")
+    dirty = {r["name"]: r["seen"] for r in fetchall(c)}
+    if dirty:
+        seen_index = dirty.pop(SITEMAP_INDEX, None)
+        for name, seen in dirty.items():
+            _store(c, name, _build(c, name), seen)
+        if seen_index is not None or any(n.startswith("sitemap-") for n in dirty):
+            _store(c, SITEMAP_INDEX, _build_index(c), seen_index)
+        conn.commit()
+    if own:
+        conn.close()
+
+
+def maybe_rebuild():
+    """작업 워커 없이 (JOB_WORKERS=0) — 요청 경로에서 REBUILD_INTERVAL마다 한 번만
+    (쓰기마다 재생성하면 피드/샤드 문서를 매번 통째로 다시 만든다)"""
+    global _last_rebuild
+    now = time.time()
+    if now - _last_rebuild >= REBUILD_INTERVAL:
+        _last_rebuild = now
+        rebuild_dirty()
+
+
+# ──────────────────────────────────────────────────────────
+# 요청 경로
+# ──────────────────────────────────────────────────────────
+def get(name: str):
+    """(본문 bytes, ETag, Last-Modified ISO) 또는 None — 문서 한 행 조회 + CACHE_TTL 메모리 캐시"""
+    now = time.time()
+    with _cache_lock:
+        hit = _cache.get(name)
+    if hit and now - hit[0] < CACHE_TTL:
+        return hit[1]
+    p = ph()
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    c.execute(f"SELECT body, etag, updated_at FROM static_docs WHERE name={p}", (name,))
+    row = fetchone(c)
+    conn.close()
+    if row is None or not row["etag"]:
+        doc = None
+    else:
+        doc = (row["body"].encode("utf-8"), row["etag"], row["updated_at"])
+    with _cache_lock:
+        _cache[name] = (now, doc)
+    return doc
+
+
+def feed_names() -> list:
+    return [FEED_LOUNGE, FEED_SHOWCASE] + [f"{FEED_LOUNGE}-{cat}" for cat in LOUNGE_CATEGORIES]
+
+
+def backfill(conn):
+    """처음 한 번 — 고정 페이지 + 노출 중인 글/프로젝트 URL 적재 후 전체 문서 생성 (재실행 안전)"""
+    c = conn.cursor()
+    c.execute("SELECT COUNT(*) AS cnt FROM sitemap_entries")
+    if fetchone(c)["cnt"]:
+        return
+    today = datetime.now().isoformat()
+    for path in STATIC_PAGES:
+        _add_entry(c, path, "pages", today)
+    c.execute("SELECT id, slug, created_at FROM projects")
+    for r in fetchall(c):
+        _add_entry(c, f"/showcase/{r['slug']}", _shard("projects", r["id"]), r["created_at"])
+    c.execute("SELECT id, slug, created_at FROM posts WHERE is_spam=0 AND is_deleted=0")
+    for r in fetchall(c):
+        _add_entry(c, f"/lounge/{r['slug']}", _shard("posts", r["id"]), r["created_at"])
+    mark_dirty(c, SITEMAP_INDEX, *feed_names())
+    conn.commit()
+    rebuild_dirty(conn)
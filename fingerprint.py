@@ -0,0 +1,352 @@
+"""VibeCoder 중복 콘텐츠 탐지 — SimHash + LSH 블록 인덱스
+64비트 SimHash(앞 MAX_CHARS자의 문자 4-gram 슁글, 비트 누적은 NumPy 행렬 연산)를 content_fingerprints 테이블에 저장하고,
+메모리에는 해시를 5개 블록으로 나눈 순열 테이블 10개(블록 2개 조합)를 유지한다.
+해밍 거리 3 이하인 두 해시는 5개 블록 중 최소 2개가 일치하므로
+각 테이블의 26비트 키 구간만 이진 탐색하면 된다 (Manku et al. 방식).
+테이블은 정렬된 array('Q') + 최근 추가분 dict로 구성되어 행당 80바이트 남짓만 쓴다.
+재시작 시에는 warmcache 스냅샷(정렬 배열 그대로)에서 복원하고 그 뒤 추가분만 DB에서 읽는다.
+전체 로드는 기동 시 백그라운드 스레드(start_warm)에서 — 요청 경로는 로드가 끝난 뒤의 추가분만 읽고,
+로드 중에 들어온 글은 WARM_WAIT(와 요청 데드라인) 이내로만 기다린 뒤 중복 검사 없이 통과시킨다.
+지문은 추가만 하고 지우지 않는다 — 작성자가 삭제한 원본은 조회 시 DB 상태로 걸러낸다 (find_duplicate).
+"""
+
+import re
+import bisect
+import hashlib
+import threading
+from array import array
+from itertools import combinations
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 미설치 — 비트 누적을 순수 파이썬으로
+    np = None
+
+import deadline
+import warmcache
+from db import get_conn, ph, fetchall, fetchone, iterrows
+
+SHINGLE = 4          # 문자 n-gram 길이
+MAX_DISTANCE = 3     # 이 거리 이하면 재게시로 판단
+MIN_TEXT_LEN = 40    # 짧은 글("감사합니다" 등)은 지문 생략
+MAX_CHARS = 4000     # 앞부분만 본다 (요청 경로 계산 시간 상한)
+DELTA_LIMIT = 5000   # 최근 추가분이 이만큼 쌓이면 정렬 테이블에 병합
+WARM_WAIT = 2.0      # 기동 로드가 안 끝났을 때 글쓰기 요청이 기다리는 최대 초
+WARM_MAX_AGE = 7 * 86400  # 지문은 추가만 되므로 오래된 스냅샷도 증분 로드로 따라잡는다
+
+# 64비트 → 13/13/13/13/12 블록, (시작 비트, 폭)
+_BLOCKS = [(0, 13), (13, 13), (26, 13), (39, 13), (52, 12)]
+_TABLES = list(combinations(range(len(_BLOCKS)), 2))
+
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"https?://\S+", " ", (text or "").lower())
+    text = re.sub(r"[^\w]+", " ", text, flags=re.UNICODE)
+    return " ".join(text.split())
+
+
+_BITS = np.arange(64, dtype=np.uint64) if np is not None else None
+
+
+def simhash(text: str):
+    """64비트 SimHash — 앞 MAX_CHARS자만 (정규화 후 MIN_TEXT_LEN 미만이면 None)"""
+    norm = _normalize((text or "")[:MAX_CHARS])
+    if len(norm) < MIN_TEXT_LEN:
+        return None
+    weights = {}
+    for i in range(len(norm) - SHINGLE + 1):
+        sh = norm[i:i + SHINGLE]
+        weights[sh] = weights.get(sh, 0) + 1
+    hashes = [hashlib.blake2b(sh.encode(), digest_size=8).digest() for sh in weights]
+    if np is not None:
+        # 슁글 × 64비트 행렬로 한 번에 — 비트가 1이면 +w, 0이면 -w
+        h = np.frombuffer(b"".join(hashes), dtype=">u8").astype(np.uint64)
+        w = np.fromiter(weights.values(), dtype=np.int64, count=len(weights))
+        bits = ((h[:, None] >> _BITS) & np.uint64(1)).astype(np.int64)
+        v = (w[:, None] * (2 * bits - 1)).sum(axis=0)
+        return int(np.packbits((v > 0)[::-1]).view(">u8")[0])
+    v = [0] * 64
+    for digest, w in zip(hashes, weights.values()):
+        h = int.from_bytes(digest, "big")
+        for bit in range(64):
+            v[bit] += w if (h >> bit) & 1 else -w
+    sig = 0
+    for bit in range(64):
+        if v[bit] > 0:
+            sig |= 1 << bit
+    return sig
+
+
+def _to_db(sig: int) -> int:
+    """부호 있는 64비트로 변환 (SQLite INTEGER / Postgres BIGINT)"""
+    return sig - (1 << 64) if sig >= (1 << 63) else sig
+
+
+def _from_db(val: int) -> int:
+    return val + (1 << 64) if val < 0 else val
+
+
+def _table_key(sig: int, table: int) -> int:
+    a, b = _TABLES[table]
+    (sa, wa), (sb, wb) = _BLOCKS[a], _BLOCKS[b]
+    return (((sig >> sa) & ((1 << wa) - 1)) << wb) | ((sig >> sb) & ((1 << wb) - 1))
+
+
+class DuplicateIndex:
+    """순열 테이블 인덱스 (프로세스 공유)
+    테이블 항목은 (키 << 32 | 항목 번호) 정렬 배열, 항목 본체는 병렬 배열에 보관
+    """
+
+    def __init__(self):
+        self._sigs = array("Q")
+        self._targets = array("q")
+        self._kinds = []
+        self._sorted = [array("Q") for _ in _TABLES]
+        self._delta = [dict() for _ in _TABLES]
+        self._delta_size = 0
+        self._last_id = 0
+        self._lock = threading.Lock()       # 로드/추가/병합 (쓰는 쪽끼리)
+        self._view_lock = threading.Lock()  # (_sorted, _delta) 한 쌍 교체 ↔ 조회 쪽 스냅샷
+
+    def __len__(self):
+        return len(self._sigs)
+
+    def add(self, sig: int, kind: str, target_id: int):
+        idx = len(self._sigs)
+        self._sigs.append(sig)
+        self._targets.append(target_id)
+        self._kinds.append(kind)
+        for t in range(len(_TABLES)):
+            self._delta[t].setdefault(_table_key(sig, t), []).append(idx)
+        self._delta_size += 1
+        if self._delta_size >= DELTA_LIMIT:
+            self.compact()
+
+    def compact(self):
+        """최근 추가분을 정렬 배열에 병합 — 새 테이블을 다 만든 뒤 한 번에 교체 (조회 중인 쪽은 이전 쌍을 계속 봄)"""
+        tables = []
+        for t in range(len(_TABLES)):
+            merged = list(self._sorted[t])
+            for key, idxs in self._delta[t].items():
+                merged.extend((key << 32) | i for i in idxs)
+            merged.sort()
+            tables.append(array("Q", merged))
+        with self._view_lock:
+            self._sorted, self._delta = tables, [dict() for _ in _TABLES]
+        self._delta_size = 0
+
+    def _candidates(self, sig: int):
+        with self._view_lock:
+            tables, deltas = self._sorted, self._delta
+        for t in range(len(_TABLES)):
+            key = _table_key(sig, t)
+            table = tables[t]
+            i = bisect.bisect_left(table, key << 32)
+            end = (key + 1) << 32
+            while i < len(table) and table[i] < end:
+                yield table[i] & 0xFFFFFFFF
+                i += 1
+            yield from list(deltas[t].get(key, ()))
+
+    def find(self, sig: int, max_distance: int = MAX_DISTANCE):
+        """가장 가까운 기존 항목 (kind, target_id, distance) 또는 None"""
+        best = None
+        for idx in self._candidates(sig):
+            d = bin(sig ^ self._sigs[idx]).count("1")
+            if d <= max_distance and (best is None or d < best[2]):
+                best = (self._kinds[idx], self._targets[idx], d)
+        return best
+
+    def find_all(self, sig: int, max_distance: int = MAX_DISTANCE) -> list:
+        """거리 이내 항목 전부 [(kind, target_id, distance)] — 관리자 일괄 조회용"""
+        found = {}
+        for idx in self._candidates(sig):
+            if idx not in found:
+                d = bin(sig ^ self._sigs[idx]).count("1")
+                if d <= max_distance:
+                    found[idx] = (self._kinds[idx], self._targets[idx], d)
+        return sorted(found.values(), key=lambda f: (f[2], f[0], f[1]))
+
+    def snapshot(self):
+        """정렬 배열 그대로 (warmcache 저장용) — 비어 있으면 None"""
+        with self._lock:
+            if not self._last_id:
+                return None
+            self.compact()
+            return {
+                "last_id": self._last_id,
+                "sigs": self._sigs.tobytes(),
+                "targets": self._targets.tobytes(),
+                "kinds": self._kinds,
+                "sorted": [t.tobytes() for t in self._sorted],
+            }
+
+    def restore(self, state: dict, rows: int) -> bool:
+        """스냅샷 적용 — rows(DB의 id <= last_id 행 수)와 항목 수가 다르면 버림"""
+        sigs, targets, tables = array("Q"), array("q"), [array("Q") for _ in _TABLES]
+        sigs.frombytes(state["sigs"])
+        targets.frombytes(state["targets"])
+        for table, body in zip(tables, state["sorted"]):
+            table.frombytes(body)
+        if not (len(sigs) == len(targets) == len(state["kinds"]) == rows
+                and all(len(t) == rows for t in tables)):
+            return False
+        with self._lock:
+            if self._last_id:
+                return False
+            self._sigs, self._targets, self._kinds = sigs, targets, list(state["kinds"])
+            with self._view_lock:
+                self._sorted, self._delta = tables, [dict() for _ in _TABLES]
+            self._delta_size = 0
+            self._last_id = state["last_id"]
+        return True
+
+    def refresh(self, c):
+        """마지막으로 읽은 id 이후 행만 로드 (기동 시 전체, 이후 증분)"""
+        with self._lock:
+            p = ph()
+            c.execute(
+                f"SELECT id, kind, target_id, simhash FROM content_fingerprints WHERE id>{p} ORDER BY id",
+                (self._last_id,),
+            )
+            for row in iterrows(c):
+                self.add(_from_db(row["simhash"]), row["kind"], row["target_id"])
+                self._last_id = row["id"]
+
+
+_index = DuplicateIndex()
+
+
+def _warm_load(state: dict) -> bool:
+    conn = get_conn(readonly=True)
+    try:
+        c = conn.cursor()
+        c.execute(f"SELECT COUNT(*) AS cnt FROM content_fingerprints WHERE id<={ph()}", (state["last_id"],))
+        rows = fetchone(c)["cnt"]
+    finally:
+        conn.close()
+    return _index.restore(state, rows)
+
+
+warmcache.register("fingerprints", _index.snapshot, _warm_load, WARM_MAX_AGE)
+
+
+_ready = threading.Event()   # 전체 로드 성공
+_done = threading.Event()    # 기동 로드 종료 (성공/실패)
+_warm_lock = threading.Lock()
+_warm_started = False
+
+
+def warm():
+    """전체 로드 (스냅샷 복원 → 나머지 증분) — 자체 커넥션, 데드라인 없음"""
+    try:
+        warmcache.restore("fingerprints")
+        conn = get_conn(readonly=True)
+        try:
+            _index.refresh(conn.cursor())
+        finally:
+            conn.close()
+        _ready.set()
+    except Exception as e:
+        print(f"[fingerprint] 기동 로드 실패, 첫 사용 시 직접 로드: {e}")
+    finally:
+        _done.set()
+
+
+def start_warm():
+    """백그라운드 스레드로 warm() — 프로세스당 한 번"""
+    global _warm_started
+    with _warm_lock:
+        if _warm_started:
+            return
+        _warm_started = True
+    threading.Thread(target=warm, name="vc-fingerprint-warm", daemon=True).start()
+
+
+def _refresh(c, wait) -> bool:
+    """로드가 끝났으면 추가분만 읽고 True, wait초(None이면 무제한, 데드라인 이내) 안에 안 끝나면 False"""
+    if not _ready.is_set():
+        start_warm()
+        left = deadline.remaining()
+        if left is not None:
+            wait = max(0.0, left) if wait is None else min(wait, max(0.0, left))
+        if not _done.wait(wait):
+            return False
+        # 기동 로드가 실패했으면 이 커넥션으로 직접 (오류는 호출자에게)
+    _index.refresh(c)
+    _ready.set()
+    return True
+
+
+# 종류별 대상 상태 — 행이 없거나 작성자가 지운 글/댓글(스팸 아님)은 중복 원본으로 치지 않는다
+_TARGET_STATE = {
+    "post": "SELECT is_deleted, is_spam FROM posts WHERE id={p}",
+    "comment": "SELECT is_deleted, is_spam FROM comments WHERE id={p}",
+    "project": "SELECT 0 AS is_deleted, 0 AS is_spam FROM projects WHERE id={p}",
+}
+
+
+def _counts_as_original(c, kind: str, target_id: int) -> bool:
+    sql = _TARGET_STATE.get(kind)
+    if sql is None:
+        return False
+    c.execute(sql.format(p=ph()), (target_id,))
+    row = fetchone(c)
+    return row is not None and (not row["is_deleted"] or bool(row["is_spam"]))
+
+
+def find_duplicate(c, text: str):
+    """(simhash, 중복 항목) 반환 — 중복 항목은 (kind, target_id, distance) 또는 None
+    지우고 다시 올린 글은 중복이 아니다 (삭제된 원본 무시, 스팸으로 숨긴 원본은 그대로 중복).
+    기동 로드가 WARM_WAIT 안에 끝나지 않으면 중복 없음으로 처리 (지문은 그대로 기록된다)"""
+    sig = simhash(text)
+    if sig is None:
+        return None, None
+    if not _refresh(c, WARM_WAIT):
+        return sig, None
+    for kind, target_id, distance in _index.find_all(sig):
+        if _counts_as_original(c, kind, target_id):
+            return sig, (kind, target_id, distance)
+    return sig, None
+
+
+def find_similar(c, text: str, max_distance: int = MAX_DISTANCE) -> list:
+    """본문과 거의 같은 기존 항목 전부 — 지문이 없는 짧은 글이면 빈 목록 (관리자/작업용: 로드 완료까지 대기)"""
+    sig = simhash(text)
+    if sig is None:
+        return []
+    if not _refresh(c, None):
+        deadline.check("fingerprint")
+        return []
+    return _index.find_all(sig, max_distance)
+
+
+def record(c, kind: str, target_id: int, sig):
+    """새 글 지문 저장 (커밋은 호출자 트랜잭션과 함께)"""
+    if sig is None:
+        return
+    p = ph()
+    c.execute(
+        f"INSERT INTO content_fingerprints (kind, target_id, simhash, created_at) VALUES ({p},{p},{p},{p})",
+        (kind, target_id, _to_db(sig), datetime.now().isoformat()),
+    )
+
+
+def backfill(conn):
+    """지문이 없는 기존 글/프로젝트/댓글 처리 (재실행 안전)"""
+    c = conn.cursor()
+    sources = [
+        ("post", "SELECT id, content AS body FROM posts"),
+        ("project", "SELECT id, description AS body FROM projects"),
+        ("comment", "SELECT id, content AS body FROM comments"),
+    ]
+    p = ph()
+    for kind, sql in sources:
+        c.execute(
+            f"{sql} WHERE id > COALESCE((SELECT MAX(target_id) FROM content_fingerprints WHERE kind={p}), 0)",
+            (kind,),
+        )
+        for row in fetchall(c):
+            record(c, kind, row["id"], simhash(row["body"]))
+    conn.commit()
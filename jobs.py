@@ -0,0 +1,376 @@
+"""VibeCoder 백그라운드 작업 큐 — DB 기반 (PostgreSQL / SQLite 공통)
+  enqueue()  : jobs 테이블에 작업 추가 (dedupe_key로 중복 방지)
+  워커       : queued 작업을 조건부 UPDATE로 선점 → 가시성 타임아웃 동안 독점
+              실행 중에는 HEARTBEAT마다 locked_until을 연장 (선점 값이 토큰 — 다른 워커가 가져갔으면 중단)
+              완료/실패 기록도 선점 토큰이 그대로일 때만 → 가져간 쪽의 상태를 덮어쓰지 않는다
+              실패 시 지수 백오프 재시도, max_attempts 초과 시 failed (타임아웃으로 버려진 작업도 같음)
+  스케줄     : cron 표현식 → 분 단위 dedupe_key로 프로세스가 여러 개여도 1회만 적재
+              (스케줄러 스레드가 멈췄던 사이의 분도 기동 이후 분이면 따라잡아 적재)
+  틱         : 프로세스 로컬 주기 작업 (메모리 버퍼 flush 등)
+  스케줄러/틱은 전용 스레드 — 오래 걸리는 작업이 flush나 cron 적재를 막지 않는다
+  정리       : purge_jobs 작업 (JOB_PURGE_CRON) — done은 DONE_RETENTION, failed는 FAILED_RETENTION 후 삭제
+실행: 앱 프로세스 내 스레드(JOB_WORKERS) 또는 `python jobs.py worker`
+"""
+
+import os
+import json
+import time
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from db import get_conn, ph, fetchall, fetchone
+
+POLL_INTERVAL = 2.0          # 빈 큐 폴링 간격 (초)
+VISIBILITY_TIMEOUT = 300     # 선점 후 이 시간 내 완료/연장 못하면 다른 워커가 재시도
+HEARTBEAT = VISIBILITY_TIMEOUT / 3   # 실행 중 locked_until 연장 주기 (초)
+BACKOFF_BASE = 30            # 재시도 대기: 30s, 60s, 120s ...
+DEFAULT_MAX_ATTEMPTS = 5
+SCHEDULER_INTERVAL = 1.0     # 스케줄러 스레드 점검 간격 (초)
+MAX_CATCHUP = 60             # 밀린 cron 분을 따라잡는 최대 분 수
+DONE_RETENTION = timedelta(days=1)
+FAILED_RETENTION = timedelta(days=14)
+PURGE_BATCH = 5000
+
+_handlers = {}
+_schedules = []   # (name, cron, payload)
+_ticks = []       # [fn, interval, last_run]
+_started = False
+_start_lock = threading.Lock()
+
+
+def job(name: str):
+    """작업 핸들러 등록 데코레이터 — handler(payload: dict)"""
+    def deco(fn):
+        _handlers[name] = fn
+        return fn
+    return deco
+
+
+def schedule(name: str, cron: str, payload=None):
+    """cron 표현식(분 시 일 월 요일)으로 주기 작업 등록 (빈 문자열이면 비활성)"""
+    if cron:
+        _parse_cron(cron)  # 잘못된 표현식은 등록 시점에 실패
+        _schedules.append((name, cron, payload or {}))
+
+
+def tick(interval: float):
+    """프로세스 로컬 주기 함수 등록 (워커 스레드 루프에서 호출)"""
+    def deco(fn):
+        _ticks.append([fn, interval, 0.0])
+        return fn
+    return deco
+
+
+def enqueue(name: str, payload=None, delay: float = 0, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+            dedupe_key: str = None, conn=None):
+    """작업 적재 — conn을 넘기면 호출자 트랜잭션에 포함 (커밋은 호출자)"""
+    own = conn is None
+    if own:
+        conn = get_conn()
+    c = conn.cursor()
+    p = ph()
+    now = datetime.now()
+    c.execute(
+        f"""INSERT INTO jobs (name, payload, status, run_at, attempts, max_attempts, dedupe_key, created_at)
+            VALUES ({p},{p},'queued',{p},0,{p},{p},{p})
+            ON CONFLICT (dedupe_key) DO NOTHING""",
+        (name, json.dumps(payload or {}, ensure_ascii=False),
+         (now + timedelta(seconds=delay)).isoformat(), max_attempts, dedupe_key, now.isoformat()),
+    )
+    if own:
+        conn.commit()
+        conn.close()
+
+
+# ──────────────────────────────────────────────────────────
+# cron
+# ──────────────────────────────────────────────────────────
+_CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+def _parse_cron(expr: str):
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"cron 표현식은 5개 필드여야 합니다: {expr!r}")
+    sets = []
+    for field, (lo, hi) in zip(fields, _CRON_RANGES):
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/")
+                step = int(step)
+            if part == "*":
+                start, end = lo, hi
+            elif "-" in part:
+                start, end = map(int, part.split("-"))
+            else:
+                start = end = int(part)
+            values.update(range(start, end + 1, step))
+        sets.append(values)
+    return sets
+
+
+def cron_matches(expr: str, dt: datetime) -> bool:
+    minute, hour, dom, month, dow = _parse_cron(expr)
+    if not (dt.minute in minute and dt.hour in hour and dt.month in month):
+        return False
+    day_ok, weekday_ok = dt.day in dom, (dt.weekday() + 1) % 7 in dow
+    # 표준 cron: 일/요일이 둘 다 지정되면 둘 중 하나만 맞아도 실행
+    _m, _h, dom_field, _mo, dow_field = expr.split()
+    if not dom_field.startswith("*") and not dow_field.startswith("*"):
+        return day_ok or weekday_ok
+    return day_ok and weekday_ok
+
+
+def _enqueue_due(slot: datetime):
+    for name, cron, payload in _schedules:
+        if cron_matches(cron, slot):
+            enqueue(name, payload, dedupe_key=f"cron:{name}:{slot.isoformat()}")
+
+
+# ──────────────────────────────────────────────────────────
+# 워커
+# ──────────────────────────────────────────────────────────
+def _claim(c):
+    """실행 가능한 작업 1개 선점 (조건부 UPDATE로 경쟁 워커와 충돌 방지)
+    타임아웃으로 버려진 작업 중 시도 횟수를 다 쓴 것은 다시 실행하지 않고 failed로"""
+    p = ph()
+    now = datetime.now().isoformat()
+    c.execute(
+        f"""UPDATE jobs SET status='failed', locked_until=NULL, updated_at={p},
+                last_error='가시성 타임아웃 초과 (시도 횟수 소진)'
+            WHERE status='running' AND locked_until<{p} AND attempts>=max_attempts""",
+        (now, now),
+    )
+    c.execute(
+        f"""SELECT id FROM jobs
+            WHERE (status='queued' AND run_at<={p}) OR (status='running' AND locked_until<{p})
+            ORDER BY run_at LIMIT 5""",
+        (now, now),
+    )
+    for row in fetchall(c):
+        locked_until = (datetime.now() + timedelta(seconds=VISIBILITY_TIMEOUT)).isoformat()
+        c.execute(
+            f"""UPDATE jobs SET status='running', locked_until={p}, attempts=attempts+1, updated_at={p}
+                WHERE id={p} AND ((status='queued' AND run_at<={p}) OR (status='running' AND locked_until<{p}))""",
+            (locked_until, now, row["id"], now, now),
+        )
+        if c.rowcount == 1:
+            c.execute(f"SELECT * FROM jobs WHERE id={p}", (row["id"],))
+            return fetchone(c)
+    return None
+
+
+class _Lease:
+    """실행 중인 작업의 선점 유지 — HEARTBEAT마다 locked_until 연장 (자체 커넥션)
+    token: 지금 DB에 있는 locked_until 값. 연장이 안 되면 (다른 워커가 가져감) lost"""
+
+    def __init__(self, job_id: int, token: str):
+        self.job_id = job_id
+        self.token = token
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"vc-job-lease-{job_id}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        p = ph()
+        while not self._stop.wait(HEARTBEAT):
+            new = (datetime.now() + timedelta(seconds=VISIBILITY_TIMEOUT)).isoformat()
+            try:
+                conn = get_conn()
+                try:
+                    c = conn.cursor()
+                    c.execute(
+                        f"UPDATE jobs SET locked_until={p} WHERE id={p} AND status='running' AND locked_until={p}",
+                        (new, self.job_id, self.token),
+                    )
+                    ok = c.rowcount == 1
+                    conn.commit()
+                finally:
+                    conn.close()
+            except Exception:
+                traceback.print_exc()
+                continue  # 다음 주기에 다시 (타임아웃 전까지 여유가 있음)
+            if not ok:
+                self.lost = True
+                return
+            self.token = new
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_one() -> bool:
+    """작업 1개 실행, 실행했으면 True"""
+    conn = get_conn()
+    c = conn.cursor()
+    p = ph()
+    row = _claim(c)
+    conn.commit()
+    if not row:
+        conn.close()
+        return False
+
+    lease = _Lease(row["id"], row["locked_until"])
+    handler = _handlers.get(row["name"])
+    try:
+        if handler is None:
+            raise LookupError(f"등록되지 않은 작업: {row['name']}")
+        handler(json.loads(row["payload"] or "{}"))
+        lease.stop()
+        c.execute(
+            f"""UPDATE jobs SET status='done', locked_until=NULL, last_error=NULL, updated_at={p}
+                WHERE id={p} AND status='running' AND locked_until={p}""",
+            (datetime.now().isoformat(), row["id"], lease.token),
+        )
+    except Exception:
+        lease.stop()
+        err = traceback.format_exc(limit=3)[-1000:]
+        if row["attempts"] >= row["max_attempts"]:
+            c.execute(
+                f"""UPDATE jobs SET status='failed', locked_until=NULL, last_error={p}, updated_at={p}
+                    WHERE id={p} AND status='running' AND locked_until={p}""",
+                (err, datetime.now().isoformat(), row["id"], lease.token),
+            )
+        else:
+            retry_at = datetime.now() + timedelta(seconds=BACKOFF_BASE * 2 ** (row["attempts"] - 1))
+            c.execute(
+                f"""UPDATE jobs SET status='queued', run_at={p}, locked_until=NULL, last_error={p}, updated_at={p}
+                    WHERE id={p} AND status='running' AND locked_until={p}""",
+                (retry_at.isoformat(), err, datetime.now().isoformat(), row["id"], lease.token),
+            )
+    if c.rowcount != 1:
+        print(f"[jobs] #{row['id']} {row['name']}: 선점을 잃어 결과를 기록하지 않음 (다른 워커가 실행 중)")
+    conn.commit()
+    conn.close()
+    return True
+
+
+def run_ticks(force: bool = False):
+    now = time.time()
+    for t in _ticks:
+        fn, interval, last = t
+        if force or now - last >= interval:
+            t[2] = now
+            try:
+                fn()
+            except Exception:
+                traceback.print_exc()
+
+
+def _scheduler_loop():
+    """틱 + cron 적재 — 작업 실행과 분리된 스레드. 놓친 분은 기동 이후 MAX_CATCHUP분까지 따라잡는다"""
+    last_slot = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=1)
+    while True:
+        try:
+            run_ticks()
+            slot = datetime.now().replace(second=0, microsecond=0)
+            if slot > last_slot:
+                due = max(last_slot + timedelta(minutes=1), slot - timedelta(minutes=MAX_CATCHUP - 1))
+                while due <= slot:
+                    _enqueue_due(due)
+                    last_slot = due
+                    due += timedelta(minutes=1)
+        except Exception:
+            traceback.print_exc()
+        time.sleep(SCHEDULER_INTERVAL)
+
+
+def _worker_loop():
+    while True:
+        try:
+            if not run_one():
+                time.sleep(POLL_INTERVAL)
+        except Exception:
+            traceback.print_exc()
+            time.sleep(POLL_INTERVAL)
+
+
+def start_workers(n: int):
+    """스케줄러 스레드 1개 + 데몬 워커 스레드 n개 기동 (중복 호출 무시)"""
+    global _started
+    with _start_lock:
+        if _started or n <= 0:
+            return
+        _started = True
+    threading.Thread(target=_scheduler_loop, name="vc-job-scheduler", daemon=True).start()
+    for i in range(n):
+        threading.Thread(target=_worker_loop, name=f"vc-job-{i}", daemon=True).start()
+
+
+def stats(limit: int = 30):
+    """관리자 화면용 — 상태별 개수 + 최근 작업"""
+    conn = get_conn()
+    c = conn.cursor()
+    p = ph()
+    c.execute("SELECT status, COUNT(*) as cnt FROM jobs GROUP BY status")
+    counts = {r["status"]: r["cnt"] for r in fetchall(c)}
+    c.execute(
+        f"""SELECT id, name, status, attempts, max_attempts, run_at, updated_at, last_error
+            FROM jobs ORDER BY id DESC LIMIT {p}""",
+        (limit,),
+    )
+    recent = fetchall(c)
+    conn.close()
+    return counts, recent
+
+
+def retry(job_id: int):
+    """failed 작업을 즉시 재시도 대기열로"""
+    conn = get_conn()
+    c = conn.cursor()
+    p = ph()
+    c.execute(
+        f"UPDATE jobs SET status='queued', attempts=0, run_at={p} WHERE id={p} AND status='failed'",
+        (datetime.now().isoformat(), job_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+@job("purge_jobs")
+def purge_jobs(payload=None) -> int:
+    """끝난 작업 행 삭제 (done: DONE_RETENTION, failed: FAILED_RETENTION 경과) → 삭제 수
+    cron dedupe_key는 분 단위라 행을 지워도 같은 분이 다시 적재되지 않는다 (따라잡기는 MAX_CATCHUP분 이내)"""
+    p = ph()
+    now = datetime.now()
+    deleted = 0
+    conn = get_conn()
+    try:
+        c = conn.cursor()
+        for status, retention in (("done", DONE_RETENTION), ("failed", FAILED_RETENTION)):
+            while True:
+                c.execute(
+                    f"""DELETE FROM jobs WHERE id IN (
+                            SELECT id FROM jobs WHERE status={p} AND updated_at<{p} LIMIT {p})""",
+                    (status, (now - retention).isoformat(), PURGE_BATCH),
+                )
+                n = c.rowcount
+                conn.commit()
+                deleted += n
+                if n < PURGE_BATCH:
+                    break
+    finally:
+        conn.close()
+    return deleted
+
+
+schedule("purge_jobs", os.environ.get("JOB_PURGE_CRON", "17 * * * *"))
+
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:] != ["worker"]:
+        print("사용법: python jobs.py worker")
+        sys.exit(1)
+    # 앱 내 워커 스레드는 끄고, 핸들러가 등록된 `jobs` 모듈(≠ __main__)로 실행
+    os.environ["JOB_WORKERS"] = "0"
+    import app  # noqa: F401 — 핸들러/스케줄 등록
+    import jobs
+    print(f"작업 워커 시작 (handlers: {', '.join(sorted(jobs._handlers))})")
+    threading.Thread(target=jobs._scheduler_loop, name="vc-job-scheduler", daemon=True).start()
+    jobs._worker_loop()
@@ -0,0 +1,178 @@
+"""VibeCoder 메모리 추적 — tracemalloc 기반, 켜야만 동작 (opt-in)
+  MEMTRACK=1 (또는 /admin/memory 에서 켜기) → tracemalloc 시작
+  요청 SAMPLE_EVERY개 중 1개: 요청 전후 스냅샷 비교 → 경로별 순증가 / 증가 상위 위치 누적
+  /admin/memory: 현재 할당 상위 위치, 경로별 증가, 타입별 살아있는 객체 수, RSS
+스냅샷은 한 번에 하나만 (동시 요청이 많으면 그 요청은 건너뜀). 스냅샷 사이에 다른 스레드가
+할당한 것도 포함되므로 경로별 수치는 여러 샘플의 경향으로 본다.
+꺼져 있으면 요청 경로 비용은 전역 플래그 확인 한 번.
+"""
+
+import os
+import gc
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+
+ENABLED = os.environ.get("MEMTRACK") == "1"
+SAMPLE_EVERY = max(1, int(os.environ.get("MEMTRACK_SAMPLE", "100")))
+FRAMES = 5          # 할당 위치별 보관 스택 깊이
+TOP_SITES = 20
+ROUTE_TOP_SITES = 5
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_snap_lock = threading.Lock()
+_seen = 0
+_routes = {}
+
+
+def enabled() -> bool:
+    return ENABLED and tracemalloc.is_tracing()
+
+
+def enable(frames: int = FRAMES):
+    global ENABLED
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    with _lock:
+        _routes.clear()
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+
+# ──────────────────────────────────────────────────────────
+# 요청 단위 샘플링
+# ──────────────────────────────────────────────────────────
+def begin():
+    """요청 시작 — 샘플 대상이면 이전 스냅샷 반환, 아니면 None"""
+    global _seen
+    if not enabled():
+        return None
+    with _lock:
+        _seen += 1
+        if _seen % SAMPLE_EVERY:
+            return None
+    if not _snap_lock.acquire(blocking=False):
+        return None
+    try:
+        return _snapshot()
+    except Exception:
+        _snap_lock.release()
+        return None
+
+
+def end(route: str, before):
+    """요청 끝 — begin()이 돌려준 스냅샷과 비교해 경로별로 누적"""
+    if before is None:
+        return
+    try:
+        if not tracemalloc.is_tracing():
+            return
+        diff = _snapshot().compare_to(before, "lineno")
+    finally:
+        _snap_lock.release()
+    net = sum(d.size_diff for d in diff)
+    with _lock:
+        r = _routes.get(route)
+        if r is None:
+            r = _routes[route] = {"samples": 0, "net_bytes": 0, "max_bytes": 0, "sites": Counter()}
+        r["samples"] += 1
+        r["net_bytes"] += net
+        r["max_bytes"] = max(r["max_bytes"], net)
+        for d in diff[:ROUTE_TOP_SITES]:
+            if d.size_diff > 0:
+                r["sites"][_site(d)] += d.size_diff
+        # 위치 카운터가 끝없이 커지지 않도록 상위만 유지
+        if len(r["sites"]) > ROUTE_TOP_SITES * 4:
+            r["sites"] = Counter(dict(r["sites"].most_common(ROUTE_TOP_SITES * 2)))
+
+
+# ──────────────────────────────────────────────────────────
+# 보고서
+# ──────────────────────────────────────────────────────────
+def rss_bytes() -> int:
+    """현재 RSS (리눅스 /proc, 그 외에는 최대 RSS)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return 0
+
+
+def object_counts(limit: int = 25) -> list:
+    """타입별 살아있는 (gc 추적) 객체 수 상위"""
+    return Counter(type(o).__name__ for o in gc.get_objects()).most_common(limit)
+
+
+def top_sites(limit: int = TOP_SITES) -> list:
+    """현재 추적 중인 메모리 상위 할당 위치 [(위치, KB, 블록 수, 스택)]"""
+    if not tracemalloc.is_tracing():
+        return []
+    stats = _snapshot().statistics("traceback")[:limit]
+    return [
+        (_site(s), round(s.size / 1024, 1), s.count,
+         [f"{os.path.basename(f.filename)}:{f.lineno}" for f in s.traceback])
+        for s in stats
+    ]
+
+
+def routes() -> dict:
+    with _lock:
+        return {
+            route: {
+                "samples": r["samples"],
+                "avg_kb": round(r["net_bytes"] / r["samples"] / 1024, 1),
+                "max_kb": round(r["max_bytes"] / 1024, 1),
+                "sites": [(site, round(b / 1024, 1)) for site, b in r["sites"].most_common(ROUTE_TOP_SITES)],
+            }
+            for route, r in sorted(_routes.items())
+        }
+
+
+def report() -> dict:
+    current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {
+        "enabled": enabled(),
+        "sample_every": SAMPLE_EVERY,
+        "rss_mb": round(rss_bytes() / 1048576, 1),
+        "traced_mb": round(current / 1048576, 2),
+        "traced_peak_mb": round(peak / 1048576, 2),
+        "gc_counts": gc.get_count(),
+        "top_sites": top_sites(),
+        "routes": routes(),
+        "objects": object_counts(),
+    }
+
+
+if ENABLED:
+    enable()
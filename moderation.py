@@ -0,0 +1,379 @@
+"""VibeCoder 일괄 모더레이션 — 스팸 물결을 작성자 단위로 한 번에 정리 (/admin/moderation)
+선택 기준 (모두 전용 인덱스):
+  ip      : ip_address 일치                       idx_{posts,comments}_ip      (ip_address, id)
+  prefix  : 같은 /24 (IPv6는 /48) — ip_prefix 컬럼  idx_{posts,comments}_prefix  (ip_prefix, id)
+  session : vc_session 토큰 일치                  idx_{posts,comments}_session (session_token, id)
+  text    : 본문이 거의 같은 글/댓글 (fingerprint.py SimHash, 해밍 거리 MAX_DISTANCE 이하)
+            값은 본문 예시 또는 "post:<id>" / "comment:<id>"
+처리: start()가 moderation_actions에 기록하고 moderate 작업을 적재 → 워커가 CHUNK개씩 끊어서
+      각 묶음을 한 트랜잭션으로 (플래그 + 태그 카운트/피드/스냅샷/답글 수 + 되돌리기 기록),
+      묶음 사이 PAUSE만큼 쉬어 쓰기 잠금을 오래 잡지 않는다. 키셋(id) 순회라 10만 건도 같은 비용.
+      대상이 이미 처리된 행은 건너뛰므로 중간에 실패해 재시도해도 안전.
+댓글의 spam은 delete와 같은 경로(comment_tree.soft_delete)로 화면에서 숨기고 is_spam 라벨만 더 붙인다
+      (댓글 조회 쿼리는 is_deleted만 보므로) — 대상은 아직 보이는 댓글 전부 (작성 시 자동 판정된 스팸 포함).
+되돌리기: moderation_undo에 남은 대상만 역순으로 원래 상태로 (그 사이 다른 경로로 바뀐 행은 그대로).
+"""
+
+import time
+import ipaddress
+from datetime import datetime
+
+import jobs
+import feeds
+import counters
+import snapshot
+import spamscore
+import fingerprint
+import comment_tree
+import tags as tag_index
+import queries as Q
+from db import get_conn, ph, run, fetchall, fetchone
+
+CHUNK = 500
+PAUSE = 0.05          # 묶음 사이 쉬는 시간 (초) — 요청 쪽 쓰기가 끼어들 틈
+MAX_RUNTIME = 120     # 한 번 실행 상한 (초), 넘으면 이어서 할 작업을 다시 적재 (가시성 타임아웃 300초 이내)
+PREVIEW = 50
+
+SELECTORS = {"ip": "ip_address", "prefix": "ip_prefix", "session": "session_token", "text": None}
+ACTIONS = {"delete": "is_deleted", "spam": "is_spam"}
+KINDS = {"post": "posts", "comment": "comments"}
+_COLUMNS = {
+    "post": "id, slug, category, created_at, is_spam, spam_auto, is_deleted",
+    "comment": "id, post_id, project_id, path, reply_count, is_spam, spam_auto, is_deleted",
+}
+
+
+def ip_prefix(ip: str):
+    """IPv4 /24 → "1.2.3", IPv6 /48 → "2001:db8:1" (앞 세 블록), 주소가 아니면 None"""
+    try:
+        addr = ipaddress.ip_address((ip or "").strip())
+    except ValueError:
+        return None
+    if addr.version == 4:
+        return str(addr).rsplit(".", 1)[0]
+    return ":".join(addr.exploded.split(":")[:3])
+
+
+def backfill(conn):
+    """ip_prefix가 없는 기존 글/댓글 — IP별로 한 번씩 (재실행 안전)"""
+    c = conn.cursor()
+    p = ph()
+    for table in KINDS.values():
+        c.execute(f"SELECT DISTINCT ip_address FROM {table} WHERE ip_prefix IS NULL AND ip_address IS NOT NULL")
+        for r in fetchall(c):
+            prefix = ip_prefix(r["ip_address"])
+            if prefix:
+                c.execute(f"UPDATE {table} SET ip_prefix={p} WHERE ip_address={p} AND ip_prefix IS NULL",
+                          (prefix, r["ip_address"]))
+    conn.commit()
+
+
+# ──────────────────────────────────────────────────────────
+# 대상 조회
+# ──────────────────────────────────────────────────────────
+def normalize_value(by: str, value: str) -> str:
+    value = (value or "").strip()
+    if by == "prefix" and value:
+        # "1.2.3.4", "1.2.3.0/24", "1.2.3" 모두 같은 접두어로
+        return ip_prefix(value.split("/")[0]) or ip_prefix(value + ".0") or value
+    return value
+
+
+def _similar_ids(c, value: str) -> dict:
+    """text 기준 — 종류별 id 목록 (오름차순)"""
+    kind, _, ref = value.partition(":")
+    if kind in KINDS and ref.isdigit():
+        # 지문과 같은 본문 (글은 제목 제외)
+        c.execute(f"SELECT content FROM {KINDS[kind]} WHERE id={ph()}", (int(ref),))
+        row = fetchone(c)
+        value = (row["content"] or "") if row else ""
+    found = {kind: [] for kind in KINDS}
+    for kind, target_id, _distance in fingerprint.find_similar(c, value):
+        if kind in found:
+            found[kind].append(target_id)
+    return {kind: sorted(ids) for kind, ids in found.items()}
+
+
+def _batches(c, kind: str, by: str, value, similar, columns: str, pending: str = None):
+    """대상 행을 CHUNK개씩 (id 오름차순) — pending: 아직 0인 플래그 컬럼만
+    ip/prefix/session은 (컬럼, id) 인덱스 키셋, text는 id 목록 조각
+    """
+    p = ph()
+    table = KINDS[kind]
+    cond = f" AND {pending}=0" if pending else ""
+    if by == "text":
+        ids = similar.get(kind, [])
+        for i in range(0, len(ids), CHUNK):
+            part = ids[i:i + CHUNK]
+            c.execute(f"SELECT {columns} FROM {table} WHERE id IN ({','.join([p] * len(part))}){cond} ORDER BY id",
+                      part)
+            rows = fetchall(c)
+            if rows:
+                yield rows
+        return
+    after = 0
+    while True:
+        c.execute(f"SELECT {columns} FROM {table} WHERE {SELECTORS[by]}={p} AND id>{p}{cond} ORDER BY id LIMIT {p}",
+                  (value, after, CHUNK))
+        rows = fetchall(c)
+        if not rows:
+            return
+        yield rows
+        after = rows[-1]["id"]
+
+
+def preview(by: str, value: str) -> dict:
+    """{kind: {"count", "spam", "deleted", "rows"}} — 화면 확인용 (최근 PREVIEW개)"""
+    value = normalize_value(by, value)
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    p = ph()
+    similar = _similar_ids(c, value) if by == "text" else None
+    out = {}
+    for kind, table in KINDS.items():
+        title = "title" if kind == "post" else "''"
+        columns = f"id, created_at, {title} AS title, content, author_name, ip_address, is_spam, is_deleted"
+        if by == "text":
+            rows = [r for batch in _batches(c, kind, by, value, similar, columns) for r in batch]
+            counts = {"cnt": len(rows), "spam": sum(r["is_spam"] for r in rows),
+                      "deleted": sum(r["is_deleted"] for r in rows)}
+            rows = rows[::-1][:PREVIEW]
+        else:
+            col = SELECTORS[by]
+            c.execute(f"SELECT COUNT(*) AS cnt, SUM(is_spam) AS spam, SUM(is_deleted) AS deleted "
+                      f"FROM {table} WHERE {col}={p}", (value,))
+            counts = fetchone(c)
+            c.execute(f"SELECT {columns} FROM {table} WHERE {col}={p} ORDER BY id DESC LIMIT {p}",
+                      (value, PREVIEW))
+            rows = fetchall(c)
+        out[kind] = {"count": counts["cnt"] or 0, "spam": counts["spam"] or 0,
+                     "deleted": counts["deleted"] or 0, "rows": rows}
+    conn.close()
+    return out
+
+
+# ──────────────────────────────────────────────────────────
+# 시작 / 되돌리기 요청
+# ──────────────────────────────────────────────────────────
+def start(by: str, value: str, action: str) -> int:
+    """일괄 처리 기록 + 작업 적재 → action id"""
+    if by not in SELECTORS or action not in ACTIONS:
+        raise ValueError(f"잘못된 기준/처리: {by}/{action}")
+    value = normalize_value(by, value)
+    if not value:
+        raise ValueError("값을 입력해주세요.")
+    p = ph()
+    now = datetime.now().isoformat()
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute(
+        f"INSERT INTO moderation_actions (selector, value, action, status, affected, created_at, updated_at) "
+        f"VALUES ({p},{p},{p},'queued',0,{p},{p}) RETURNING id",
+        (by, value, action, now, now),
+    )
+    action_id = fetchone(c)["id"]
+    jobs.enqueue("moderate", {"action_id": action_id}, dedupe_key=f"moderate:{action_id}", conn=conn)
+    conn.commit()
+    conn.close()
+    return action_id
+
+
+def undo(action_id: int) -> bool:
+    """완료된 처리만 되돌리기 적재"""
+    p = ph()
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute(f"UPDATE moderation_actions SET status='undoing', updated_at={p} WHERE id={p} AND status='done'",
+              (datetime.now().isoformat(), action_id))
+    ok = c.rowcount == 1
+    if ok:
+        jobs.enqueue("moderate_undo", {"action_id": action_id}, dedupe_key=f"moderate_undo:{action_id}", conn=conn)
+    conn.commit()
+    conn.close()
+    return ok
+
+
+def recent(limit: int = 20) -> list:
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    c.execute(f"SELECT id, selector, value, action, status, affected, created_at, updated_at "
+              f"FROM moderation_actions ORDER BY id DESC LIMIT {ph()}", (limit,))
+    rows = fetchall(c)
+    conn.close()
+    return rows
+
+
+def _set_status(c, action_id: int, status: str, affected: int = 0):
+    p = ph()
+    c.execute(f"UPDATE moderation_actions SET status={p}, affected=affected+{p}, updated_at={p} WHERE id={p}",
+              (status, affected, datetime.now().isoformat(), action_id))
+
+
+def _load(c, action_id: int):
+    c.execute(f"SELECT id, selector, value, action, status FROM moderation_actions WHERE id={ph()}", (action_id,))
+    return fetchone(c)
+
+
+def _continue(name: str, action_id: int, step: int):
+    """실행 시간 상한에 걸림 — 이어서 할 작업 적재 (처리된 행은 건너뛰므로 처음부터 다시 돌아도 됨)"""
+    jobs.enqueue(name, {"action_id": action_id, "step": step}, dedupe_key=f"{name}:{action_id}:{step}")
+
+
+# ──────────────────────────────────────────────────────────
+# 적용 (묶음마다 한 트랜잭션)
+# ──────────────────────────────────────────────────────────
+def _hide_post(c, row):
+    """노출 중이던 글이 숨겨짐 — post_delete / rescan_spam과 같은 부수 효과"""
+    tag_index.adjust_counts(c, tag_index.KIND_POST, row["id"], -1)
+    feeds.remove_post(c, row["slug"], row["category"])
+    counters.add(c, "posts", -1)
+    snapshot.mark(c, *snapshot.post_paths(row["slug"], row["category"]))
+
+
+def _show_post(c, row):
+    tag_index.adjust_counts(c, tag_index.KIND_POST, row["id"], 1)
+    feeds.add_post(c, row["id"], row["slug"], row["category"], row["created_at"])
+    counters.add(c, "posts", 1)
+    snapshot.mark(c, *snapshot.post_paths(row["slug"], row["category"]))
+
+
+def _pending(action: str, kind: str) -> str:
+    """처리 대상을 고르는 플래그 (아직 0인 행만) — 댓글은 스팸도 삭제 경로로 숨기므로 항상 is_deleted"""
+    return "is_deleted" if kind == "comment" else ACTIONS[action]
+
+
+def _apply_chunk(c, action, kind: str, rows):
+    p = ph()
+    field = ACTIONS[action["action"]]
+    ids = [r["id"] for r in rows]
+    if kind == "comment":
+        if field == "is_spam":
+            c.execute(f"UPDATE comments SET is_spam=1, spam_auto=0 WHERE id IN ({','.join([p] * len(ids))})", ids)
+        # 답글 수 전파 — id 오름차순이면 조상이 먼저 처리되어 각 행의 reply_count가 최신
+        for r in rows:
+            comment_tree.soft_delete(c, r)
+        counters.add(c, "comments", -len(rows))
+    else:
+        c.execute(f"UPDATE {KINDS[kind]} SET {field}=1 WHERE id IN ({','.join([p] * len(ids))})", ids)
+    if kind == "post":
+        for r in rows:
+            if not r["is_spam"] and not r["is_deleted"]:
+                _hide_post(c, r)
+    else:
+        for post_id, project_id in {(r["post_id"], r["project_id"]) for r in rows}:
+            snapshot.mark_comment(c, post_id, project_id)
+    c.executemany(f"INSERT INTO moderation_undo (action_id, kind, target_id, prev_spam, prev_auto) "
+                  f"VALUES ({p},{p},{p},{p},{p})",
+                  [(action["id"], kind, r["id"], r["is_spam"] or 0, r["spam_auto"] or 0) for r in rows])
+
+
+@jobs.job("moderate")
+def moderate(payload):
+    action_id = payload["action_id"]
+    started = time.time()
+    conn = get_conn()
+    c = conn.cursor()
+    action = _load(c, action_id)
+    if action is None or action["status"] not in ("queued", "running"):
+        conn.close()
+        return 0
+    _set_status(c, action_id, "running")
+    conn.commit()
+    by, value, field = action["selector"], action["value"], ACTIONS[action["action"]]
+    similar = _similar_ids(c, value) if by == "text" else None
+    total = 0
+    try:
+        for kind in KINDS:
+            for rows in _batches(c, kind, by, value, similar, _COLUMNS[kind],
+                                 pending=_pending(action["action"], kind)):
+                _apply_chunk(c, action, kind, rows)
+                _set_status(c, action_id, "running", len(rows))
+                conn.commit()
+                total += len(rows)
+                if time.time() - started > MAX_RUNTIME:
+                    _continue("moderate", action_id, payload.get("step", 0) + 1)
+                    return total
+                time.sleep(PAUSE)
+        _set_status(c, action_id, "done")
+        if field == "is_spam" and total:
+            spamscore.relabeled(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    return total
+
+
+# ──────────────────────────────────────────────────────────
+# 되돌리기 (기록의 역순)
+# ──────────────────────────────────────────────────────────
+def _undo_chunk(c, action, entries):
+    p = ph()
+    field = ACTIONS[action["action"]]
+    by_kind, prev = {}, {}
+    for e in entries:
+        by_kind.setdefault(e["kind"], []).append(e["target_id"])
+        prev[(e["kind"], e["target_id"])] = (e["prev_spam"] or 0, e["prev_auto"] or 0)
+    for kind, ids in by_kind.items():
+        marks = ",".join([p] * len(ids))
+        c.execute(f"SELECT {_COLUMNS[kind]} FROM {KINDS[kind]} WHERE id IN ({marks}) "
+                  f"AND {_pending(action['action'], kind)}=1", ids)
+        rows = sorted(fetchall(c), key=lambda r: r["id"], reverse=True)
+        if not rows:
+            continue
+        if kind == "comment":
+            for r in rows:
+                run(c, Q.COMMENT_BY_ID, (r["id"],))  # 뒤 댓글을 되돌리며 바뀐 reply_count를 다시 읽음
+                comment_tree.restore(c, fetchone(c))
+            counters.add(c, "comments", len(rows))
+            if field == "is_spam":
+                # 작성 시 자동 판정으로 이미 스팸이던 댓글은 그 라벨 그대로
+                c.executemany(f"UPDATE comments SET is_spam={p}, spam_auto={p} WHERE id={p}",
+                              [prev[("comment", r["id"])] + (r["id"],) for r in rows])
+        else:
+            c.execute(f"UPDATE {KINDS[kind]} SET {field}=0 WHERE id IN ({','.join([p] * len(rows))})",
+                      [r["id"] for r in rows])
+        if kind == "post":
+            for r in rows:
+                other = r["is_deleted"] if field == "is_spam" else r["is_spam"]
+                if not other:
+                    _show_post(c, r)
+        else:
+            for post_id, project_id in {(r["post_id"], r["project_id"]) for r in rows}:
+                snapshot.mark_comment(c, post_id, project_id)
+    c.execute(f"DELETE FROM moderation_undo WHERE id IN ({','.join([p] * len(entries))})",
+              [e["id"] for e in entries])
+    return len(entries)
+
+
+@jobs.job("moderate_undo")
+def moderate_undo(payload):
+    action_id = payload["action_id"]
+    started = time.time()
+    p = ph()
+    conn = get_conn()
+    c = conn.cursor()
+    action = _load(c, action_id)
+    if action is None or action["status"] != "undoing":
+        conn.close()
+        return 0
+    total = 0
+    try:
+        while True:
+            if time.time() - started > MAX_RUNTIME:
+                _continue("moderate_undo", action_id, payload.get("step", 0) + 1)
+                return total
+            c.execute(f"SELECT id, kind, target_id, prev_spam, prev_auto FROM moderation_undo WHERE action_id={p} "
+                      f"ORDER BY id DESC LIMIT {p}", (action_id, CHUNK))
+            entries = fetchall(c)
+            if not entries:
+                break
+            total += _undo_chunk(c, action, entries)
+            conn.commit()
+            time.sleep(PAUSE)
+        _set_status(c, action_id, "undone")
+        if action["action"] == "spam" and total:
+            spamscore.relabeled(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    return total
@@ -0,0 +1,288 @@
+"""VibeCoder AI 뉴스 보관소 — RSS/Atom 수집 결과를 news_items에 누적
+  수집     : fetch_news 작업 (NEWS_CRON, 기본 20분마다) → 피드당 최근 ITEMS_PER_FEED개
+  중복 제거: 정규화 URL 해시 (UNIQUE) + 최근 TITLE_WINDOW 안의 제목 유사도 (단어 집합 Jaccard)
+            → 여러 매체에 재배포된 같은 기사는 먼저 수집된 하나만 남는다
+  조회     : published_at DESC, id DESC 키셋 페이지네이션 (cursor = "published_at|id")
+            첫 페이지(홈 / /trends / /api/ai-news)는 HOT_TTL 동안 메모리에서
+            — 재시작 직후에는 warmcache 스냅샷(WARM_MAX_AGE 이내)에서 먼저 채운다
+보관소가 비어 있으면 (새 DB) 첫 요청이 요청 데드라인 안에서 한 번 직접 수집한다.
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+import urllib.request
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from xml.etree import ElementTree
+
+import jobs
+import deadline
+import warmcache
+from db import get_conn, ph, fetchall
+
+RSS_FEEDS = [
+    ("TechCrunch AI",   "https://techcrunch.com/category/artificial-intelligence/feed/"),
+    ("The Verge AI",    "https://www.theverge.com/ai-artificial-intelligence/rss/index.xml"),
+    ("VentureBeat AI",  "https://venturebeat.com/category/ai/feed/"),
+    ("MIT Tech Review", "https://www.technologyreview.com/feed/"),
+    ("AI News",         "https://www.artificialintelligence-news.com/feed/"),
+]
+
+ITEMS_PER_FEED = 20
+TITLE_MAX = 120
+HOT_SIZE = 18            # 첫 페이지 (홈 카드 9개 + 소스 필터 여유)
+PAGE_SIZE = 18
+MAX_PAGE_SIZE = 50
+HOT_TTL = 60             # 첫 페이지 메모리 캐시 (초)
+WARM_MAX_AGE = 1800      # 이보다 오래된 첫 페이지 스냅샷은 복원 안 함 (초)
+EMPTY_RETRY = 60         # 보관소가 비어 있을 때 직접 수집 재시도 간격 (초)
+TITLE_WINDOW = timedelta(days=3)
+TITLE_SIMILARITY = 0.8
+MIN_TITLE_WORDS = 4      # 이보다 짧은 제목은 유사도 비교 안 함 (오탐 방지)
+
+# 같은 기사 URL에 붙는 추적용 파라미터
+_TRACKING = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ncid|cmpid|guccounter|guce_\w+)$", re.I)
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+_hot = {"items": None, "at": 0.0}
+_hot_lock = threading.Lock()
+_fetch_lock = threading.Lock()
+_last_inline = 0.0
+
+
+# ──────────────────────────────────────────────────────────
+# 정규화
+# ──────────────────────────────────────────────────────────
+def normalize_url(url: str) -> str:
+    """http/https·www·기본 포트·끝 슬래시·fragment·추적 파라미터 차이를 무시한 URL"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/+$", "", parts.path) or "/"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _TRACKING.match(k)))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()[:20]
+
+
+def title_words(title: str) -> frozenset:
+    return frozenset(re.sub(r"[^\w]+", " ", (title or "").lower(), flags=re.UNICODE).split())
+
+
+def similar_titles(a: frozenset, b: frozenset) -> bool:
+    if len(a) < MIN_TITLE_WORDS or len(b) < MIN_TITLE_WORDS:
+        return a == b and bool(a)
+    return len(a & b) / len(a | b) >= TITLE_SIMILARITY
+
+
+# ──────────────────────────────────────────────────────────
+# 수집
+# ──────────────────────────────────────────────────────────
+def _local_naive(dt: datetime) -> str:
+    """저장 형식 — 다른 테이블과 같은 서버 로컬 naive ISO"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt.isoformat(timespec="seconds")
+
+
+def _parse_time(rss_date: str = "", iso_date: str = "") -> str:
+    try:
+        if rss_date:
+            return _local_naive(parsedate_to_datetime(rss_date))
+        if iso_date:
+            return _local_naive(datetime.fromisoformat(iso_date.strip().replace("Z", "+00:00")))
+    except (TypeError, ValueError, IndexError):
+        pass
+    return _local_naive(datetime.now())
+
+
+def _parse_feed(src: str, body: bytes) -> list:
+    root = ElementTree.fromstring(body)
+    items = []
+    for item in root.findall(".//item")[:ITEMS_PER_FEED]:
+        title = re.sub(r"<[^>]+>", "", item.findtext("title", ""))
+        link = item.findtext("link", "") or item.findtext("guid", "")
+        items.append((title, link, _parse_time(rss_date=item.findtext("pubDate", ""))))
+    for entry in root.findall(f"{_ATOM}entry")[:ITEMS_PER_FEED]:  # Atom 피드 (The Verge 등)
+        title = re.sub(r"<[^>]+>", "", entry.findtext(f"{_ATOM}title", ""))
+        link_el = entry.find(f"{_ATOM}link[@rel='alternate']")
+        if link_el is None:
+            link_el = entry.find(f"{_ATOM}link")
+        link = link_el.get("href", "") if link_el is not None else ""
+        when = entry.findtext(f"{_ATOM}published", "") or entry.findtext(f"{_ATOM}updated", "")
+        items.append((title, link, _parse_time(iso_date=when)))
+    now = _local_naive(datetime.now())
+    # 미래 날짜는 지금으로 (맨 위 고정 방지), 링크는 http(s)만
+    return [{"source": src, "title": title.strip()[:TITLE_MAX], "url": link.strip(), "published_at": min(when, now)}
+            for title, link, when in items if title.strip() and re.match(r"https?://", link.strip())]
+
+
+def fetch_feeds():
+    """(항목, 전체 피드 완료 여부) — 요청 안에서 불리면 데드라인이 남은 만큼만 받아옴"""
+    items = []
+    for src, url in RSS_FEEDS:
+        if deadline.expired():
+            return items, False
+        try:
+            req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+            with deadline.stage("http"), urllib.request.urlopen(req, timeout=deadline.timeout(8)) as r:
+                items.extend(_parse_feed(src, r.read()))
+        except deadline.DeadlineExceeded:
+            return items, False
+        except Exception:
+            pass  # 피드 하나 실패는 건너뜀
+    return items, True
+
+
+def store(conn, items) -> int:
+    """중복을 걸러 저장 (커밋 포함) → 새로 저장한 개수"""
+    c = conn.cursor()
+    p = ph()
+    cutoff = _local_naive(datetime.now() - TITLE_WINDOW)
+    c.execute(f"SELECT title FROM news_items WHERE published_at>={p} ORDER BY published_at DESC LIMIT 2000",
+              (cutoff,))
+    recent = [title_words(r["title"]) for r in fetchall(c)]
+    now = _local_naive(datetime.now())
+    added = 0
+    # 오래된 기사부터 — 같은 기사가 여러 곳에 있으면 먼저 낸 곳이 남는다
+    for item in sorted(items, key=lambda i: i["published_at"]):
+        words = title_words(item["title"])
+        if item["published_at"] >= cutoff and any(similar_titles(words, w) for w in recent):
+            continue
+        c.execute(
+            f"INSERT INTO news_items (url_hash, url, title, source, published_at, fetched_at) "
+            f"VALUES ({p},{p},{p},{p},{p},{p}) ON CONFLICT (url_hash) DO NOTHING",
+            (url_hash(item["url"]), item["url"], item["title"], item["source"], item["published_at"], now),
+        )
+        if c.rowcount:
+            added += 1
+            recent.append(words)
+    conn.commit()
+    return added
+
+
+@jobs.job("fetch_news")
+def fetch_news(payload=None):
+    items, _complete = fetch_feeds()
+    conn = get_conn()
+    try:
+        added = store(conn, items)
+    finally:
+        conn.close()
+    if added:
+        invalidate()
+    return added
+
+
+jobs.schedule("fetch_news", os.environ.get("NEWS_CRON", "*/20 * * * *"))
+
+
+# ──────────────────────────────────────────────────────────
+# 조회
+# ──────────────────────────────────────────────────────────
+def _ago(published_at: str) -> str:
+    try:
+        diff = datetime.now() - datetime.fromisoformat(published_at)
+    except (TypeError, ValueError):
+        return "최근"
+    h = int(diff.total_seconds() / 3600)
+    if h < 1:
+        return "방금 전"
+    if h < 24:
+        return f"{h}시간 전"
+    return f"{diff.days}일 전"
+
+
+def cursor_for(item: dict) -> str:
+    return f"{item['published_at']}|{item['id']}"
+
+
+def _parse_cursor(cursor: str):
+    when, _, item_id = (cursor or "").rpartition("|")
+    if not when or not item_id.isdigit():
+        return None
+    return when, int(item_id)
+
+
+def _query(before, source, limit: int) -> list:
+    p = ph()
+    where, params = [], []
+    if source:
+        where.append(f"source={p}")
+        params.append(source)
+    if before:
+        where.append(f"(published_at, id) < ({p}, {p})")
+        params.extend(before)
+    sql = ("SELECT id, source, title, url, published_at FROM news_items"
+           + (" WHERE " + " AND ".join(where) if where else "")
+           + f" ORDER BY published_at DESC, id DESC LIMIT {p}")
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    c.execute(sql, (*params, limit))
+    rows = fetchall(c)
+    conn.close()
+    return [{"id": r["id"], "source": r["source"], "title": r["title"], "url": r["url"],
+             "published_at": r["published_at"], "time": _ago(r["published_at"])} for r in rows]
+
+
+def page(cursor: str = None, source: str = None, limit: int = PAGE_SIZE):
+    """(항목, 다음 cursor 또는 None) — 키셋 페이지네이션 (OFFSET 없음)"""
+    limit = max(1, min(MAX_PAGE_SIZE, int(limit or PAGE_SIZE)))
+    before = _parse_cursor(cursor)
+    if before is None and not source and limit <= HOT_SIZE:
+        items = latest()[:limit]
+    else:
+        items = _query(before, source, limit)
+    return items, (cursor_for(items[-1]) if len(items) == limit else None)
+
+
+def latest() -> list:
+    """첫 페이지 (HOT_SIZE개) — 메모리 캐시, 보관소가 비어 있으면 한 번 직접 수집"""
+    global _last_inline
+    now = time.time()
+    if _hot["items"] is None:
+        warmcache.restore("news")
+    with _hot_lock:
+        if _hot["items"] is not None and now - _hot["at"] < HOT_TTL:
+            return _hot["items"]
+    items = _query(None, None, HOT_SIZE)
+    if not items and now - _last_inline > EMPTY_RETRY and _fetch_lock.acquire(blocking=False):
+        try:
+            _last_inline = now
+            fetch_news()
+            items = _query(None, None, HOT_SIZE)
+        finally:
+            _fetch_lock.release()
+    with _hot_lock:
+        _hot.update(items=items, at=now)
+    return items
+
+
+def invalidate():
+    with _hot_lock:
+        _hot.update(items=None, at=0.0)
+
+
+def _warm_dump():
+    return _hot["items"] or None
+
+
+def _warm_load(items):
+    for item in items:
+        item["time"] = _ago(item["published_at"])
+    with _hot_lock:
+        if _hot["items"] is None:
+            _hot.update(items=items, at=time.time())
+
+
+warmcache.register("news", _warm_dump, _warm_load, WARM_MAX_AGE)
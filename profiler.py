@@ -0,0 +1,211 @@
+"""VibeCoder 샘플링 프로파일러 — 운영 중 파이썬 시간이 어디서 쓰이는지 확인
+sys._current_frames()로 스레드 스택을 일정 주기로 읽기만 하므로 (트레이스 훅 없음)
+대상 코드의 속도에 영향이 거의 없다. 샘플러는 별도 데몬 스레드 하나.
+  전체 샘플링  : /admin/profile?seconds=10&hz=100 — 모든 스레드, N초 (동시에 1개만)
+  요청 샘플링  : X-VC-Profile: <ADMIN_KEY> 헤더가 붙은 요청 하나만 샘플링 → 최근 결과 보관
+출력: collapsed stack ("스레드;함수 (파일:줄);... 횟수", flamegraph.pl / speedscope 입력)
+     또는 speedscope JSON (https://www.speedscope.app 에 바로 열기)
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter, deque
+
+DEFAULT_HZ = 100
+MAX_HZ = 1000
+MAX_SECONDS = 20         # 관리자 요청 예산(30s) 안에 끝나도록
+MAX_REQUEST_SECONDS = 30  # 요청 샘플링이 멈추지 않는 요청을 계속 따라가지 않도록
+MAX_DEPTH = 128
+MAX_REQUEST_PROFILES = 2  # 동시에 샘플링하는 요청 수 상한
+RECENT_KEEP = 20          # 보관하는 요청 프로파일 수
+
+_BASE = os.path.dirname(os.path.abspath(__file__))
+_global_lock = threading.Lock()
+_request_slots = threading.BoundedSemaphore(MAX_REQUEST_PROFILES)
+_recent = deque(maxlen=RECENT_KEEP)
+_recent_lock = threading.Lock()
+_frame_names = {}
+
+
+class Busy(Exception):
+    """이미 다른 전체 샘플링이 진행 중"""
+
+
+def _frame_name(code) -> str:
+    name = _frame_names.get(code)
+    if name is None:
+        path = code.co_filename
+        if path.startswith(_BASE):
+            path = os.path.relpath(path, _BASE)
+        else:
+            path = os.path.basename(path)
+        # collapsed 형식 구분자(;)와 공백 뒤 숫자 혼동 방지
+        name = f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+        _frame_names[code] = name
+    return name
+
+
+def _stack(frame) -> tuple:
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    names.reverse()
+    return tuple(names)
+
+
+class Profile:
+    """샘플 집계 — stacks: (루트→말단 프레임 이름 튜플) → 횟수"""
+
+    def __init__(self, name: str, hz: int):
+        self.name = name
+        self.hz = hz
+        self.started = time.time()
+        self.duration = 0.0
+        self.samples = 0
+        self.stacks = Counter()
+
+    def collapsed(self) -> str:
+        return "".join(f"{';'.join(stack)} {n}\n" for stack, n in self.stacks.most_common())
+
+    def speedscope(self) -> dict:
+        frames, index = [], {}
+        samples, weights = [], []
+        ms = 1000.0 / self.hz
+        for stack, n in self.stacks.most_common():
+            ids = []
+            for name in stack:
+                if name not in index:
+                    index[name] = len(frames)
+                    func, _, loc = name.rpartition(" (")
+                    file, _, line = loc.rstrip(")").rpartition(":")
+                    frame = {"name": func or name}
+                    if file:
+                        frame.update(file=file, line=int(line) if line.isdigit() else 0)
+                    frames.append(frame)
+                ids.append(index[name])
+            samples.append(ids)
+            weights.append(n * ms)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled", "name": self.name, "unit": "milliseconds",
+                "startValue": 0, "endValue": sum(weights), "samples": samples, "weights": weights,
+            }],
+            "name": self.name,
+            "exporter": "vibecoder-profiler",
+        }
+
+    def summary(self) -> dict:
+        return {"name": self.name, "started": self.started, "duration": round(self.duration, 3),
+                "hz": self.hz, "samples": self.samples}
+
+
+def _sample_loop(profile: Profile, stop: threading.Event, limit: float, only=None, skip=()):
+    """stop이 설정되거나 limit초가 지날 때까지 주기적으로 스택 수집
+    only: 이 스레드만 (요청 샘플링, 스레드 이름 없이), None이면 skip을 뺀 모든 스레드 (스레드 이름이 루트)
+    """
+    interval = 1.0 / profile.hz
+    skip = set(skip) | {threading.get_ident()}
+    t0 = time.perf_counter()
+    next_at = t0
+    while not stop.is_set() and time.perf_counter() - t0 < limit:
+        if only is not None:
+            frame = sys._current_frames().get(only)
+            if frame is not None:
+                profile.stacks[_stack(frame)] += 1
+        else:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident not in skip:
+                    profile.stacks[(names.get(ident, f"thread-{ident}"),) + _stack(frame)] += 1
+        profile.samples += 1
+        next_at += interval
+        # 밀리면 몰아서 찍지 않고 다음 주기로
+        delay = next_at - time.perf_counter()
+        if delay < 0:
+            next_at = time.perf_counter()
+            delay = 0
+        stop.wait(delay)
+    profile.duration = time.perf_counter() - t0
+
+
+def _clamp_hz(hz) -> int:
+    return max(1, min(MAX_HZ, int(hz or DEFAULT_HZ)))
+
+
+def sample_all(seconds: float, hz: int = DEFAULT_HZ) -> Profile:
+    """호출 스레드를 제외한 모든 스레드를 seconds 동안 샘플링 (호출 스레드는 대기)"""
+    seconds = max(0.1, min(MAX_SECONDS, float(seconds)))
+    hz = _clamp_hz(hz)
+    if not _global_lock.acquire(blocking=False):
+        raise Busy("다른 프로파일링이 진행 중입니다")
+    try:
+        profile = Profile(f"all threads {seconds:g}s @ {hz}Hz", hz)
+        stop = threading.Event()
+        sampler = threading.Thread(target=_sample_loop, args=(profile, stop, seconds, None, (threading.get_ident(),)),
+                                   name="vc-profiler", daemon=True)
+        sampler.start()
+        sampler.join()
+        return profile
+    finally:
+        _global_lock.release()
+
+
+# ──────────────────────────────────────────────────────────
+# 요청 단위 샘플링 (X-VC-Profile 헤더)
+# ──────────────────────────────────────────────────────────
+class RequestSampler:
+    """현재 스레드(요청 처리 스레드)만 샘플링 — start()/finish()"""
+
+    def __init__(self, route: str, hz: int = DEFAULT_HZ):
+        self.profile = Profile(route, _clamp_hz(hz))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> bool:
+        """동시 요청 샘플링 상한을 넘으면 False (요청은 그대로 처리)"""
+        if not _request_slots.acquire(blocking=False):
+            return False
+        target = threading.get_ident()
+
+        def loop():
+            try:
+                _sample_loop(self.profile, self._stop, MAX_REQUEST_SECONDS, only=target)
+            finally:
+                _request_slots.release()
+
+        self._thread = threading.Thread(target=loop, name="vc-profiler-req", daemon=True)
+        self._thread.start()
+        return True
+
+    def finish(self, status: int = 0):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self.profile.name = f"{self.profile.name} [{status}]"
+        with _recent_lock:
+            _recent.appendleft(self.profile)
+
+
+def recent() -> list:
+    """최근 요청 프로파일 요약 (인덱스 0이 가장 최근)"""
+    with _recent_lock:
+        return [p.summary() for p in _recent]
+
+
+def recent_profile(i: int):
+    with _recent_lock:
+        return _recent[i] if 0 <= i < len(_recent) else None
+
+
+def render(profile: Profile, fmt: str):
+    """(본문, Content-Type) — fmt: collapsed / speedscope"""
+    if fmt == "speedscope":
+        return json.dumps(profile.speedscope(), ensure_ascii=False), "application/json"
+    return profile.collapsed(), "text/plain; charset=utf-8"
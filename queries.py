@@ -0,0 +1,192 @@
+"""VibeCoder 쿼리 목록 — app.py가 실행하는 모든 문장을 한 곳에 선언
+placeholder는 ? 로 작성 (db.query가 import 시점에 백엔드용으로 변환)
+"""
+
+from db import query
+
+# ── 컬럼 목록 ──
+# 목록/상세 화면은 템플릿이 쓰는 컬럼만 조회 (비밀번호 해시, IP, 세션 토큰, 불필요한 본문 제외)
+PROJECT_CARD = "id, title, slug, description, tech_stack, thumbnail, author, view_count, likes, created_at"
+PROJECT_DETAIL = PROJECT_CARD + ", demo_url, github_url"
+POST_ROW = ("id, title, slug, category, author_name, view_count, likes, created_at, "
+            "excerpt, reading_time, has_code")
+POST_DETAIL = POST_ROW + ", content, content_html, render_version, tags, session_token, is_spam"
+COMMENT_ROW = ("id, parent_id, path, depth, reply_count, is_deleted, author_name, content, content_html, "
+               "render_version, session_token, created_at")
+
+
+def cols(columns: str, alias: str) -> str:
+    """컬럼 목록에 테이블 별칭 붙이기 (조인 쿼리용)"""
+    return ", ".join(f"{alias}.{c.strip()}" for c in columns.split(","))
+
+
+# ── 속도 제한 ──
+RATE_LIMIT_COUNT = query("rate_limit_count", """
+    SELECT COUNT(*) as cnt FROM rate_limits WHERE ip_address=? AND action=? AND created_at>?
+""")
+RATE_LIMIT_INSERT = query("rate_limit_insert", """
+    INSERT INTO rate_limits (ip_address, action, created_at) VALUES (?,?,?)
+""")
+
+# ── 프로젝트 ──
+PROJECTS_FEATURED = query("projects_featured", f"""
+    SELECT {PROJECT_CARD} FROM projects WHERE is_featured=1 ORDER BY created_at DESC LIMIT 6
+""")
+PROJECTS_PAGE = query("projects_page", f"""
+    SELECT {PROJECT_CARD} FROM projects ORDER BY is_featured DESC, created_at DESC LIMIT ? OFFSET ?
+""")
+PROJECTS_PAGE_BY_TECH = query("projects_page_by_tech", f"""
+    SELECT {cols(PROJECT_CARD, "pr")} FROM projects pr
+    JOIN project_tags pt ON pt.project_id = pr.id
+    JOIN tags t ON t.id = pt.tag_id
+    WHERE t.kind=? AND t.norm=?
+    ORDER BY pr.is_featured DESC, pr.created_at DESC LIMIT ? OFFSET ?
+""")
+PROJECTS_API = query("projects_api", """
+    SELECT id, title, slug, description, tech_stack, demo_url, author, view_count, likes, created_at
+    FROM projects ORDER BY created_at DESC LIMIT 20
+""")
+PROJECT_BY_SLUG = query("project_by_slug", f"SELECT {PROJECT_DETAIL} FROM projects WHERE slug=?")
+PROJECT_SLUGS = query("project_slugs", "SELECT slug FROM projects ORDER BY id")
+PROJECT_ID_BY_SLUG = query("project_id_by_slug", "SELECT id FROM projects WHERE slug=?")
+PROJECT_VIEW = query("project_view", "UPDATE projects SET view_count=view_count+1 WHERE slug=?")
+PROJECT_LIKE = query("project_like", "UPDATE projects SET likes=likes+1 WHERE slug=?")
+PROJECT_LIKES = query("project_likes", "SELECT likes FROM projects WHERE slug=?")
+PROJECT_INSERT = query("project_insert", """
+    INSERT INTO projects
+        (created_at, title, slug, description, tech_stack,
+         demo_url, github_url, thumbnail, author, is_featured, ip_address)
+    VALUES (?,?,?,?,?,?,?,?,?,0,?)
+""")
+
+# ── 라운지 게시글 ──
+POSTS_LATEST = query("posts_latest", f"""
+    SELECT {POST_ROW} FROM posts WHERE is_spam=0 AND is_deleted=0 ORDER BY created_at DESC LIMIT 5
+""")
+POSTS_INFO_LATEST = query("posts_info_latest", f"""
+    SELECT {POST_ROW} FROM posts WHERE category='info' AND is_spam=0 AND is_deleted=0
+    ORDER BY created_at DESC LIMIT 3
+""")
+POSTS_INFO_TRENDS = query("posts_info_trends", f"""
+    SELECT {POST_ROW} FROM posts WHERE category='info' AND is_spam=0 AND is_deleted=0
+    ORDER BY created_at DESC LIMIT 20
+""")
+POSTS_PAGE = query("posts_page", f"""
+    SELECT {POST_ROW} FROM posts WHERE is_spam=0 AND is_deleted=0 ORDER BY created_at DESC LIMIT ? OFFSET ?
+""")
+POSTS_PAGE_BY_CATEGORY = query("posts_page_by_category", f"""
+    SELECT {POST_ROW} FROM posts WHERE is_spam=0 AND is_deleted=0 AND category=?
+    ORDER BY created_at DESC LIMIT ? OFFSET ?
+""")
+POSTS_PAGE_BY_TAG = query("posts_page_by_tag", f"""
+    SELECT {cols(POST_ROW, "po")} FROM posts po
+    JOIN post_tags pt ON pt.post_id = po.id
+    JOIN tags t ON t.id = pt.tag_id
+    WHERE t.kind=? AND t.norm=? AND po.is_spam=0 AND po.is_deleted=0
+    ORDER BY po.created_at DESC LIMIT ? OFFSET ?
+""")
+POSTS_PAGE_BY_TAG_CATEGORY = query("posts_page_by_tag_category", f"""
+    SELECT {cols(POST_ROW, "po")} FROM posts po
+    JOIN post_tags pt ON pt.post_id = po.id
+    JOIN tags t ON t.id = pt.tag_id
+    WHERE t.kind=? AND t.norm=? AND po.is_spam=0 AND po.is_deleted=0 AND po.category=?
+    ORDER BY po.created_at DESC LIMIT ? OFFSET ?
+""")
+POSTS_COUNT_BY_CATEGORY = query("posts_count_by_category", """
+    SELECT COUNT(*) as cnt FROM posts WHERE is_spam=0 AND is_deleted=0 AND category=?
+""")
+TAG_USE_COUNT = query("tag_use_count", "SELECT use_count as cnt FROM tags WHERE kind=? AND norm=?")
+POSTS_COUNT_BY_TAG_CATEGORY = query("posts_count_by_tag_category", """
+    SELECT COUNT(*) as cnt FROM posts po
+    JOIN post_tags pt ON pt.post_id = po.id
+    JOIN tags t ON t.id = pt.tag_id
+    WHERE t.kind=? AND t.norm=? AND po.is_spam=0 AND po.is_deleted=0 AND po.category=?
+""")
+POST_BY_SLUG = query("post_by_slug", """
+    SELECT id, category, session_token, password_hash, is_spam, is_deleted FROM posts WHERE slug=?
+""")
+POST_VISIBLE_BY_SLUG = query("post_visible_by_slug", f"SELECT {POST_DETAIL} FROM posts WHERE slug=? AND is_deleted=0")
+POST_SLUGS_INFO = query("post_slugs_info", """
+    SELECT slug FROM posts WHERE category='info' AND is_spam=0 AND is_deleted=0 ORDER BY id
+""")
+POST_ID_BY_SLUG = query("post_id_by_slug", "SELECT id FROM posts WHERE slug=?")
+POST_VIEW = query("post_view", "UPDATE posts SET view_count=view_count+1 WHERE slug=?")
+POST_LIKE = query("post_like", "UPDATE posts SET likes=likes+1 WHERE slug=?")
+POST_LIKES = query("post_likes", "SELECT likes FROM posts WHERE slug=?")
+POST_SOFT_DELETE = query("post_soft_delete", "UPDATE posts SET is_deleted=1 WHERE slug=?")
+POST_MARK_SPAM = query("post_mark_spam", "UPDATE posts SET is_spam=1 WHERE id=?")
+POST_INSERT = query("post_insert", """
+    INSERT INTO posts
+        (created_at, title, slug, content, category, author_name,
+         password_hash, session_token, ip_address, ip_prefix, tags, is_spam, spam_auto,
+         excerpt, word_count, reading_time, has_code, content_html, render_version)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+""")
+POSTS_RESCAN = query("posts_rescan", """
+    SELECT id, slug, category, title, content FROM posts WHERE is_spam=0 AND is_deleted=0 AND created_at>?
+""")
+
+# ── 댓글 ──
+# 답글 트리 (comment_tree.py) — path 순 = 화면 순서, 답글이 남은 삭제 댓글은 자리만 표시
+COMMENTS_FOR_POST = query("comments_for_post", f"""
+    SELECT {COMMENT_ROW} FROM comments
+    WHERE post_id=? AND is_approved=1 AND (is_deleted=0 OR reply_count>0) AND depth<? ORDER BY path
+""")
+COMMENTS_FOR_PROJECT = query("comments_for_project", f"""
+    SELECT {COMMENT_ROW} FROM comments
+    WHERE project_id=? AND is_approved=1 AND (is_deleted=0 OR reply_count>0) AND depth<? ORDER BY path
+""")
+COMMENT_SUBTREE = query("comment_subtree", f"""
+    SELECT {COMMENT_ROW} FROM comments
+    WHERE path>? AND path<? AND is_approved=1 AND (is_deleted=0 OR reply_count>0) ORDER BY path
+""")
+COMMENTS_COUNT_FOR_POST = query("comments_count_for_post", """
+    SELECT COUNT(*) as cnt FROM comments WHERE post_id=? AND is_approved=1 AND is_deleted=0
+""")
+COMMENTS_COUNT_FOR_PROJECT = query("comments_count_for_project", """
+    SELECT COUNT(*) as cnt FROM comments WHERE project_id=? AND is_approved=1 AND is_deleted=0
+""")
+COMMENT_PARENT = query("comment_parent", """
+    SELECT id, post_id, project_id, path, depth, reply_count, is_deleted FROM comments WHERE id=?
+""")
+COMMENT_SET_PATH = query("comment_set_path", "UPDATE comments SET parent_id=?, path=?, depth=? WHERE id=?")
+COMMENT_REPLY_COUNT = query("comment_reply_count", "UPDATE comments SET reply_count=reply_count+? WHERE id=?")
+COMMENT_TREE_STATE = query("comment_tree_state", "SELECT is_deleted, reply_count FROM comments WHERE id=?")
+COMMENTS_WITHOUT_PATH = query("comments_without_path", "SELECT id FROM comments WHERE path IS NULL ORDER BY id LIMIT ?")
+COMMENT_BY_ID = query("comment_by_id", """
+    SELECT id, post_id, project_id, session_token, password_hash, path, reply_count, is_deleted
+    FROM comments WHERE id=?
+""")
+# 스냅샷 페이지의 개인별/자주 바뀌는 값 (/api/live)
+PROJECT_LIVE = query("project_live", "SELECT id, likes, view_count FROM projects WHERE slug=?")
+POST_LIVE = query("post_live", "SELECT id, likes, view_count, session_token FROM posts WHERE slug=? AND is_deleted=0")
+COMMENTS_MINE_FOR_PROJECT = query("comments_mine_for_project", """
+    SELECT id FROM comments WHERE project_id=? AND session_token=? AND is_deleted=0
+""")
+COMMENTS_MINE_FOR_POST = query("comments_mine_for_post", """
+    SELECT id FROM comments WHERE post_id=? AND session_token=? AND is_deleted=0
+""")
+COMMENT_SOFT_DELETE = query("comment_soft_delete", "UPDATE comments SET is_deleted=1 WHERE id=?")
+COMMENT_RESTORE = query("comment_restore", "UPDATE comments SET is_deleted=0 WHERE id=?")
+COMMENT_MARK_SPAM = query("comment_mark_spam", "UPDATE comments SET is_spam=1 WHERE id=?")
+COMMENT_INSERT = query("comment_insert", """
+    INSERT INTO comments
+        (created_at, post_id, project_id, author_name, password_hash,
+         session_token, ip_address, ip_prefix, content, is_spam, spam_auto, content_html, render_version)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?) RETURNING id
+""")
+COMMENTS_RESCAN = query("comments_rescan", """
+    SELECT id, content FROM comments WHERE is_spam=0 AND is_deleted=0 AND created_at>?
+""")
+
+# ── 관리자 통계 ──
+PAGEVIEWS_IN_RANGE = query("pageviews_in_range", """
+    SELECT COUNT(*) as cnt FROM page_views WHERE created_at>=? AND created_at<?
+""")
+VISITORS_IN_RANGE = query("visitors_in_range", """
+    SELECT COUNT(DISTINCT ip_hash) as cnt FROM page_views WHERE created_at>=? AND created_at<?
+""")
+PAGEVIEWS_DAILY = query("pageviews_daily", """
+    SELECT substr(created_at, 1, 10) as day, COUNT(*) as cnt FROM page_views
+    WHERE created_at>=? GROUP BY substr(created_at, 1, 10)
+""")
@@ -0,0 +1,222 @@
+"""VibeCoder 본문 렌더러 — 게시글/댓글 마크다운 → 안전한 HTML
+쓰기 시점(lounge_write, 댓글, 트렌드 자동 게시)에 content_html로 저장하고,
+상세 화면은 저장된 HTML을 그대로 출력한다 (조회마다 렌더링하지 않음).
+RENDERER_VERSION을 올리면 render_content 작업이 기존 행을 다시 렌더링.
+
+지원 문법 (그 외는 모두 이스케이프된 텍스트):
+  # 제목, **굵게**, *기울임*, ~~취소선~~, `코드`, ```언어 코드 블록```,
+  - / 1. 목록, > 인용, ---, [텍스트](http/https 링크), 맨 URL 자동 링크
+원문은 먼저 통째로 이스케이프하고 위 태그만 직접 생성하므로 사용자 HTML은 통과하지 않는다.
+"""
+
+import re
+
+from markupsafe import escape
+
+import jobs
+from db import get_conn, ph, fetchall
+
+try:
+    from pygments import highlight
+    from pygments.lexers import get_lexer_by_name
+    from pygments.formatters import HtmlFormatter
+    from pygments.util import ClassNotFound
+except ImportError:  # 하이라이트 없이 <pre><code>만 출력
+    highlight = None
+
+RENDERER_VERSION = 2
+BATCH = 500
+LINK_REL = "nofollow ugc noopener"
+
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})\s*([\w+#.-]*)")
+_HEADING_RE = re.compile(r"^\s{0,3}(#{1,6})\s+(.+?)\s*#*\s*$")
+_HR_RE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+_QUOTE_RE = re.compile(r"^\s{0,3}>\s?(.*)$")
+_ITEM_RE = re.compile(r"^\s{0,3}([-*+]|\d{1,9}[.)])\s+(.*)$")
+
+_CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1")
+# 이스케이프된 텍스트에 적용 — URL 안의 &는 &amp;만 허용, 나머지 엔티티(&#34; &#39; &lt; &gt;)에서 끊는다
+_URL_BODY = r"(?:[^\s<>&\"')]|&amp;)+"
+_LINK_RE = re.compile(r"\[([^\]\n]+)\]\((https?://" + _URL_BODY + r")\)")
+_URL_RE = re.compile(r"\bhttps?://(?:[^\s<>&\"']|&amp;)+")
+_STRONG_RE = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*")
+_EM_RE = re.compile(r"(?<![*\w])\*(?=[^\s*])([^*\n]+?)(?<=\S)\*(?!\*)")
+_DEL_RE = re.compile(r"~~(?=\S)(.+?)(?<=\S)~~")
+_TOKEN_RE = re.compile("\x00(\\d+)\x00")
+
+
+# ──────────────────────────────────────────────────────────
+# 인라인
+# ──────────────────────────────────────────────────────────
+def _inline(text: str) -> str:
+    """한 블록의 텍스트 → 인라인 HTML (코드/링크는 자리표시자로 보호한 뒤 강조 처리)"""
+    tokens = []
+
+    def keep(html: str) -> str:
+        tokens.append(html)
+        return f"\x00{len(tokens) - 1}\x00"
+
+    def anchor(url: str, label: str) -> str:
+        return keep(f'<a href="{url}" rel="{LINK_REL}">{label}</a>')
+
+    def url(m):
+        href = m.group(0)
+        trail = len(href) - len(href.rstrip(".,;:!?)'\""))
+        tail = href[len(href) - trail:] if trail else ""
+        href = href[:len(href) - trail]
+        return anchor(href, href) + tail
+
+    parts = _CODE_SPAN_RE.split(text)
+    out = []
+    for i in range(0, len(parts), 3):  # split 결과: 텍스트, 백틱, 코드, 텍스트, ...
+        out.append(str(escape(parts[i])))
+        if i + 2 < len(parts):
+            out.append(keep(f"<code>{escape(parts[i + 2].strip())}</code>"))
+    html = "".join(out)
+    html = _LINK_RE.sub(lambda m: anchor(m.group(2), m.group(1)), html)
+    html = _URL_RE.sub(url, html)
+    html = _STRONG_RE.sub(r"<strong>\1</strong>", html)
+    html = _EM_RE.sub(r"<em>\1</em>", html)
+    html = _DEL_RE.sub(r"<del>\1</del>", html)
+    while "\x00" in html:
+        html = _TOKEN_RE.sub(lambda m: tokens[int(m.group(1))], html)
+    return html
+
+
+def _lines(lines) -> str:
+    return "<br>".join(_inline(line.strip()) for line in lines)
+
+
+# ──────────────────────────────────────────────────────────
+# 블록
+# ──────────────────────────────────────────────────────────
+def _code_block(code: str, lang: str) -> str:
+    cls = f' class="language-{escape(lang)}"' if lang else ""
+    if highlight and lang:
+        try:
+            body = highlight(code, get_lexer_by_name(lang), HtmlFormatter(nowrap=True))
+            return f'<pre class="code"><code{cls}>{body.rstrip()}</code></pre>'
+        except ClassNotFound:
+            pass
+    return f'<pre class="code"><code{cls}>{escape(code)}</code></pre>'
+
+
+def render(text) -> str:
+    """마크다운 원문 → HTML 문자열 (블록 사이 줄바꿈만 두고 white-space는 CSS에 맡기지 않음)"""
+    lines = (text or "").replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    blocks = []
+    para = []
+
+    def flush():
+        if para:
+            blocks.append(f"<p>{_lines(para)}</p>")
+            para.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        fence = _FENCE_RE.match(line)
+        if fence:
+            flush()
+            marker, lang = fence.group(1), fence.group(2)
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                code.append(lines[i])
+                i += 1
+            blocks.append(_code_block("\n".join(code), lang.lower()))
+            i += 1
+            continue
+        if not line.strip():
+            flush()
+        elif _HEADING_RE.match(line):
+            flush()
+            m = _HEADING_RE.match(line)
+            level = min(len(m.group(1)) + 1, 6)  # 페이지 제목이 h1
+            blocks.append(f"<h{level}>{_inline(m.group(2))}</h{level}>")
+        elif _HR_RE.match(line):
+            flush()
+            blocks.append("<hr>")
+        elif _QUOTE_RE.match(line):
+            flush()
+            quoted = []
+            while i < len(lines) and _QUOTE_RE.match(lines[i]):
+                quoted.append(_QUOTE_RE.match(lines[i]).group(1))
+                i += 1
+            blocks.append(f"<blockquote><p>{_lines(quoted)}</p></blockquote>")
+            continue
+        elif _ITEM_RE.match(line):
+            flush()
+            ordered = _ITEM_RE.match(line).group(1)[0].isdigit()
+            start = int(_ITEM_RE.match(line).group(1)[:-1]) if ordered else 1
+            items = []
+            while i < len(lines) and lines[i].strip():
+                m = _ITEM_RE.match(lines[i])
+                if m and m.group(1)[0].isdigit() == ordered:
+                    items.append([m.group(2)])
+                elif m or _FENCE_RE.match(lines[i]) or _HEADING_RE.match(lines[i]):
+                    break
+                else:
+                    items[-1].append(lines[i])  # 이어지는 줄
+                i += 1
+            tag = "ol" if ordered else "ul"
+            attr = f' start="{start}"' if ordered and start != 1 else ""
+            body = "".join(f"<li>{_lines(item)}</li>" for item in items)
+            blocks.append(f"<{tag}{attr}>{body}</{tag}>")
+            continue
+        else:
+            para.append(line)
+        i += 1
+    flush()
+    return "\n".join(blocks)
+
+
+def columns(content) -> tuple:
+    """INSERT용 (content_html, render_version)"""
+    return render(content), RENDERER_VERSION
+
+
+# ──────────────────────────────────────────────────────────
+# 조회 / 재렌더링
+# ──────────────────────────────────────────────────────────
+_rerender_requested = False
+
+
+def html_for(row) -> str:
+    """저장된 HTML — 렌더러 버전이 다르거나 비어 있으면 즉석 렌더 후 재렌더 작업 적재"""
+    global _rerender_requested
+    if row.get("render_version") == RENDERER_VERSION and row.get("content_html") is not None:
+        return row["content_html"]
+    if not _rerender_requested:
+        _rerender_requested = True
+        try:
+            jobs.enqueue("render_content", dedupe_key=f"render:v{RENDERER_VERSION}")
+        except Exception as e:
+            print(f"[render] 재렌더 작업 적재 실패: {e}")
+    return render(row.get("content"))
+
+
+@jobs.job("render_content")
+def render_content(payload):
+    """렌더러 버전이 낮은 게시글/댓글 다시 렌더링 (BATCH 단위 커밋)"""
+    conn = get_conn()
+    c = conn.cursor()
+    p = ph()
+    try:
+        for table in ("posts", "comments"):
+            while True:
+                c.execute(f"SELECT id, content FROM {table} WHERE render_version<{p} ORDER BY id LIMIT {p}",
+                          (RENDERER_VERSION, BATCH))
+                rows = fetchall(c)
+                if not rows:
+                    break
+                c.executemany(
+                    f"UPDATE {table} SET content_html={p}, render_version={p} WHERE id={p}",
+                    [columns(r["content"]) + (r["id"],) for r in rows],
+                )
+                conn.commit()
+    finally:
+        conn.close()
+
+
+jobs.schedule("render_content", "*/30 * * * *")
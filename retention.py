@@ -0,0 +1,304 @@
+"""VibeCoder 데이터 보존 — page_views 월 파티션 / 롤업 압축 / rate_limits 정리
+  pv_log            : 원본 페이지뷰 (PostgreSQL: RANGE 파티션 부모, SQLite: 월 테이블 UNION 뷰)
+  pv_log_YYYYMM     : 월 파티션 (UA/Referrer는 user_agents / referrers 조회 테이블 id로 저장)
+  page_views (뷰)   : 기존 컬럼 형태 그대로 읽기 전용 제공 (+ 이전 스키마 page_views_legacy)
+  pv_rollup         : 보존 기간이 지난 파티션의 일별 집계 (dim: total/uv/path/ref/country)
+  visitors          : 압축된 구간의 순방문자 ip_hash (누적 순방문자 계산용)
+"""
+
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+import jobs
+from db import USE_POSTGRES, get_conn, ph, fetchall, fetchone
+
+# 원본 보존 개월 수 (이번 달 + 이전 N개월), 최소 1 → 최근 7일 통계는 항상 원본
+PV_RETENTION_MONTHS = max(1, int(os.environ.get("PV_RETENTION_MONTHS", "3")))
+PURGE_BATCH = 5000
+RATE_LIMIT_TTL = timedelta(hours=1)
+
+_PART_RE = re.compile(r"^pv_log_(\d{6})$")
+_ensured = set()
+_string_ids = {"user_agents": {}, "referrers": {}}
+_STRING_CACHE_MAX = 10000
+_lock = threading.Lock()
+
+
+def _month_key(dt_str: str) -> str:
+    return dt_str[:4] + dt_str[5:7]
+
+
+def _month_bounds(key: str):
+    y, m = int(key[:4]), int(key[4:])
+    ny, nm = (y + 1, 1) if m == 12 else (y, m + 1)
+    return f"{y:04d}-{m:02d}", f"{ny:04d}-{nm:02d}"
+
+
+def _relkind(c, name: str):
+    """'table' / 'view' / None"""
+    p = ph()
+    if USE_POSTGRES:
+        c.execute(f"SELECT table_type FROM information_schema.tables WHERE table_name={p}", (name,))
+        row = fetchone(c)
+        return None if not row else ("view" if row["table_type"] == "VIEW" else "table")
+    c.execute(f"SELECT type FROM sqlite_master WHERE name={p}", (name,))
+    row = fetchone(c)
+    return row["type"] if row else None
+
+
+def partitions(c) -> list:
+    """존재하는 월 파티션 키 목록 (오름차순)"""
+    if USE_POSTGRES:
+        c.execute("SELECT table_name AS name FROM information_schema.tables WHERE table_name LIKE 'pv_log_%'")
+    else:
+        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'pv_log_%'")
+    return sorted(m.group(1) for m in (_PART_RE.match(r["name"]) for r in fetchall(c)) if m)
+
+
+def rebuild_views(c):
+    """파티션 생성/삭제, 레거시 테이블 제거 후 뷰 재정의"""
+    c.execute("DROP VIEW IF EXISTS page_views")
+    if not USE_POSTGRES:
+        c.execute("DROP VIEW IF EXISTS pv_log")
+        parts = partitions(c)
+        union = " UNION ALL ".join(
+            f"SELECT id, created_at, path, ip_hash, ref_id, ua_id, country_hint FROM pv_log_{k}" for k in parts
+        ) or "SELECT NULL AS id, NULL AS created_at, NULL AS path, NULL AS ip_hash, " \
+             "NULL AS ref_id, NULL AS ua_id, NULL AS country_hint WHERE 0"
+        c.execute(f"CREATE VIEW pv_log AS {union}")
+    legacy = ""
+    if _relkind(c, "page_views_legacy") == "table":
+        legacy = """ UNION ALL SELECT id, created_at, path, ip_hash, referrer, user_agent, country_hint
+            FROM page_views_legacy"""
+    c.execute(f"""
+        CREATE VIEW page_views AS
+        SELECT v.id, v.created_at, v.path, v.ip_hash,
+               COALESCE(r.value, '') AS referrer, COALESCE(u.value, '') AS user_agent, v.country_hint
+        FROM pv_log v
+        LEFT JOIN referrers r ON r.id = v.ref_id
+        LEFT JOIN user_agents u ON u.id = v.ua_id{legacy}
+    """)
+
+
+def ensure_partition(c, key: str):
+    """월 파티션 생성 (프로세스 내 캐시로 DDL은 월 1회)"""
+    if key in _ensured:
+        return
+    table = f"pv_log_{key}"
+    if _relkind(c, table) is None:
+        if USE_POSTGRES:
+            lo, hi = _month_bounds(key)
+            c.execute(f"CREATE TABLE IF NOT EXISTS {table} PARTITION OF pv_log FOR VALUES FROM ('{lo}') TO ('{hi}')")
+        else:
+            c.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    ip_hash TEXT,
+                    ref_id INTEGER,
+                    ua_id INTEGER,
+                    country_hint TEXT
+                )
+            """)
+            c.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_created ON {table} (created_at)")
+            rebuild_views(c)
+    _ensured.add(key)
+
+
+def _string_id(c, table: str, value: str):
+    """UA/Referrer 문자열 → 조회 테이블 id (빈 값은 NULL)"""
+    if not value:
+        return None
+    cache = _string_ids[table]
+    sid = cache.get(value)
+    if sid is None:
+        p = ph()
+        c.execute(f"INSERT INTO {table} (value) VALUES ({p}) ON CONFLICT (value) DO NOTHING", (value,))
+        c.execute(f"SELECT id FROM {table} WHERE value={p}", (value,))
+        sid = fetchone(c)["id"]
+        if len(cache) >= _STRING_CACHE_MAX:
+            cache.clear()
+        cache[value] = sid
+    return sid
+
+
+def insert_pageviews(c, rows):
+    """(created_at, path, ip_hash, referrer, user_agent, country_hint) 행들을 월 파티션에 저장"""
+    p = ph()
+    by_month = {}
+    with _lock:
+        for created_at, path, ip_hash, ref, ua, country in rows:
+            by_month.setdefault(_month_key(created_at), []).append((
+                created_at, path, ip_hash,
+                _string_id(c, "referrers", ref), _string_id(c, "user_agents", ua), country,
+            ))
+        for key, batch in by_month.items():
+            ensure_partition(c, key)
+            c.executemany(
+                f"INSERT INTO pv_log_{key} (created_at, path, ip_hash, ref_id, ua_id, country_hint) "
+                f"VALUES ({p},{p},{p},{p},{p},{p})",
+                batch,
+            )
+
+
+def setup(conn):
+    """init_db에서 호출 — 이전 스키마 page_views 테이블을 레거시로 돌리고 뷰 구성"""
+    c = conn.cursor()
+    if _relkind(c, "page_views") == "table":
+        c.execute("ALTER TABLE page_views RENAME TO page_views_legacy")
+    ensure_partition(c, _month_key(datetime.now().isoformat()))
+    rebuild_views(c)
+    conn.commit()
+
+
+# ──────────────────────────────────────────────────────────
+# 관리자 통계 (원본 + 롤업 합산)
+# ──────────────────────────────────────────────────────────
+def total_pageviews(c) -> int:
+    c.execute("SELECT COUNT(*) as cnt FROM page_views")
+    raw = fetchone(c)["cnt"]
+    c.execute("SELECT COALESCE(SUM(cnt), 0) as cnt FROM pv_rollup WHERE dim='total'")
+    return raw + fetchone(c)["cnt"]
+
+
+def unique_visitors(c) -> int:
+    c.execute("SELECT COUNT(*) as cnt FROM visitors")
+    compacted = fetchone(c)["cnt"]
+    c.execute(
+        "SELECT COUNT(DISTINCT ip_hash) as cnt FROM page_views "
+        "WHERE ip_hash NOT IN (SELECT ip_hash FROM visitors)"
+    )
+    return compacted + fetchone(c)["cnt"]
+
+
+_DIM_COLUMNS = {"path": "path", "ref": "referrer", "country": "country_hint"}
+
+
+def top_values(c, dim: str, limit: int) -> list:
+    """[{value, cnt}] — 원본 GROUP BY와 롤업을 합쳐 상위 N개"""
+    col = _DIM_COLUMNS[dim]
+    p = ph()
+    c.execute(
+        f"""SELECT value, SUM(cnt) as cnt FROM (
+                SELECT {col} AS value, COUNT(*) AS cnt FROM page_views
+                WHERE {col} IS NOT NULL AND {col} != '' GROUP BY {col}
+                UNION ALL
+                SELECT value, SUM(cnt) AS cnt FROM pv_rollup WHERE dim={p} GROUP BY value
+            ) t GROUP BY value ORDER BY cnt DESC LIMIT {p}""",
+        (dim, limit),
+    )
+    return fetchall(c)
+
+
+# ──────────────────────────────────────────────────────────
+# 백그라운드 작업
+# ──────────────────────────────────────────────────────────
+def _rollup_sql(key: str):
+    t = f"pv_log_{key}"
+    day = "substr(v.created_at, 1, 10)"
+    return [
+        f"SELECT {day} AS day, 'total' AS dim, '' AS value, COUNT(*) AS cnt FROM {t} v WHERE 1=1 GROUP BY {day}",
+        f"SELECT {day} AS day, 'uv' AS dim, '' AS value, COUNT(DISTINCT v.ip_hash) AS cnt FROM {t} v "
+        f"WHERE 1=1 GROUP BY {day}",
+        f"SELECT {day} AS day, 'path' AS dim, v.path AS value, COUNT(*) AS cnt FROM {t} v "
+        f"WHERE 1=1 GROUP BY {day}, v.path",
+        f"SELECT {day} AS day, 'ref' AS dim, r.value AS value, COUNT(*) AS cnt FROM {t} v "
+        f"JOIN referrers r ON r.id = v.ref_id WHERE 1=1 GROUP BY {day}, r.value",
+        f"SELECT {day} AS day, 'country' AS dim, v.country_hint AS value, COUNT(*) AS cnt FROM {t} v "
+        f"WHERE v.country_hint != '' GROUP BY {day}, v.country_hint",
+    ]
+
+
+def compact_partition(conn, key: str):
+    """월 파티션 → pv_rollup / visitors 누적 후 DROP (한 트랜잭션)"""
+    c = conn.cursor()
+    for select in _rollup_sql(key):
+        c.execute(
+            f"""INSERT INTO pv_rollup (day, dim, value, cnt) {select}
+                ON CONFLICT (day, dim, value) DO UPDATE SET cnt = pv_rollup.cnt + excluded.cnt"""
+        )
+    c.execute(
+        f"""INSERT INTO visitors (ip_hash, first_seen)
+            SELECT ip_hash, MIN(created_at) FROM pv_log_{key} WHERE ip_hash IS NOT NULL GROUP BY ip_hash
+            ON CONFLICT (ip_hash) DO NOTHING"""
+    )
+    c.execute(f"DROP TABLE pv_log_{key}")
+    _ensured.discard(key)
+    rebuild_views(c)
+    conn.commit()
+
+
+@jobs.job("compact_pageviews")
+def compact_pageviews(payload):
+    """보존 기간이 지난 월 파티션 압축"""
+    now = datetime.now()
+    y, m = now.year, now.month - PV_RETENTION_MONTHS
+    while m < 1:
+        y, m = y - 1, m + 12
+    cutoff = f"{y:04d}{m:02d}"
+    conn = get_conn()
+    try:
+        for key in partitions(conn.cursor()):
+            if key < cutoff:
+                compact_partition(conn, key)
+    finally:
+        conn.close()
+
+
+@jobs.job("migrate_legacy_pageviews")
+def migrate_legacy_pageviews(payload):
+    """이전 스키마 page_views_legacy 행을 파티션으로 배치 이동, 비면 DROP"""
+    conn = get_conn()
+    c = conn.cursor()
+    p = ph()
+    try:
+        while _relkind(c, "page_views_legacy") == "table":
+            c.execute(
+                f"""SELECT id, created_at, path, ip_hash, referrer, user_agent, country_hint
+                    FROM page_views_legacy ORDER BY id LIMIT {p}""",
+                (PURGE_BATCH,),
+            )
+            rows = fetchall(c)
+            if not rows:
+                c.execute("DROP VIEW IF EXISTS page_views")
+                c.execute("DROP TABLE page_views_legacy")
+                rebuild_views(c)
+                conn.commit()
+                break
+            insert_pageviews(c, [
+                (r["created_at"], r["path"], r["ip_hash"], r["referrer"] or "", r["user_agent"] or "",
+                 r["country_hint"] or "")
+                for r in rows
+            ])
+            c.execute(f"DELETE FROM page_views_legacy WHERE id<={p}", (rows[-1]["id"],))
+            conn.commit()
+    finally:
+        conn.close()
+
+
+@jobs.job("cleanup_rate_limits")
+def cleanup_rate_limits(payload):
+    """만료된 속도 제한 기록을 PURGE_BATCH 단위로 삭제 (배치마다 커밋해 잠금 최소화)"""
+    cutoff = (datetime.now() - RATE_LIMIT_TTL).isoformat()
+    conn = get_conn()
+    c = conn.cursor()
+    p = ph()
+    while True:
+        c.execute(
+            f"DELETE FROM rate_limits WHERE id IN "
+            f"(SELECT id FROM rate_limits WHERE created_at<{p} LIMIT {p})",
+            (cutoff, PURGE_BATCH),
+        )
+        deleted = c.rowcount
+        conn.commit()
+        if deleted < PURGE_BATCH:
+            break
+    conn.close()
+
+
+jobs.schedule("cleanup_rate_limits", "*/10 * * * *")
+jobs.schedule("compact_pageviews", "15 3 * * *")
+jobs.schedule("migrate_legacy_pageviews", "*/30 * * * *")
@@ -0,0 +1,267 @@
+"""VibeCoder 정적 스냅샷 — 읽기 위주 페이지를 HTML/JSON 파일로 미리 만들어 두고 그대로 전송
+대상: /  /showcase (1페이지, 필터 없음)  /trends  /api/projects  /showcase/<slug>  /lounge/<slug> (info 글)
+파일: <SNAPSHOT_DIR>/index.html, showcase/index.html, showcase/<slug>/index.html, api/projects.json ...
+     → 디렉터리째 CDN/엣지에 올려도 같은 URL로 열린다.
+  내보내기 : python snapshot.py export [디렉터리]   (전체 다시 생성)
+  서빙 모드: SNAPSHOT_MODE=serve → 파일이 있으면 Flask가 DB/Jinja 없이 바로 전송, 없으면 동적 렌더링
+재생성: 쓰기 트랜잭션이 snapshot_changes에 바뀐 경로를 남기고 (mark), 각 프로세스의 틱이
+       새 변경분의 경로만 다시 렌더링 (refresh). 인스턴스마다 자기 디렉터리를 갱신하므로 다중 인스턴스도 동일.
+스냅샷에는 개인별 정보가 없다 — 좋아요/조회수, vc_session 본인 글·댓글 삭제 버튼은
+/api/live/<kind>/<slug>를 live.js가 불러와 채운다. 방금 쓴 세션(vc_rw 쿠키)은 동적 렌더링으로 본다.
+"""
+
+import os
+import re
+import sys
+import time
+import threading
+from datetime import datetime, timedelta
+
+import jobs
+from db import get_conn, ph, fetchall, fetchone
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(ROOT, "snapshot"))
+SERVING = os.environ.get("SNAPSHOT_MODE") == "serve"
+REFRESH_INTERVAL = 5      # 변경분 확인 주기 (초)
+LIST_REFRESH = 300        # 목록 페이지(홈/쇼케이스/트렌드) 주기 재생성 — 좋아요 수, AI 뉴스 등
+CLOCK_SLACK = 30          # 인스턴스 간 시계 차이/늦은 커밋 대비 겹쳐 읽는 구간 (초)
+CHANGES_KEEP = timedelta(days=1)
+MAX_AGE = 60              # 스냅샷 응답 Cache-Control (초)
+
+# 종류 → 경로 (slug가 있으면 {} 자리)
+PATHS = {
+    "home": "/",
+    "showcase": "/showcase",
+    "trends": "/trends",
+    "projects_api": "/api/projects",
+    "project": "/showcase/{}",
+    "post": "/lounge/{}",
+}
+LIST_KINDS = ("home", "showcase", "trends", "projects_api")
+JSON_KINDS = {"projects_api"}
+_DETAIL = [(re.compile(r"/showcase/([\w-]+)"), "project"), (re.compile(r"/lounge/([\w-]+)"), "post")]
+
+_renderers = {}   # 종류 → fn(slug) → 본문 str 또는 None (스냅샷 대상 아님 → 파일 삭제)
+_listers = {}     # 종류 → fn() → 전체 내보내기 대상 slug 목록
+_app = None
+_lock = threading.Lock()
+_state = {"since": None, "lists_at": 0.0, "done": {}}
+
+
+def bind(app):
+    """렌더링에 쓸 Flask 앱 (url_for/템플릿용 요청 컨텍스트)"""
+    global _app
+    _app = app
+
+
+def renderer(kind: str, lister=None):
+    """스냅샷 렌더러 등록 데코레이터 — lister: 상세 페이지 종류의 전체 slug 목록"""
+    def deco(fn):
+        _renderers[kind] = fn
+        if lister is not None:
+            _listers[kind] = lister
+        return fn
+    return deco
+
+
+def parse(path: str):
+    """요청 경로 → (종류, slug) 또는 None"""
+    for kind in LIST_KINDS:
+        if PATHS[kind] == path:
+            return kind, None
+    for pattern, kind in _DETAIL:
+        m = pattern.fullmatch(path)
+        if m:
+            return kind, m.group(1)
+    return None
+
+
+def file_for(kind: str, slug=None) -> str:
+    path = PATHS[kind].format(slug).strip("/")
+    if kind in JSON_KINDS:
+        return os.path.join(SNAPSHOT_DIR, path + ".json")
+    return os.path.join(SNAPSHOT_DIR, path, "index.html")
+
+
+def mimetype(kind: str) -> str:
+    return "application/json" if kind in JSON_KINDS else "text/html"
+
+
+def lookup(path: str):
+    """서빙 모드 — (종류, slug, 파일 경로) 또는 None (파일이 없으면 동적 렌더링)"""
+    parsed = parse(path)
+    if parsed is None:
+        return None
+    kind, slug = parsed
+    fpath = file_for(kind, slug)
+    if not os.path.isfile(fpath):
+        return None
+    return kind, slug, fpath
+
+
+# ──────────────────────────────────────────────────────────
+# 쓰기 경로 (호출자 트랜잭션, 커밋은 호출자)
+# ──────────────────────────────────────────────────────────
+def mark(c, *paths):
+    """바뀐 경로 기록 — 서빙 모드가 아니면 아무 것도 하지 않음. 기록한 경로 목록 반환"""
+    if not SERVING:
+        return []
+    p = ph()
+    now = datetime.now().isoformat()
+    for path in dict.fromkeys(paths):
+        c.execute(f"INSERT INTO snapshot_changes (path, created_at) VALUES ({p},{p})", (path, now))
+    return list(paths)
+
+
+def project_paths(slug: str) -> list:
+    return ["/", "/showcase", "/api/projects", PATHS["project"].format(slug)]
+
+
+def post_paths(slug: str, category: str) -> list:
+    """홈은 최신 글 목록, info(트렌드) 글은 상세와 /trends도"""
+    if category == "info":
+        return ["/", "/trends", PATHS["post"].format(slug)]
+    return ["/"]
+
+
+def mark_comment(c, post_id, project_id):
+    """댓글 작성/삭제 — 달린 글/프로젝트 상세 페이지"""
+    if not SERVING:
+        return []
+    p = ph()
+    if project_id:
+        c.execute(f"SELECT slug FROM projects WHERE id={p}", (project_id,))
+        row = fetchone(c)
+        if row:
+            return mark(c, PATHS["project"].format(row["slug"]))
+    elif post_id:
+        c.execute(f"SELECT slug, category FROM posts WHERE id={p}", (post_id,))
+        row = fetchone(c)
+        if row and row["category"] == "info":
+            return mark(c, PATHS["post"].format(row["slug"]))
+    return []
+
+
+# ──────────────────────────────────────────────────────────
+# 렌더링
+# ──────────────────────────────────────────────────────────
+def _write(fpath: str, body: str):
+    os.makedirs(os.path.dirname(fpath), exist_ok=True)
+    tmp = f"{fpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, fpath)  # 읽는 쪽은 항상 완성된 파일만 본다
+
+
+def _remove(fpath: str):
+    try:
+        os.remove(fpath)
+    except FileNotFoundError:
+        pass
+
+
+def render(kind: str, slug=None) -> bool:
+    """한 페이지 재생성 — 대상이 아니게 됐으면 (삭제/스팸 등) 파일 삭제. 파일을 남겼으면 True"""
+    if _app is None or kind not in _renderers:
+        return False
+    fpath = file_for(kind, slug)
+    with _app.test_request_context(PATHS[kind].format(slug)):
+        body = _renderers[kind](slug)
+    if body is None:
+        _remove(fpath)
+        return False
+    _write(fpath, body)
+    return True
+
+
+def render_path(path: str) -> bool:
+    parsed = parse(path)
+    return render(*parsed) if parsed else False
+
+
+def render_paths(paths):
+    """커밋 직후 바로 재생성 (JOB_WORKERS=0 — 틱이 돌지 않는 프로세스)"""
+    for path in dict.fromkeys(paths):
+        render_path(path)
+
+
+def export_all() -> int:
+    """전체 내보내기 — 만든 파일 수"""
+    count = 0
+    for kind in LIST_KINDS:
+        count += render(kind)
+    for kind, lister in _listers.items():
+        for slug in lister():
+            count += render(kind, slug)
+    return count
+
+
+@jobs.tick(REFRESH_INTERVAL)
+def refresh():
+    """새 변경분의 경로만 다시 렌더링 (서빙 모드). 처음 호출 시 전체 내보내기"""
+    if not SERVING or _app is None:
+        return
+    if not _lock.acquire(blocking=False):
+        return  # 다른 스레드가 처리 중
+    try:
+        _refresh()
+    finally:
+        _lock.release()
+
+
+def _refresh():
+    started = time.time()
+    if _state["since"] is None:
+        export_all()
+        _state.update(since=started, lists_at=started)
+        return
+
+    since = datetime.fromtimestamp(_state["since"] - CLOCK_SLACK).isoformat()
+    p = ph()
+    conn = get_conn(readonly=True)
+    c = conn.cursor()
+    c.execute(f"SELECT id, path, created_at FROM snapshot_changes WHERE created_at>={p}", (since,))
+    rows = fetchall(c)
+    conn.close()
+
+    done = _state["done"]
+    paths = {}
+    for r in rows:
+        if r["id"] not in done:
+            paths[r["path"]] = True
+            done[r["id"]] = r["created_at"]
+    if started - _state["lists_at"] >= LIST_REFRESH:
+        for kind in LIST_KINDS:
+            paths[PATHS[kind]] = True
+        _state["lists_at"] = started
+        _prune_changes()
+    for path in paths:
+        render_path(path)
+    # 겹쳐 읽는 구간을 벗어난 id는 다시 나오지 않으므로 정리
+    _state["done"] = {i: at for i, at in done.items() if at >= since}
+    _state["since"] = started
+
+
+def _prune_changes():
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute(f"DELETE FROM snapshot_changes WHERE created_at<{ph()}",
+              ((datetime.now() - CHANGES_KEEP).isoformat(),))
+    conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["export"]:
+        print("사용법: python snapshot.py export [디렉터리]")
+        sys.exit(1)
+    if len(sys.argv) > 2:
+        SNAPSHOT_DIR = os.path.abspath(sys.argv[2])
+    os.environ["JOB_WORKERS"] = "0"
+    import snapshot
+    snapshot.SNAPSHOT_DIR = SNAPSHOT_DIR
+    import app  # noqa: F401 — 렌더러 등록
+    t0 = time.perf_counter()
+    n = snapshot.export_all()
+    print(f"스냅샷 {n}개 생성 → {SNAPSHOT_DIR} ({time.perf_counter() - t0:.1f}s)")
@@ -0,0 +1,356 @@
+"""VibeCoder 학습형 스팸 점수 — 기존 is_spam 라벨(posts/comments)로 학습하는 나이브 베이즈
+  라벨  : 룰/관리자가 붙인 것만 — 이 모델이나 중복 판정이 붙인 행(spam_auto=1)은 학습하지 않는다 (오탐 증폭 방지)
+  특징  : 정규화한 본문의 문자 2~4-gram을 해시해 2^DIM_BITS 버킷으로 (글자 단위라 한국어/영어 공통)
+  학습  : train_spam 작업 (SPAM_TRAIN_CRON, 기본 10분마다) — 라벨이 없거나 바뀐 글/댓글만 반영하는 증분 학습
+          spam_labels에 학습한 라벨을 남겨 두고, 관리자/재검사로 플래그가 뒤집히면 옛 클래스 카운트를 빼고 새 클래스에 더함
+          → 전체 재학습과 같은 카운트. 결과는 spam_model에 버전별로 저장 (최근 KEEP개)
+  배포  : 각 프로세스가 최신 버전을 받아 가중치만 <SPAM_MODEL_DIR>/spam-model-v<버전>.bin 으로 쓰고 mmap으로 연다
+          (SYNC_INTERVAL마다 버전 확인, 재시작 시 DB 조회 없이 로컬 파일부터)
+  판정  : predict() — 글/댓글 작성 시 룰(is_spam)과 함께. 확률 THRESHOLD 이상이면 스팸.
+          클래스별 학습 문서가 MIN_SPAM / MIN_HAM 미만이면 판정하지 않는다 (룰만 적용).
+NumPy가 없으면 학습/판정 모두 건너뛴다 (룰 기반 is_spam만 동작).
+"""
+
+import os
+import re
+import glob
+import math
+import mmap
+import time
+import struct
+import threading
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 미설치 — 학습형 판정 없이 룰만
+    np = None
+
+import jobs
+from db import get_conn, ph, fetchall, fetchone
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.environ.get("SPAM_MODEL_DIR", os.path.join(ROOT, "spam_model"))
+FEATURES = 1              # 특징 추출 방식 버전 — 바꾸면 처음부터 다시 학습
+DIM_BITS = 18             # 해시 버킷 2^18개 (가중치 파일 1MB)
+DIM = 1 << DIM_BITS
+NGRAMS = (2, 3, 4)
+MAX_CHARS = 2000          # 앞부분만 본다 (판정 시간 상한)
+ALPHA = 1.0               # 라플라스 스무딩
+THRESHOLD = float(os.environ.get("SPAM_THRESHOLD", "0.97"))
+MIN_SPAM = 30
+MIN_HAM = 100
+BATCH = 2000
+MAX_BATCHES = 20          # 한 번 실행에서 반영할 최대 배치 (나머지는 다음 실행)
+KEEP = 3
+SYNC_INTERVAL = 60        # 새 모델 버전 확인 주기 (초)
+
+_HEADER = struct.Struct("<8sIIIIf")   # magic, 특징 버전, 모델 버전, DIM_BITS, 판정 가능 여부, bias
+_MAGIC = b"VCSPAM\x00\x01"
+_URL_RE = re.compile(r"https?://([^/\s]+)\S*")
+_DIGIT_RE = re.compile(r"\d")
+_SPACE_RE = re.compile(r"\s+")
+
+# 현재 모델 — 교체는 dict 통째로 (읽는 쪽은 한 번 잡은 참조만 사용)
+_model = None
+_sync_lock = threading.Lock()
+_state = {"checked": 0.0, "local_loaded": False}
+_stats = {"scored": 0, "flagged": 0, "total_us": 0.0, "max_us": 0.0}
+_stats_lock = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────
+# 특징
+# ──────────────────────────────────────────────────────────
+def _text(title: str, content: str) -> str:
+    return f"{title or ''}\n{content or ''}"
+
+
+def normalize(text: str) -> str:
+    """앞 MAX_CHARS자만 — 소문자, URL은 도메인만, 숫자는 0, 공백 하나로"""
+    text = _URL_RE.sub(lambda m: f" url:{m.group(1)} ", text[:MAX_CHARS].lower())
+    return _SPACE_RE.sub(" ", _DIGIT_RE.sub("0", text)).strip()
+
+
+def features(text: str):
+    """해시 버킷 번호 (중복 없음, uint32 배열) — 문자 n-gram의 FNV-1a 해시를 벡터 연산으로"""
+    cps = np.frombuffer(normalize(text).encode("utf-32-le"), dtype="<u4").astype(np.uint32)
+    parts = []
+    for n in NGRAMS:
+        m = len(cps) - n + 1
+        if m <= 0:
+            continue
+        h = np.full(m, (2166136261 ^ n) & 0xFFFFFFFF, dtype=np.uint32)
+        for k in range(n):
+            h ^= cps[k:k + m]
+            h *= np.uint32(16777619)
+        parts.append(h)
+    if not parts:
+        return np.empty(0, dtype=np.uint32)
+    h = np.concatenate(parts)
+    h ^= h >> np.uint32(15)
+    h *= np.uint32(0x2C1B3C6D)
+    h ^= h >> np.uint32(12)
+    return np.unique(h & np.uint32(DIM - 1))
+
+
+# ──────────────────────────────────────────────────────────
+# 판정 (요청 경로)
+# ──────────────────────────────────────────────────────────
+def score(text: str):
+    """스팸 확률 0~1, 판정할 모델이 없으면 None"""
+    model = _current()
+    if model is None or not model["ready"]:
+        return None
+    t0 = time.perf_counter()
+    z = model["bias"] + float(model["weights"][features(text)].sum())
+    prob = 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+    us = (time.perf_counter() - t0) * 1e6
+    with _stats_lock:
+        _stats["scored"] += 1
+        _stats["total_us"] += us
+        _stats["max_us"] = max(_stats["max_us"], us)
+    return prob
+
+
+def predict(title: str, content: str) -> bool:
+    """학습 모델 기준 스팸 여부 (모델이 없거나 학습이 부족하면 False)"""
+    prob = score(_text(title, content))
+    if prob is None or prob < THRESHOLD:
+        return False
+    with _stats_lock:
+        _stats["flagged"] += 1
+    return True
+
+
+def stats() -> dict:
+    model = _model
+    with _stats_lock:
+        out = dict(_stats)
+    out["avg_us"] = round(out.pop("total_us") / out["scored"], 1) if out["scored"] else 0.0
+    out["max_us"] = round(out["max_us"], 1)
+    out.update(numpy=np is not None, version=model["version"] if model else None,
+               ready=bool(model and model["ready"]), threshold=THRESHOLD)
+    return out
+
+
+# ──────────────────────────────────────────────────────────
+# 모델 파일 (mmap)
+# ──────────────────────────────────────────────────────────
+def _path(version: int) -> str:
+    return os.path.join(MODEL_DIR, f"spam-model-v{version}.bin")
+
+
+def _write_file(version: int, weights, bias: float, ready: bool) -> str:
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    fpath = _path(version)
+    tmp = f"{fpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, FEATURES, version, DIM_BITS, int(ready), bias))
+        f.write(weights.astype("<f4").tobytes())
+    os.replace(tmp, fpath)
+    return fpath
+
+
+def _load_file(fpath: str):
+    """모델 파일 → dict 또는 None (형식/특징 버전이 다르면 무시)"""
+    try:
+        with open(fpath, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mm) != _HEADER.size + DIM * 4:
+        return None
+    magic, feats, version, bits, ready, bias = _HEADER.unpack_from(mm, 0)
+    if magic != _MAGIC or feats != FEATURES or bits != DIM_BITS:
+        return None
+    # 가중치는 페이지 캐시를 그대로 보는 읽기 전용 뷰 — 같은 호스트의 워커들이 메모리를 공유
+    weights = np.frombuffer(mm, dtype="<f4", count=DIM, offset=_HEADER.size)
+    return {"version": version, "weights": weights, "bias": bias, "ready": bool(ready)}
+
+
+def _local_versions() -> list:
+    found = []
+    for fpath in glob.glob(os.path.join(MODEL_DIR, "spam-model-v*.bin")):
+        m = re.search(r"-v(\d+)\.bin$", fpath)
+        if m:
+            found.append((int(m.group(1)), fpath))
+    return sorted(found, reverse=True)
+
+
+def _prune_files(keep_version: int):
+    for version, fpath in _local_versions():
+        if version < keep_version:
+            try:
+                os.remove(fpath)  # 이미 mmap한 쪽은 계속 읽을 수 있다
+            except OSError:
+                pass
+
+
+def _current():
+    """현재 모델 — 처음 한 번은 DB 없이 로컬 최신 파일부터"""
+    global _model
+    if np is None:
+        return None
+    if _model is None and not _state["local_loaded"]:
+        with _sync_lock:
+            if not _state["local_loaded"]:
+                for _version, fpath in _local_versions():
+                    loaded = _load_file(fpath)
+                    if loaded is not None:
+                        _model = loaded
+                        break
+                _state["local_loaded"] = True
+    return _model
+
+
+# ──────────────────────────────────────────────────────────
+# 학습 결과 → 가중치
+# ──────────────────────────────────────────────────────────
+def _weights(counts, docs):
+    """클래스별 버킷 카운트 (2, DIM) → (버킷별 로그 우도비, bias = 로그 사전 확률비)"""
+    totals = counts.sum(axis=1, dtype=np.float64) + ALPHA * DIM
+    log_ham = np.log((counts[0] + ALPHA) / totals[0])
+    log_spam = np.log((counts[1] + ALPHA) / totals[1])
+    bias = math.log((docs[1] + 1) / (docs[0] + 1))
+    return (log_spam - log_ham).astype(np.float32), bias
+
+
+def _ready(docs) -> bool:
+    return docs[1] >= MIN_SPAM and docs[0] >= MIN_HAM
+
+
+@jobs.tick(SYNC_INTERVAL)
+def sync(force: bool = False):
+    """DB의 최신 모델 버전이 더 새로우면 받아서 파일로 쓰고 교체 (SYNC_INTERVAL마다 한 번)"""
+    global _model
+    if np is None:
+        return
+    now = time.time()
+    if not force and now - _state["checked"] < SYNC_INTERVAL:
+        return
+    current = _current()
+    if not _sync_lock.acquire(blocking=False):
+        return
+    try:
+        _state["checked"] = now
+        p = ph()
+        conn = get_conn(readonly=True)
+        c = conn.cursor()
+        c.execute(f"SELECT version FROM spam_model WHERE features={p} ORDER BY version DESC LIMIT 1", (FEATURES,))
+        row = fetchone(c)
+        if row is None or (current is not None and row["version"] <= current["version"]):
+            conn.close()
+            return
+        c.execute(f"SELECT version, docs_ham, docs_spam, counts FROM spam_model WHERE version={p}", (row["version"],))
+        row = fetchone(c)
+        conn.close()
+        counts = np.frombuffer(bytes(row["counts"]), dtype="<f4").reshape(2, DIM)
+        docs = (row["docs_ham"], row["docs_spam"])
+        weights, bias = _weights(counts, docs)
+        loaded = _load_file(_write_file(row["version"], weights, bias, _ready(docs)))
+        if loaded is not None:
+            _model = loaded
+            _prune_files(row["version"])
+    finally:
+        _sync_lock.release()
+
+
+# ──────────────────────────────────────────────────────────
+# 학습 (백그라운드 작업)
+# ──────────────────────────────────────────────────────────
+# (종류, 테이블, 제목 컬럼) — 댓글은 제목 없이 본문만
+_SOURCES = (("post", "posts", "title"), ("comment", "comments", "''"))
+
+
+def _latest(c):
+    c.execute("SELECT version, features, docs_ham, docs_spam, counts FROM spam_model "
+              "ORDER BY version DESC LIMIT 1")
+    return fetchone(c)
+
+
+def _changed(c, kind: str, table: str, title_col: str, limit: int) -> list:
+    """학습한 적이 없거나 라벨이 바뀐 행 (자동 판정 행 제외)"""
+    p = ph()
+    c.execute(
+        f"SELECT t.id, {title_col} AS title, t.content, COALESCE(t.is_spam, 0) AS is_spam, l.label "
+        f"FROM {table} t LEFT JOIN spam_labels l ON l.kind={p} AND l.target_id=t.id "
+        f"WHERE COALESCE(t.spam_auto, 0)=0 AND (l.label IS NULL OR l.label<>COALESCE(t.is_spam, 0)) "
+        f"ORDER BY t.id LIMIT {p}",
+        (kind, limit),
+    )
+    return fetchall(c)
+
+
+def train(conn, batches: int = MAX_BATCHES) -> int:
+    """증분 학습 (커밋 포함) → 반영한 글/댓글 수. 다른 학습이 먼저 새 버전을 냈으면 버리고 0"""
+    c = conn.cursor()
+    p = ph()
+    base = _latest(c)
+    if base is not None and base["features"] == FEATURES:
+        counts = np.frombuffer(bytes(base["counts"]), dtype="<f4").reshape(2, DIM).copy()
+        docs = [base["docs_ham"], base["docs_spam"]]
+    else:
+        # 처음이거나 특징 추출 방식이 바뀜 — 전부 다시
+        c.execute("DELETE FROM spam_labels")
+        counts = np.zeros((2, DIM), dtype=np.float32)
+        docs = [0, 0]
+    applied = 0
+    for kind, table, title_col in _SOURCES:
+        for _ in range(batches):
+            rows = _changed(c, kind, table, title_col, BATCH)
+            for r in rows:
+                idx = features(_text(r["title"], r["content"]))
+                new = 1 if r["is_spam"] else 0
+                if r["label"] is not None:
+                    counts[r["label"], idx] -= 1   # idx는 중복이 없으므로 fancy index 증감이 정확
+                    docs[r["label"]] -= 1
+                    c.execute(f"UPDATE spam_labels SET label={p} WHERE kind={p} AND target_id={p}",
+                              (new, kind, r["id"]))
+                else:
+                    c.execute(f"INSERT INTO spam_labels (kind, target_id, label) VALUES ({p},{p},{p})",
+                              (kind, r["id"], new))
+                counts[new, idx] += 1
+                docs[new] += 1
+            applied += len(rows)
+            if len(rows) < BATCH:
+                break
+    if not applied:
+        conn.rollback()
+        return 0
+
+    latest = _latest(c)
+    if (latest and latest["version"]) != (base and base["version"]):
+        conn.rollback()  # 동시에 돈 다른 학습이 먼저 저장 — 다음 실행에서 그 버전 위에 다시
+        return 0
+    c.execute(
+        f"INSERT INTO spam_model (features, docs_ham, docs_spam, counts, created_at) "
+        f"VALUES ({p},{p},{p},{p},{p}) RETURNING version",
+        (FEATURES, docs[0], docs[1], counts.astype("<f4").tobytes(), datetime.now().isoformat()),
+    )
+    version = fetchone(c)["version"]
+    c.execute(f"DELETE FROM spam_model WHERE version<={p}", (version - KEEP,))
+    conn.commit()
+    return applied
+
+
+@jobs.job("train_spam")
+def train_spam(payload=None):
+    if np is None:
+        return 0
+    conn = get_conn()
+    try:
+        applied = train(conn)
+    finally:
+        conn.close()
+    if applied:
+        sync(force=True)
+    return applied
+
+
+jobs.schedule("train_spam", os.environ.get("SPAM_TRAIN_CRON", "*/10 * * * *"))
+
+
+def relabeled(conn):
+    """스팸 플래그를 바꾼 쪽에서 호출 (호출자 트랜잭션, 커밋은 호출자) — 1분 안에 증분 학습 한 번"""
+    jobs.enqueue("train_spam", delay=30, dedupe_key=f"train_spam:{datetime.now():%Y%m%d%H%M}", conn=conn)
@@ -0,0 +1,61 @@
+"""VibeCoder 게시글 요약 — 목록 화면용 excerpt / 단어 수 / 읽는 시간 / 코드 포함 여부
+쓰기 시점(lounge_write, 트렌드 자동 게시)에 계산해 posts에 저장하고,
+목록 화면은 본문 대신 이 컬럼만 조회한다. 기존 행은 summarize_posts 작업이 채움.
+"""
+
+import re
+
+import jobs
+from db import get_conn, ph, fetchall
+
+EXCERPT_LEN = 160
+WORDS_PER_MINUTE = 200   # 한국어 어절 기준 대략치
+BATCH = 500
+
+_FENCE_RE = re.compile(r"```.*?(```|$)", re.S)
+_INLINE_CODE_RE = re.compile(r"`[^`\n]+`")
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_MARKUP_RE = re.compile(r"^\s{0,3}(#{1,6}|>|[-*+]|\d+\.)\s+|\*\*|__|~~", re.M)
+
+
+def summarize(content: str):
+    """(excerpt, word_count, reading_time, has_code)"""
+    content = content or ""
+    has_code = bool(_FENCE_RE.search(content) or _INLINE_CODE_RE.search(content))
+    text = _FENCE_RE.sub(" ", content)
+    text = _INLINE_CODE_RE.sub(lambda m: m.group(0)[1:-1], text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _MARKUP_RE.sub("", text)
+    words = content.split()
+    text = " ".join(text.split())
+    if len(text) > EXCERPT_LEN:
+        cut = text[:EXCERPT_LEN]
+        if " " in cut[EXCERPT_LEN // 2:]:
+            cut = cut[:cut.rindex(" ")]
+        text = cut.rstrip(" .,") + "…"
+    reading_time = max(1, round(len(words) / WORDS_PER_MINUTE)) if words else 0
+    return text, len(words), reading_time, 1 if has_code else 0
+
+
+@jobs.job("summarize_posts")
+def summarize_posts(payload):
+    """요약 컬럼이 비어 있는 기존 게시글 채우기 (BATCH 단위 커밋)"""
+    conn = get_conn()
+    c = conn.cursor()
+    p = ph()
+    try:
+        while True:
+            c.execute(f"SELECT id, content FROM posts WHERE excerpt IS NULL ORDER BY id LIMIT {p}", (BATCH,))
+            rows = fetchall(c)
+            if not rows:
+                break
+            c.executemany(
+                f"UPDATE posts SET excerpt={p}, word_count={p}, reading_time={p}, has_code={p} WHERE id={p}",
+                [summarize(r["content"]) + (r["id"],) for r in rows],
+            )
+            conn.commit()
+    finally:
+        conn.close()
+
+
+jobs.schedule("summarize_posts", "*/30 * * * *")
@@ -0,0 +1,119 @@
+"""VibeCoder 태그 인덱스 — 기술 스택 / 라운지 태그 정규화
+tags(종류별 태그 + 사용 횟수) + project_tags / post_tags 조인 테이블
+use_count는 쓰기 경로에서 증감하는 패싯 카운트 (노출 중인 글만 집계)
+"""
+
+import json
+
+from db import ph, fetchall, fetchone
+
+# 태그 종류
+KIND_TECH = "tech"   # projects.tech_stack
+KIND_POST = "post"   # posts.tags
+
+# 글 하나당 최대 태그 수 / 태그 최대 길이
+MAX_TAGS = 10
+MAX_TAG_LEN = 30
+
+_LINK_TABLES = {
+    KIND_TECH: ("project_tags", "project_id"),
+    KIND_POST: ("post_tags", "post_id"),
+}
+
+
+def normalize(name: str) -> str:
+    """검색 키 (대소문자/공백/# 무시)"""
+    return " ".join(name.strip().lstrip("#").split()).lower()[:MAX_TAG_LEN]
+
+
+def parse_tags(raw) -> list:
+    """콤마 문자열 또는 리스트 → 중복 제거된 표시용 태그 리스트"""
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    tags, seen = [], set()
+    for t in raw or []:
+        name = " ".join(str(t).strip().lstrip("#").split())[:MAX_TAG_LEN]
+        key = name.lower()
+        if name and key not in seen:
+            seen.add(key)
+            tags.append(name)
+    return tags[:MAX_TAGS]
+
+
+def link_tags(c, kind: str, target_id: int, names: list, counted: bool = True):
+    """태그 upsert + 조인 행 추가 (counted=False면 패싯 카운트는 그대로)"""
+    table, col = _LINK_TABLES[kind]
+    p = ph()
+    for name in names:
+        norm = normalize(name)
+        if not norm:
+            continue
+        c.execute(
+            f"INSERT INTO tags (kind, norm, name, use_count) VALUES ({p},{p},{p},0) "
+            f"ON CONFLICT (kind, norm) DO NOTHING",
+            (kind, norm, name),
+        )
+        c.execute(f"SELECT id FROM tags WHERE kind={p} AND norm={p}", (kind, norm))
+        tag_id = fetchone(c)["id"]
+        c.execute(
+            f"INSERT INTO {table} ({col}, tag_id) VALUES ({p},{p}) "
+            f"ON CONFLICT ({col}, tag_id) DO NOTHING",
+            (target_id, tag_id),
+        )
+        if counted:
+            c.execute(f"UPDATE tags SET use_count=use_count+1 WHERE id={p}", (tag_id,))
+
+
+def adjust_counts(c, kind: str, target_id: int, delta: int):
+    """글 삭제/스팸 전환 시 해당 글 태그들의 패싯 카운트 증감"""
+    table, col = _LINK_TABLES[kind]
+    p = ph()
+    c.execute(
+        f"UPDATE tags SET use_count=use_count+({p}) "
+        f"WHERE id IN (SELECT tag_id FROM {table} WHERE {col}={p})",
+        (delta, target_id),
+    )
+
+
+def facet_counts(c, kind: str, limit: int = 20) -> list:
+    """패싯 목록 [{name, norm, use_count}] — 카운트 테이블만 읽음"""
+    p = ph()
+    c.execute(
+        f"SELECT name, norm, use_count FROM tags WHERE kind={p} AND use_count>0 "
+        f"ORDER BY use_count DESC, norm ASC LIMIT {p}",
+        (kind, limit),
+    )
+    return fetchall(c)
+
+
+def tag_total(c, kind: str, name: str) -> int:
+    """태그 필터 결과 총 개수 (O(1) 카운트 조회)"""
+    p = ph()
+    c.execute(f"SELECT use_count FROM tags WHERE kind={p} AND norm={p}", (kind, normalize(name)))
+    row = fetchone(c)
+    return row["use_count"] if row else 0
+
+
+def backfill(conn):
+    """기존 행 인덱싱 — 아직 조인 행이 없는 글만 처리 (재실행 안전)"""
+    c = conn.cursor()
+    c.execute(
+        "SELECT id, tech_stack FROM projects "
+        "WHERE id NOT IN (SELECT project_id FROM project_tags)"
+    )
+    for row in fetchall(c):
+        try:
+            names = parse_tags(json.loads(row["tech_stack"] or "[]"))
+        except Exception:
+            names = parse_tags(row["tech_stack"] or "")
+        link_tags(c, KIND_TECH, row["id"], names)
+
+    c.execute(
+        "SELECT id, tags, is_spam, is_deleted FROM posts "
+        "WHERE tags IS NOT NULL AND tags != '' "
+        "AND id NOT IN (SELECT post_id FROM post_tags)"
+    )
+    for row in fetchall(c):
+        visible = not row["is_spam"] and not row["is_deleted"]
+        link_tags(c, KIND_POST, row["id"], parse_tags(row["tags"]), counted=visible)
+    conn.commit()
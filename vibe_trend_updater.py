@@ -1,12 +1,12 @@
-import sqlite3
-import json
-import os
 import uuid
-import requests
 from datetime import datetime
 
-# 데이터베이스 경로 (VibeCoder 위치에 맞게 조정 필요)
-DB_PATH = os.path.join(os.path.dirname(__file__), "vibecoder.db")
+from db import get_conn, ph, fetchone
+from summary import summarize
+from render import columns as render_columns
+import feeds
+import counters
+import snapshot
 
 def get_latest_trends():
     """
@@ -29,35 +29,46 @@ def get_latest_trends():
     ]
     return trends
 
-def post_to_lounge():
-    if not os.path.exists(DB_PATH):
-        print(f"❌ DB를 찾을 수 없습니다: {DB_PATH}")
-        return
-
+def post_to_lounge(raise_errors: bool = False):
+    """db.py 연결 사용 (PostgreSQL / SQLite 공통) — jobs.py 스케줄 작업으로도 실행
+    raise_errors: 작업으로 실행 시 — 실패하면 롤백 후 다시 던져 jobs가 실패로 기록하고 재시도"""
     trends = get_latest_trends()
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     c = conn.cursor()
+    p = ph()
     
     print(f"Post-processing {len(trends)} trend updates...")
     
     for t in trends:
         slug = f"trend-{datetime.now().strftime('%m%d%H%M')}-{str(uuid.uuid4())[:4]}"
+        now = datetime.now().isoformat()
         try:
-            c.execute("""
+            c.execute(f"""
                 INSERT INTO posts (
-                    created_at, title, slug, content, category, author_name, is_spam
-                ) VALUES (?, ?, ?, ?, ?, ?, 0)
+                    created_at, title, slug, content, category, author_name, is_spam,
+                    excerpt, word_count, reading_time, has_code, content_html, render_version
+                ) VALUES ({p}, {p}, {p}, {p}, {p}, {p}, 0, {p}, {p}, {p}, {p}, {p}, {p})
             """, (
-                datetime.now().isoformat(),
+                now,
                 t["title"],
                 slug,
                 t["content"],
                 t["category"],
-                t["author"]
+                t["author"],
+                *summarize(t["content"]),
+                *render_columns(t["content"]),
             ))
+            c.execute(f"SELECT id FROM posts WHERE slug={p}", (slug,))
+            feeds.add_post(c, fetchone(c)["id"], slug, t["category"], now)
+            counters.add(c, "posts")
+            snapshot.mark(c, *snapshot.post_paths(slug, t["category"]))
             print(f"✅ Trend Posted: {t['title']}")
         except Exception as e:
             print(f"❌ Error posting trend: {e}")
+            if raise_errors:
+                conn.rollback()
+                conn.close()
+                raise
             
     conn.commit()
     conn.close()
@@ -0,0 +1,219 @@
+"""VibeCoder 캐시 스냅샷 — 재시작/배포/0에서 확장 직후의 첫 요청도 데운 캐시로
+프로세스 메모리 캐시(AI 뉴스 첫 페이지, 중복 지문 인덱스)를
+주기적으로(SAVE_INTERVAL, 작업 워커 틱)와 정상 종료 시(atexit — gunicorn/Cloud Run SIGTERM) 저장하고,
+부팅 후 각 캐시가 처음 쓰일 때 그 캐시만 복원한다 (register → restore).
+  파일: <WARM_DIR>/warm.snap — 같은 호스트의 재시작/워커 교체용. mmap으로 열어 필요한 구간만 읽는다.
+        magic | 헤더 길이 | 헤더 JSON {이름: [offset, 길이, 저장 시각]} | zlib(marshal) 구간들
+  DB  : cache_snapshots — 새 인스턴스(빈 디스크)용. 압축 후 DB_MAX_BYTES 이하인 캐시만.
+복원 순서: 파일 → DB, 캐시마다 max_age보다 오래됐으면 버리고 원래대로 (DB에서) 채운다.
+직렬화는 marshal (기본 자료형만 — 코드 실행 없음). 저장 시 비어 있는 캐시는 기존 구간을 그대로 둔다.
+"""
+
+import os
+import json
+import time
+import mmap
+import zlib
+import marshal
+import struct
+import threading
+from datetime import datetime
+
+import jobs
+from db import get_conn, ph, fetchone
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+WARM_DIR = os.environ.get("WARM_DIR", os.path.join(ROOT, "warm"))
+SAVE_INTERVAL = 300       # 주기 저장 (초)
+DB_MAX_BYTES = 256 * 1024  # 이보다 큰 캐시는 파일에만 (지문 인덱스 등)
+
+_MAGIC = b"VCWARM\x00" + bytes([marshal.version])
+_LEN = struct.Struct("<I")
+
+_caches = {}      # 이름 → {"dump", "load", "max_age"}
+_restored = {}    # 이름 → "file" / "db" / None (복원 시도함)
+_lock = threading.Lock()
+_file = {"mm": None, "index": None, "key": None}  # key: (inode, mtime, 크기) — 바뀌면 다시 연다
+
+
+def register(name: str, dump, load, max_age: float):
+    """dump() → marshal 가능한 값 (비어 있으면 None), load(값) → 캐시 채움 (False면 버림)"""
+    _caches[name] = {"dump": dump, "load": load, "max_age": max_age}
+
+
+def _path() -> str:
+    return os.path.join(WARM_DIR, "warm.snap")
+
+
+def _encode(obj) -> bytes:
+    return zlib.compress(marshal.dumps(obj), 1)
+
+
+def _decode(body: bytes):
+    return marshal.loads(zlib.decompress(body))
+
+
+# ──────────────────────────────────────────────────────────
+# 파일 (mmap)
+# ──────────────────────────────────────────────────────────
+def _open_file():
+    """스냅샷 파일 mmap + 헤더 (mmap, {이름: [offset, 길이, 저장 시각]}) — 파일이 바뀌었으면 (inode/mtime) 다시 연다
+    이전 mmap은 참조가 끊기면 닫힌다 (읽는 중인 스레드는 자기 참조로 계속 읽음)"""
+    try:
+        st = os.stat(_path())
+    except OSError:
+        _file.update(mm=None, index=None, key=None)
+        return None, None
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    if _file["key"] == key:
+        return _file["mm"], _file["index"]
+    mm, index = None, None
+    try:
+        with open(_path(), "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(_MAGIC)] == _MAGIC:
+            (size,) = _LEN.unpack_from(mm, len(_MAGIC))
+            start = len(_MAGIC) + _LEN.size
+            base = start + size
+            index = {name: (base + off, length, saved_at)
+                     for name, (off, length, saved_at) in json.loads(mm[start:base]).items()}
+    except (OSError, ValueError, struct.error):
+        mm, index = None, None
+    # 깨진 파일도 같은 key로 기억 → 다시 써질 때까지 재시도하지 않음
+    _file.update(mm=mm if index is not None else None, index=index, key=key)
+    return _file["mm"], index
+
+
+def _file_section(name: str):
+    """(압축된 본문, 저장 시각) 또는 None"""
+    mm, index = _open_file()
+    if not index or name not in index:
+        return None
+    off, length, saved_at = index[name]
+    return mm[off:off + length], saved_at
+
+
+def _write_file(sections: dict):
+    """sections: 이름 → (압축된 본문, 저장 시각)"""
+    os.makedirs(WARM_DIR, exist_ok=True)
+    index, offset = {}, 0
+    for name, (body, saved_at) in sections.items():
+        index[name] = [offset, len(body), saved_at]
+        offset += len(body)
+    header = json.dumps(index).encode("utf-8")
+    tmp = f"{_path()}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC + _LEN.pack(len(header)) + header)
+        for body, _saved_at in sections.values():
+            f.write(body)
+    os.replace(tmp, _path())  # 이미 mmap한 프로세스는 다음 _open_file에서 새 파일로 바꾼다
+    _file.update(mm=None, index=None, key=None)
+
+
+# ──────────────────────────────────────────────────────────
+# DB
+# ──────────────────────────────────────────────────────────
+def _db_section(name: str):
+    conn = get_conn(readonly=True)
+    try:
+        c = conn.cursor()
+        c.execute(f"SELECT body, saved_at, format FROM cache_snapshots WHERE name={ph()}", (name,))
+        row = fetchone(c)
+    finally:
+        conn.close()
+    if row is None or row["format"] != marshal.version:
+        return None
+    return bytes(row["body"]), datetime.fromisoformat(row["saved_at"]).timestamp()
+
+
+def _write_db(sections: dict):
+    p = ph()
+    conn = get_conn()
+    try:
+        c = conn.cursor()
+        for name, (body, saved_at) in sections.items():
+            c.execute(
+                f"INSERT INTO cache_snapshots (name, body, saved_at, format) VALUES ({p},{p},{p},{p}) "
+                f"ON CONFLICT (name) DO UPDATE SET body=excluded.body, saved_at=excluded.saved_at, "
+                f"format=excluded.format",
+                (name, body, datetime.fromtimestamp(saved_at).isoformat(), marshal.version),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# ──────────────────────────────────────────────────────────
+# 복원 (캐시가 처음 쓰일 때 한 번)
+# ──────────────────────────────────────────────────────────
+def restore(name: str) -> bool:
+    """이름의 캐시를 스냅샷에서 채움 — 프로세스당 한 번만 시도. 채웠으면 True"""
+    if name in _restored or name not in _caches:
+        return False
+    with _lock:
+        if name in _restored:
+            return False
+        _restored[name] = None
+        spec = _caches[name]
+        now = time.time()
+        for source, read in (("file", _file_section), ("db", _db_section)):
+            try:
+                found = read(name)
+                if found is None or now - found[1] > spec["max_age"]:
+                    continue
+                if spec["load"](_decode(found[0])) is not False:
+                    _restored[name] = source
+                    return True
+            except Exception:
+                continue  # 깨진/호환 안 되는 스냅샷은 무시하고 원래대로
+        return False
+
+
+# ──────────────────────────────────────────────────────────
+# 저장
+# ──────────────────────────────────────────────────────────
+@jobs.tick(SAVE_INTERVAL)
+def save(to_db: bool = True) -> dict:
+    """전체 캐시 저장 → {이름: 압축 바이트 수}. 비어 있는 캐시는 기존 파일 구간을 유지 (만료 전까지)"""
+    now = time.time()
+    sections, fresh = {}, {}
+    for name, spec in _caches.items():
+        try:
+            obj = spec["dump"]()
+        except Exception:
+            obj = None
+        if obj is not None:
+            sections[name] = fresh[name] = (_encode(obj), now)
+            continue
+        old = _file_section(name)
+        if old is not None and now - old[1] <= spec["max_age"]:
+            sections[name] = old
+    if not sections:
+        return {}
+    _write_file(sections)
+    if to_db:
+        small = {name: s for name, s in fresh.items() if len(s[0]) <= DB_MAX_BYTES}
+        if small:
+            _write_db(small)
+    return {name: len(body) for name, (body, _saved_at) in fresh.items()}
+
+
+def shutdown():
+    """정상 종료 시 (atexit) — DB가 이미 닫혔어도 파일은 남긴다"""
+    try:
+        save()
+    except Exception:
+        try:
+            save(to_db=False)
+        except Exception:
+            pass
+
+
+def stats() -> dict:
+    _mm, index = _open_file()
+    now = time.time()
+    return {
+        "registered": sorted(_caches),
+        "restored": dict(_restored),
+        "file_age": {name: round(now - saved_at) for name, (_o, _l, saved_at) in (index or {}).items()},
+    }